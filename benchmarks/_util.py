@@ -0,0 +1,18 @@
+"""Timing shared by run.py and the benchmark scripts."""
+import timeit
+
+
+def time_op(stmt, namespace=None, number=None, repeat=5, unit=1e9):
+	"""Return the best time of one execution of stmt, in nanoseconds by default.
+
+	Args:
+		stmt: A statement to run in namespace or a function of no arguments.
+		namespace: The globals of stmt.
+		number: The executions per repeat, by default from Timer.autorange.
+		repeat: The number of times to repeat the timing.
+		unit: The number of the returned unit in a second, eg. 1e3 for ms.
+	"""
+	timer = timeit.Timer(stmt, globals=namespace)
+	if number is None:
+		number, _ = timer.autorange()
+	return min(timer.repeat(repeat=repeat, number=number)) / number * unit
@@ -0,0 +1,51 @@
+"""Time __contains__ and __eq__ for Year, Quarter and Month.
+
+'warm' reuses one instance, so the boundaries are already computed. 'cold'
+creates a new instance for every operation, so the boundaries are computed
+each time.
+
+Run with ``python benchmarks/bench_boundaries.py``.
+"""
+from datetime import datetime
+
+from interval import Year, Quarter, Month
+
+from _util import time_op
+
+DT = datetime(2017, 2, 8, 12)
+
+ARGS = [
+	(Year, (2017, )),
+	(Quarter, (2017, 1)),
+	(Month, (2017, 2)),
+	]
+
+
+def main():
+	"""Print the times of each operation with warm and cold caches."""
+	print('{:<8} {:<12} {:>10} {:>10}'.format(
+		'type',
+		'op',
+		'warm (ns)',
+		'cold (ns)',
+		))
+	for cls, args in ARGS:
+		namespace = {'cls': cls, 'args': args, 'dt': DT}
+		namespace['a'] = cls(*args)
+		namespace['b'] = cls(*args)
+		namespace['a'].end, namespace['b'].end
+		ops = [
+			('contains', 'dt in a', 'dt in cls(*args)'),
+			('eq', 'a == b', 'cls(*args) == cls(*args)'),
+			]
+		for name, warm, cold in ops:
+			print('{:<8} {:<12} {:>10.0f} {:>10.0f}'.format(
+				cls.__name__,
+				name,
+				time_op(warm, namespace, number=100000),
+				time_op(cold, namespace, number=100000),
+				))
+
+
+if __name__ == '__main__':
+	main()
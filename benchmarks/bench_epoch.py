@@ -0,0 +1,62 @@
+"""Compare Interval and EpochInterval operations for naive and aware Intervals.
+
+The aware Intervals are in America/New_York and the datetime tested for
+containment is in UTC, so Interval has to call utcoffset for every
+comparison.
+
+Run with ``python benchmarks/bench_epoch.py``.
+"""
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from interval import EpochInterval, Interval
+
+from _util import time_op
+
+BEG = datetime(2017, 2, 8, 12)
+DELTA = timedelta(hours=5)
+
+ZONES = [
+	('naive', None, None),
+	('aware', ZoneInfo('America/New_York'), timezone.utc),
+	]
+
+
+def main():
+	"""Print the times of each operation for Interval and EpochInterval."""
+	ops = [
+		('eq', 'a == b'),
+		('hash', 'hash(a)'),
+		('contains', 'dt in a'),
+		]
+	print('{:<8} {:<10} {:>14} {:>18}'.format(
+		'input',
+		'op',
+		'Interval (ns)',
+		'EpochInterval (ns)',
+		))
+	for name, tzinfo, query_tzinfo in ZONES:
+		beg = BEG.replace(tzinfo=tzinfo)
+		dt = (beg + DELTA / 2)
+		if query_tzinfo is not None:
+			dt = dt.astimezone(query_tzinfo)
+		times = {}
+		for cls in (Interval, EpochInterval):
+			namespace = {
+				'a': cls(beg, delta=DELTA),
+				'b': cls(beg, delta=DELTA),
+				'dt': dt,
+				}
+			for op, stmt in ops:
+				times[cls, op] = time_op(stmt, namespace, number=100000)
+		for op, stmt in ops:
+			print('{:<8} {:<10} {:>14.0f} {:>18.0f}'.format(
+				name,
+				op,
+				times[Interval, op],
+				times[EpochInterval, op],
+				))
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,49 @@
+"""Time interval.ingest.ingest with increasing numbers of worker processes.
+
+A CSV file of random events over a year is written to a temporary directory
+and bucketed by Hour.
+
+Run with ``python benchmarks/bench_ingest.py [rows]``.
+"""
+from datetime import datetime, timedelta
+import os
+import random
+import sys
+import tempfile
+import time
+
+from interval import Hour
+from interval.ingest import ingest
+
+START = datetime(2017, 1, 1)
+
+
+def write_events(path, rows):
+	"""Write a CSV of rows timestamps spread over a year with values."""
+	rand = random.Random(0)
+	with open(path, 'w') as file:
+		file.write('timestamp,value\n')
+		for n in range(rows):
+			dt = START + timedelta(seconds=365 * 86400 * n // rows + rand.randrange(60))
+			file.write('{},{}\n'.format(dt.isoformat(), rand.randrange(100)))
+
+
+def main(rows=2000000):
+	"""Print the ingest throughput of a CSV of rows for each number of workers."""
+	with tempfile.TemporaryDirectory() as directory:
+		path = os.path.join(directory, 'events.csv')
+		write_events(path, rows)
+		size = os.path.getsize(path) / 2 ** 20
+		print('{} rows, {:.0f} MiB'.format(rows, size))
+		print('{:>8} {:>10} {:>12}'.format('workers', 'time (s)', 'MiB/s'))
+		workers = 1
+		while workers <= (os.cpu_count() or 1):
+			began = time.perf_counter()
+			ingest(path, Hour, value='value', workers=workers, chunk_size=4 * 2 ** 20)
+			elapsed = time.perf_counter() - began
+			print('{:>8} {:>10.2f} {:>12.1f}'.format(workers, elapsed, size / elapsed))
+			workers *= 2
+
+
+if __name__ == '__main__':
+	main(*map(int, sys.argv[1:]))
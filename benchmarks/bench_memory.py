@@ -0,0 +1,83 @@
+"""Memory used per instance for each interval type.
+
+Compares the slots-based layout against the same classes with a per-instance
+``__dict__`` (which is what every interval carried before ``__slots__``).
+
+Run with ``python benchmarks/bench_memory.py``.
+"""
+from datetime import datetime, timedelta
+import gc
+import tracemalloc
+
+from interval import (
+	Interval,
+	Year,
+	Quarter,
+	Month,
+	Week,
+	Day,
+	Hour,
+	Minute,
+	Second,
+	MilliSecond,
+	MicroSecond,
+	FixedInterval,
+	)
+
+COUNT = 100000
+BEG = datetime(2017, 3, 21)
+
+Fortnight = FixedInterval.create(timedelta(weeks=2), name='Fortnight')
+
+FACTORIES = [
+	(Interval, lambda cls: cls(BEG, delta=timedelta(days=1))),
+	(Year, lambda cls: cls(2017)),
+	(Quarter, lambda cls: cls(2017, 1)),
+	(Month, lambda cls: cls(2017, 3)),
+	(Week, lambda cls: cls(BEG)),
+	(Day, lambda cls: cls(BEG)),
+	(Hour, lambda cls: cls(BEG)),
+	(Minute, lambda cls: cls(BEG)),
+	(Second, lambda cls: cls(BEG)),
+	(MilliSecond, lambda cls: cls(BEG)),
+	(MicroSecond, lambda cls: cls(BEG)),
+	(Fortnight, lambda cls: cls(BEG)),
+	]
+
+
+def with_dict(cls):
+	"""Return a subclass of cls that has a per-instance __dict__."""
+	return type(cls.__name__, (cls, ), {})
+
+
+def bytes_per_instance(cls, factory, count=COUNT):
+	"""Return the average number of bytes allocated per instance of cls."""
+	gc.collect()
+	tracemalloc.start()
+	try:
+		before = tracemalloc.get_traced_memory()[0]
+		instances = [factory(cls) for _ in range(count)]
+		after = tracemalloc.get_traced_memory()[0]
+	finally:
+		tracemalloc.stop()
+	# Don't count the list holding the instances
+	list_size = instances.__sizeof__()
+	return (after - before - list_size) / count
+
+
+def main():
+	"""Print the bytes per instance of each type with and without slots."""
+	print('{:<12} {:>8} {:>8} {:>8}'.format('type', 'dict', 'slots', 'saved'))
+	for cls, factory in FACTORIES:
+		before = bytes_per_instance(with_dict(cls), factory)
+		after = bytes_per_instance(cls, factory)
+		print('{:<12} {:>8.0f} {:>8.0f} {:>7.0%}'.format(
+			cls.__name__,
+			before,
+			after,
+			1 - after / before,
+			))
+
+
+if __name__ == '__main__':
+	main()
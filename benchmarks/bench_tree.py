@@ -0,0 +1,68 @@
+"""Compare IntervalTree queries with a linear scan of the Intervals.
+
+The Intervals are random bookings from one hour to a week long over ten years.
+
+Run with ``python benchmarks/bench_tree.py [n]``.
+"""
+from datetime import datetime, timedelta
+import random
+import sys
+import time
+
+from interval import Interval, IntervalTree
+
+from _util import time_op
+
+START = datetime(2010, 1, 1)
+SPAN_HOURS = 10 * 365 * 24
+
+
+def random_intervals(n, seed=0):
+	"""Return n random Intervals of up to a week in a span of 10 years."""
+	rand = random.Random(seed)
+	intervals = []
+	for _ in range(n):
+		beg = START + timedelta(hours=rand.randrange(SPAN_HOURS))
+		hours = rand.randint(1, 7 * 24)
+		intervals.append(Interval(beg, beg + timedelta(hours=hours)))
+	return intervals
+
+
+def main(n=100000):
+	"""Print the times of queries on n Intervals with and without a tree."""
+	intervals = random_intervals(n)
+	start = time.perf_counter()
+	tree = IntervalTree(intervals)
+	print('built {} Intervals in {:.2f} s'.format(n, time.perf_counter() - start))
+	namespace = {
+		'intervals': intervals,
+		'tree': tree,
+		'dt': START + timedelta(days=1000, hours=5),
+		'window': Interval(
+			START + timedelta(days=2000),
+			START + timedelta(days=2001),
+			),
+		}
+	ops = [
+		(
+			'at',
+			'[i for i in intervals if dt in i]',
+			'tree.at(dt)',
+			),
+		(
+			'overlapping',
+			'[i for i in intervals if i.beg < window.end and window.beg < i.end]',
+			'tree.overlapping(window)',
+			),
+		]
+	print('{:<12} {:>12} {:>12}'.format('query', 'scan (us)', 'tree (us)'))
+	for name, scan, indexed in ops:
+		print('{:<12} {:>12.0f} {:>12.1f}'.format(
+			name,
+			time_op(scan, namespace, number=3, repeat=3, unit=1e6),
+			time_op(indexed, namespace, number=20, repeat=3, unit=1e6),
+			))
+
+
+if __name__ == '__main__':
+	main(*map(int, sys.argv[1:]))
@@ -0,0 +1,59 @@
+"""Time containing_many for naive timestamps and for timestamps in a timezone.
+
+Bucketing in a timezone looks up the UTC offsets in cached transition tables
+rather than calling utcoffset for each timestamp, but converting the
+timestamps still costs several times the naive version. For a million
+timestamps expect around 5 times as long for Day and 20 times for Hour, since
+types shorter than a day also find the timestamps near a change in offset and
+bucket those with containing. Month spends most of its time converting to
+months either way, so it is only about a third slower.
+
+Run with ``python benchmarks/bench_zones.py``.
+"""
+import time
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from interval import Day, Hour, Month
+
+from _util import time_op
+
+N = 1000000
+ZONE = ZoneInfo('America/New_York')
+
+
+def main():
+	"""Print the times of containing_many for naive and zone timestamps."""
+	rng = np.random.default_rng(0)
+	start = np.datetime64('2010-01-01', 'us').view(np.int64)
+	span = 10 * 365 * 86400 * 10 ** 6
+	timestamps = (start + rng.integers(0, span, N)).view('datetime64[us]')
+	began = time.perf_counter()
+	Day.containing_many(timestamps, tzinfo=ZONE)
+	elapsed = time.perf_counter() - began
+	print('first call, building tables: {:.0f} ms'.format(elapsed * 1e3))
+	print('{:<8} {:>12} {:>12}'.format('type', 'naive (ms)', 'zone (ms)'))
+	for cls in (Hour, Day, Month):
+		namespace = {'cls': cls, 'timestamps': timestamps, 'zone': ZONE}
+		print('{:<8} {:>12.1f} {:>12.1f}'.format(
+			cls.__name__,
+			time_op(
+				'cls.containing_many(timestamps)',
+				namespace,
+				number=5,
+				repeat=3,
+				unit=1e3,
+				),
+			time_op(
+				'cls.containing_many(timestamps, tzinfo=zone)',
+				namespace,
+				number=5,
+				repeat=3,
+				unit=1e3,
+				),
+			))
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,166 @@
+"""Run the benchmarks in suite.py, save the results and compare them.
+
+Each benchmark is recorded by name with its param, eg.
+``time_containing[Month-aware]``. Times are the best of several repeats, in
+nanoseconds per call.
+
+Run with ``python benchmarks/run.py``, see ``--help`` and the bench targets in
+the Makefile.
+
+Baselines are timings on one machine so they aren't committed. Save one with
+``make bench-baseline`` before making changes, then ``make bench-compare``.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import suite  # noqa: E402
+from _util import time_op  # noqa: E402
+
+PREFIXES = ('time_', 'mem_', 'track_')
+# Larger results are regressions for every kind of benchmark
+DEFAULT_THRESHOLD = 1.2
+
+
+def benchmarks(pattern: str = None):
+	"""Generate (name, function, param) for the benchmarks in suite.
+
+	The name includes the param in brackets. If pattern is given only the
+	benchmarks whose names contain it are generated.
+	"""
+	for attr in sorted(vars(suite)):
+		if not attr.startswith(PREFIXES):
+			continue
+		function = getattr(suite, attr)
+		params = getattr(function, 'params', None)
+		for param in params or [None]:
+			name = attr if param is None else '{}[{}]'.format(attr, param)
+			if pattern is None or pattern in name:
+				yield name, function, param
+
+
+def measure(name: str, function, param, repeat: int = 5) -> float:
+	"""Return the result of one benchmark."""
+	args = () if param is None else (param, )
+	if not name.startswith('time_'):
+		return function(*args)
+	return time_op(function(*args), repeat=repeat)
+
+
+def run(pattern: str = None, repeat: int = 5) -> dict:
+	"""Return the results of the benchmarks by name, printing each one."""
+	results = {}
+	for name, function, param in benchmarks(pattern):
+		results[name] = measure(name, function, param, repeat)
+		print('{:<40} {:>14.6g}'.format(name, results[name]), flush=True)
+	return results
+
+
+def compare(
+		results: dict,
+		baseline: dict,
+		threshold: float = DEFAULT_THRESHOLD,
+		) -> list:
+	"""Print the ratio of each result to the baseline, return the regressions."""
+	regressions = []
+	print('{:<40} {:>12} {:>12} {:>8}'.format(
+		'benchmark',
+		'baseline',
+		'result',
+		'ratio',
+		))
+	for name, result in results.items():
+		if name not in baseline:
+			print('{:<40} {:>12} {:>12.6g} {:>8}'.format(
+				name,
+				'-',
+				result,
+				'new',
+				))
+			continue
+		ratio = result / baseline[name] if baseline[name] else float('inf')
+		flag = ''
+		if ratio > threshold:
+			flag = '  slower'
+			regressions.append(name)
+		elif ratio < 1 / threshold:
+			flag = '  faster'
+		print('{:<40} {:>12.6g} {:>12.6g} {:>7.2f}x{}'.format(
+			name,
+			baseline[name],
+			result,
+			ratio,
+			flag,
+			))
+	return regressions
+
+
+def main(argv=None):
+	"""Run the benchmarks from the command line, return the exit status."""
+	parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+	parser.add_argument(
+		'--filter',
+		help='only run benchmarks whose names contain this',
+		)
+	parser.add_argument(
+		'--quick',
+		action='store_true',
+		help='repeat each timing once',
+		)
+	parser.add_argument(
+		'--save',
+		metavar='PATH',
+		help='write the results to a JSON file',
+		)
+	parser.add_argument(
+		'--compare',
+		metavar='PATH',
+		help='compare to results saved in a JSON file',
+		)
+	parser.add_argument(
+		'--threshold',
+		type=float,
+		default=DEFAULT_THRESHOLD,
+		help=(
+			'the ratio to the baseline counted as a regression '
+			'(default %(default)s)'
+			),
+		)
+	args = parser.parse_args(argv)
+	if args.compare and not os.path.exists(args.compare):
+		print(
+			'No baseline at {}, save one with --save or make bench-baseline'.format(
+				args.compare,
+				),
+			file=sys.stderr,
+			)
+		return 2
+	results = run(args.filter, repeat=1 if args.quick else 5)
+	if args.save:
+		with open(args.save, 'w') as file:
+			json.dump({
+				'python': platform.python_version(),
+				'machine': platform.machine(),
+				'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+				'results': results,
+				}, file, indent='\t', sort_keys=True)
+	if args.compare:
+		with open(args.compare) as file:
+			baseline = json.load(file)['results']
+		regressions = compare(results, baseline, args.threshold)
+		if regressions:
+			print('{} benchmarks slower than {}x the baseline'.format(
+				len(regressions),
+				args.threshold,
+				))
+			return 1
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,165 @@
+"""Benchmarks of the hot operations of every interval type, for run.py.
+
+Functions named ``time_*`` take one of their ``params`` and return a
+function of no arguments, which is timed. Functions named ``mem_*`` and
+``track_*`` take one of their params, if they have any, and return the value
+to record.
+
+The time benchmarks are run for naive datetimes and for datetimes aware in
+America/New_York.
+"""
+from datetime import datetime, timedelta
+from itertools import islice
+import os
+import subprocess
+import sys
+from zoneinfo import ZoneInfo
+
+from interval import (
+	Interval,
+	Year,
+	Quarter,
+	Month,
+	Week,
+	Day,
+	Hour,
+	Minute,
+	Second,
+	MilliSecond,
+	MicroSecond,
+	FixedInterval,
+	)
+
+from bench_memory import bytes_per_instance
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+Fortnight = FixedInterval.create(timedelta(weeks=2), name='Fortnight')
+QuarterHour = Minute.create(timedelta(minutes=15), name='QuarterHour')
+
+TYPES = [
+	Year,
+	Quarter,
+	Month,
+	Week,
+	Day,
+	Hour,
+	Minute,
+	Second,
+	MilliSecond,
+	MicroSecond,
+	Fortnight,
+	QuarterHour,
+	]
+TYPES_BY_NAME = {cls.__name__: cls for cls in TYPES}
+
+ZONES = {
+	'naive': None,
+	'aware': ZoneInfo('America/New_York'),
+	}
+
+DT = datetime(2017, 3, 12, 1, 23, 45, 678901)
+
+PARAMS = [
+	'{}-{}'.format(name, zone)
+	for name in TYPES_BY_NAME
+	for zone in ZONES
+	]
+
+
+def _setup(param):
+	"""Return the type, a datetime and an instance of the type containing it."""
+	name, zone = param.split('-')
+	cls = TYPES_BY_NAME[name]
+	dt = DT.replace(tzinfo=ZONES[zone])
+	return cls, dt, cls.containing(dt)
+
+
+def time_containing(param):
+	"""Find the Interval of the type containing a datetime."""
+	cls, dt, _ = _setup(param)
+	return lambda: cls.containing(dt)
+
+
+def time_next(param):
+	"""Get the next Interval of the type."""
+	_, _, interval = _setup(param)
+	return interval.next
+
+
+def time_prev(param):
+	"""Get the previous Interval of the type."""
+	_, _, interval = _setup(param)
+	return interval.prev
+
+
+def time_divide(param):
+	"""Divide the Interval spanning 100 Intervals of the type."""
+	cls, _, interval = _setup(param)
+	span = Interval(interval.beg, (interval + 99).end)
+	return lambda: cls.divide(span)
+
+
+def time_iter(param):
+	"""Iterate over 100 Intervals of the type."""
+	_, _, interval = _setup(param)
+	return lambda: list(islice(interval.iter(), 100))
+
+
+def time_eq(param):
+	"""Compare two equal Intervals of the type."""
+	cls, dt, interval = _setup(param)
+	other = cls.containing(dt)
+	return lambda: interval == other
+
+
+def time_contains(param):
+	"""Check whether a datetime is in an Interval of the type."""
+	_, dt, interval = _setup(param)
+	return lambda: dt in interval
+
+
+def time_pace(param):
+	"""Find how far through an Interval of the type a datetime is."""
+	_, dt, interval = _setup(param)
+	return lambda: interval.pace(dt)
+
+
+for _benchmark in (
+		time_containing,
+		time_next,
+		time_prev,
+		time_divide,
+		time_iter,
+		time_eq,
+		time_contains,
+		time_pace,
+		):
+	_benchmark.params = PARAMS
+
+
+def mem_instance(name):
+	"""Bytes allocated per instance."""
+	cls, _, interval = _setup(name + '-naive')
+	beg = interval.beg
+	if issubclass(cls, FixedInterval):
+		return bytes_per_instance(cls, lambda cls: cls(beg), count=20000)
+	return bytes_per_instance(cls, lambda cls: cls.containing(beg), count=20000)
+
+
+mem_instance.params = list(TYPES_BY_NAME)
+
+
+def track_import_time():
+	"""Seconds to import interval in a new interpreter, best of 5."""
+	code = (
+		'import time\n'
+		'began = time.perf_counter()\n'
+		'import interval\n'
+		'print(time.perf_counter() - began)\n'
+		)
+	env = dict(os.environ, PYTHONPATH=ROOT)
+	return min(
+		float(subprocess.check_output([sys.executable, '-c', code], env=env))
+		for _ in range(5)
+		)
@@ -0,0 +1,57 @@
+"""interval - a library for handling periods of time.
+
+Intervals are periods of time - a timedelta with a start date.
+
+ProperIntervals are Intervals that correspond to named periods of time like
+dates on a calendar instead of an arbitrary 24 hour period. ProperIntervals
+can also vary in length like Months or Years.
+
+Intervals are immutable.
+
+Intervals are inclusive of the beginning and exclusive of the end.
+"""
+from .core import (
+	CacheInfo,
+	EpochInterval,
+	Interval,
+	IntervalRange,
+	ProperInterval,
+	Year,
+	Quarter,
+	Month,
+	FixedIntervalType,
+	FixedInterval,
+	Week,
+	Day,
+	Hour,
+	Minute,
+	Second,
+	MilliSecond,
+	MicroSecond,
+	)
+from .sets import IntervalSet
+from .tree import IntervalTree
+
+__all__ = [
+	'CacheInfo',
+	'EpochInterval',
+	'Interval',
+	'IntervalRange',
+	'IntervalSet',
+	'IntervalTree',
+	'ProperInterval',
+	'Year',
+	'Quarter',
+	'Month',
+	'FixedIntervalType',
+	'FixedInterval',
+	'Week',
+	'Day',
+	'Hour',
+	'Minute',
+	'Second',
+	'MilliSecond',
+	'MicroSecond',
+	]
+
+__version__ = '0.1.0'
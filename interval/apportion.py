@@ -0,0 +1,49 @@
+"""Spread values over the ProperIntervals they overlap."""
+from .core import FixedInterval, IntervalRange
+
+
+def apportion(records, interval_type, **kwargs) -> dict:
+	"""Spread each value over the intervals of interval_type it overlaps.
+
+	Each value is split between the intervals of interval_type in proportion
+	to how much of its Interval they cover. Only the first and last intervals
+	are clipped against the Interval, the shares of the ones wholly covered in
+	between are computed in closed form, and for FixedInterval types are all
+	the same. An empty Interval puts all of its value into the interval
+	containing it.
+
+	For large batches see `interval.vectorized.apportion_many`.
+
+	Args:
+		records: An iterable of (Interval, value) pairs.
+		interval_type: The ProperInterval type to spread the values over.
+		kwargs: Passed on to interval_type.containing, eg. starts_on for a Week.
+	Returns:
+		A dict of the total value for each interval, ordered by beg.
+	"""
+	totals = {}
+	for interval, value in records:
+		beg, end = interval.beg, interval.end
+		first = interval_type.containing(beg, **kwargs)
+		if end <= first.end:
+			totals[first] = totals.get(first, 0) + value
+			continue
+		last = interval_type.containing(end, **kwargs)
+		if last.beg == end:
+			last = last - 1
+		duration = end - beg
+		totals[first] = totals.get(first, 0) + value * ((first.end - beg) / duration)
+		totals[last] = totals.get(last, 0) + value * ((end - last.beg) / duration)
+		middle = IntervalRange(first + 1, first._steps_to(last) - 1)
+		if isinstance(first, FixedInterval):
+			share = value * (interval_type.delta / duration)
+			for period in middle:
+				totals[period] = totals.get(period, 0) + share
+		else:
+			for period in middle:
+				totals[period] = totals.get(period, 0) + value * (period.delta / duration)
+	return dict(sorted(totals.items(), key=_beg_of_item))
+
+
+def _beg_of_item(item):
+	return item[0].beg
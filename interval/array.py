@@ -0,0 +1,214 @@
+"""A columnar array of Intervals backed by numpy."""
+from datetime import datetime
+
+import numpy as np
+
+from .core import Interval, _datetime_to_us, _us_to_datetime
+from .vectorized import pace_many, run_rate_many, to_epoch_us
+
+
+class IntervalArray():
+	"""An array of Intervals stored as int64 microseconds since the epoch.
+
+	The begs and ends are stored as the two columns of one C-contiguous int64
+	array of shape (len, 2), which can be shared without copying through
+	`buffer` and `__array__`, eg. `np.asarray(array)`. From Python 3.12,
+	IntervalArray also supports the buffer protocol itself, so
+	`memoryview(array)` works too. Earlier versions ignore `__buffer__`.
+
+	All of the Intervals in an IntervalArray are either naive or aware. Aware
+	Intervals are stored in UTC and converted back to tzinfo.
+
+	Args:
+		beg: The beginnings as datetime64 or integer microseconds.
+		end: The ends as datetime64 or integer microseconds.
+		tzinfo: The tzinfo of the Intervals, None if they are naive.
+	"""
+
+	__slots__ = ('_data', '_tzinfo')
+
+	def __init__(self, beg, end, tzinfo=None) -> None:
+		beg = to_epoch_us(beg)
+		end = to_epoch_us(end)
+		if beg.shape != end.shape or beg.ndim != 1:
+			raise ValueError('beg and end must be 1-dimensional and the same length')
+		self._data = np.column_stack((beg, end))
+		self._tzinfo = tzinfo
+
+	@classmethod
+	def _from_data(cls, data: np.ndarray, tzinfo=None):
+		array = cls.__new__(cls)
+		array._data = np.ascontiguousarray(data, dtype=np.int64)
+		array._tzinfo = tzinfo
+		return array
+
+	@classmethod
+	def from_intervals(cls, intervals, tzinfo=None):
+		"""Create an IntervalArray from an iterable of Intervals.
+
+		If tzinfo isn't passed, it is taken from the first Interval.
+		"""
+		intervals = list(intervals)
+		if tzinfo is None and intervals:
+			tzinfo = intervals[0].tzinfo
+		data = np.fromiter(
+			(_datetime_to_us(dt) for i in intervals for dt in (i.beg, i.end)),
+			dtype=np.int64,
+			count=2 * len(intervals),
+			)
+		return cls._from_data(data.reshape(-1, 2), tzinfo)
+
+	def to_intervals(self) -> list:
+		"""Return a list of the Intervals in this array."""
+		return list(self)
+
+	def __repr__(self):
+		return '{cls}({intervals!r})'.format(
+			cls=self.__class__.__name__,
+			intervals=self.to_intervals(),
+			)
+
+	def __len__(self):
+		return len(self._data)
+
+	def __iter__(self):
+		tzinfo = self._tzinfo
+		for beg, end in self._data.tolist():
+			yield Interval(_us_to_datetime(beg, tzinfo), _us_to_datetime(end, tzinfo))
+
+	def __getitem__(self, index):
+		if isinstance(index, (int, np.integer)):
+			beg, end = self._data[index].tolist()
+			return Interval(
+				_us_to_datetime(beg, self._tzinfo),
+				_us_to_datetime(end, self._tzinfo),
+				)
+		return self._from_data(self._data[index], self._tzinfo)
+
+	def __eq__(self, other):
+		if not isinstance(other, IntervalArray):
+			return NotImplemented
+		if self._tzinfo != other._tzinfo:
+			return False
+		return np.array_equal(self._data, other._data)
+
+	__hash__ = None
+
+	def __array__(self, dtype=None, copy=None):
+		if dtype is None or dtype == self._data.dtype:
+			return self._data.copy() if copy else self._data
+		return self._data.astype(dtype)
+
+	def __buffer__(self, flags):
+		# Only called by Python 3.12 and later, see PEP 688
+		return memoryview(self._data)
+
+	@property
+	def buffer(self) -> memoryview:
+		"""A memoryview of the underlying (len, 2) int64 data."""
+		return memoryview(self._data)
+
+	@property
+	def tzinfo(self):
+		return self._tzinfo
+
+	@property
+	def beg_us(self) -> np.ndarray:
+		"""The beginnings as int64 microseconds since the epoch."""
+		return self._data[:, 0]
+
+	@property
+	def end_us(self) -> np.ndarray:
+		"""The ends as int64 microseconds since the epoch."""
+		return self._data[:, 1]
+
+	@property
+	def beg(self) -> np.ndarray:
+		"""The beginnings as datetime64[us], in UTC if aware."""
+		return self.beg_us.view('datetime64[us]')
+
+	@property
+	def end(self) -> np.ndarray:
+		"""The ends as datetime64[us], in UTC if aware."""
+		return self.end_us.view('datetime64[us]')
+
+	@property
+	def delta(self) -> np.ndarray:
+		"""The lengths as timedelta64[us]."""
+		return (self.end_us - self.beg_us).view('timedelta64[us]')
+
+	def _to_us(self, value):
+		"""Convert a datetime, Interval or array of timestamps to microseconds."""
+		if isinstance(value, datetime):
+			return _datetime_to_us(value)
+		return to_epoch_us(value)
+
+	def contains(self, timestamps) -> np.ndarray:
+		"""Return whether the Intervals contain timestamps, as a bool array.
+
+		timestamps is broadcast against this array like any numpy operation, so
+		pass a datetime to test each Interval against it, an array of the same
+		length to test elementwise, or `timestamps[:, None]` for every pair.
+		"""
+		us = self._to_us(timestamps)
+		return (self.beg_us <= us) & (us < self.end_us)
+
+	def overlaps(self, other) -> np.ndarray:
+		"""Return whether the Intervals overlap other, as a bool array.
+
+		other can be an Interval or an IntervalArray which is broadcast like
+		`contains`.
+		"""
+		if isinstance(other, Interval):
+			other_beg = _datetime_to_us(other.beg)
+			other_end = _datetime_to_us(other.end)
+		else:
+			other_beg = other.beg_us
+			other_end = other.end_us
+		return (self.beg_us < other_end) & (other_beg < self.end_us)
+
+	def argsort(self) -> np.ndarray:
+		"""Return the indices that sort this array by beg then end."""
+		return np.lexsort((self.end_us, self.beg_us))
+
+	def sort(self):
+		"""Return a copy of this array sorted by beg then end."""
+		return self._from_data(self._data[self.argsort()], self._tzinfo)
+
+	def merge_adjacent(self):
+		"""Return a sorted copy with consecutive Intervals joined together.
+
+		This is the bulk version of adding Intervals. After sorting, each run of
+		Intervals where every one ends where the next begins becomes a single
+		Interval. Overlapping Intervals aren't joined.
+		"""
+		data = self._data[self.argsort()]
+		if len(data) < 2:
+			return self._from_data(data, self._tzinfo)
+		starts = np.ones(len(data), dtype=bool)
+		starts[1:] = data[1:, 0] != data[:-1, 1]
+		ends = np.ones(len(data), dtype=bool)
+		ends[:-1] = starts[1:]
+		merged = np.column_stack((data[starts, 0], data[ends, 1]))
+		return self._from_data(merged, self._tzinfo)
+
+	def pace(self, dt=None) -> np.ndarray:
+		"""Return how far through each Interval dt is, see `pace_many`.
+
+		If dt isn't passed use datetime.now()
+		"""
+		if dt is None:
+			dt = datetime.now(self._tzinfo)
+		return pace_many(self.beg_us, self.end_us, self._to_us(dt))
+
+	def run_rate(self, dt=None, values=1, fill_value=np.nan) -> np.ndarray:
+		"""Return the run rates for values at dt, see `run_rate_many`."""
+		if dt is None:
+			dt = datetime.now(self._tzinfo)
+		return run_rate_many(
+			self.beg_us,
+			self.end_us,
+			self._to_us(dt),
+			values,
+			fill_value=fill_value,
+			)
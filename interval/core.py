@@ -0,0 +1,1814 @@
+"""The Interval classes."""
+from abc import ABCMeta, abstractmethod
+import calendar
+from collections import OrderedDict, namedtuple
+from collections.abc import Sequence
+import copyreg
+from datetime import datetime, date, timedelta, timezone, tzinfo, MAXYEAR
+from itertools import accumulate, chain, islice, repeat
+from numbers import Integral
+from threading import Lock
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _datetime_to_us(dt: datetime) -> int:
+	"""Return the microseconds since the epoch of dt, in UTC if dt is aware."""
+	if dt.tzinfo is None:
+		return (dt - _EPOCH) // _MICROSECOND
+	return (dt - _EPOCH_UTC) // _MICROSECOND
+
+
+def _add_absolute(dt: datetime, delta: timedelta) -> datetime:
+	"""Return dt plus delta of elapsed time, in the tzinfo of dt.
+
+	Adding a timedelta to an aware datetime adds wall clock time, which is a
+	different amount of elapsed time across a DST transition.
+	"""
+	tzinfo = dt.tzinfo
+	if tzinfo is None or isinstance(tzinfo, timezone):
+		return dt + delta
+	return (dt.astimezone(timezone.utc) + delta).astimezone(tzinfo)
+
+
+def _sub_absolute(a: datetime, b: datetime) -> timedelta:
+	"""Return the elapsed time from b to a."""
+	tzinfo = a.tzinfo
+	if tzinfo is None or tzinfo is not b.tzinfo or isinstance(tzinfo, timezone):
+		return a - b
+	return a.astimezone(timezone.utc) - b.astimezone(timezone.utc)
+
+
+def _existing(dt: datetime) -> datetime:
+	"""Return dt moved out of the gap when clocks go forward, if it is in it.
+
+	Wall clock times that don't exist in the tzinfo of dt are converted
+	through UTC, so 2:00 on the day clocks go forward from 2:00 to 3:00
+	becomes 3:00. Other datetimes, including the fold, are unchanged.
+	"""
+	tzinfo = dt.tzinfo
+	if tzinfo is None or isinstance(tzinfo, timezone):
+		return dt
+	return dt.astimezone(timezone.utc).astimezone(tzinfo)
+
+
+def _us_to_datetime(us: int, tzinfo: tzinfo = None) -> datetime:
+	"""Return the datetime us microseconds after the epoch.
+
+	If tzinfo is passed, us are counted in UTC and the result is in tzinfo.
+	"""
+	if tzinfo is None:
+		return _EPOCH + timedelta(microseconds=us)
+	return (_EPOCH_UTC + timedelta(microseconds=us)).astimezone(tzinfo)
+
+
+# The timedelta keyword of each ISO 8601 duration designator, for the date
+# part before T and the time part after it
+_DURATION_DATE_UNITS = {'W': 'weeks', 'D': 'days'}
+_DURATION_TIME_UNITS = {'H': 'hours', 'M': 'minutes', 'S': 'seconds'}
+
+
+def _format_duration(delta: timedelta) -> str:
+	"""Return delta as an ISO 8601 duration, eg. 'PT1H' or 'P1DT0.5S'."""
+	if delta < timedelta(0):
+		raise ValueError('Negative durations have no ISO 8601 form')
+	hours, seconds = divmod(delta.seconds, 3600)
+	minutes, seconds = divmod(seconds, 60)
+	time = ''
+	if hours:
+		time += '{}H'.format(hours)
+	if minutes:
+		time += '{}M'.format(minutes)
+	if delta.microseconds:
+		time += '{}.{:06d}'.format(seconds, delta.microseconds).rstrip('0') + 'S'
+	elif seconds:
+		time += '{}S'.format(seconds)
+	if delta.days:
+		return 'P{}D'.format(delta.days) + ('T' + time if time else '')
+	return 'PT' + (time or '0S')
+
+
+def _parse_duration(string: str) -> timedelta:
+	"""Return the timedelta of an ISO 8601 duration without years or months.
+
+	Raises:
+		ValueError: If string isn't a duration in weeks, days, hours, minutes
+			and seconds.
+	"""
+	if not string.startswith('P') or not string.isascii():
+		raise ValueError('Invalid ISO 8601 duration {!r}'.format(string))
+	kwargs = {}
+	units = _DURATION_DATE_UNITS
+	number = ''
+	for char in string[1:]:
+		if char.isdigit() or char in '.,':
+			number += char
+		elif char == 'T' and not number and units is _DURATION_DATE_UNITS:
+			units = _DURATION_TIME_UNITS
+		elif char in units and number and units[char] not in kwargs:
+			number = number.replace(',', '.')
+			kwargs[units[char]] = float(number) if '.' in number else int(number)
+			number = ''
+		else:
+			raise ValueError('Invalid ISO 8601 duration {!r}'.format(string))
+	if number or not kwargs:
+		raise ValueError('Invalid ISO 8601 duration {!r}'.format(string))
+	return timedelta(**kwargs)
+
+
+def _parse_datetime(string: str, tzinfo: tzinfo = None) -> datetime:
+	"""Return the datetime of an ISO 8601 string, in tzinfo if passed.
+
+	Naive datetimes are given tzinfo and aware ones are converted to it.
+	"""
+	dt = datetime.fromisoformat(string)
+	if tzinfo is None:
+		return dt
+	if dt.tzinfo is None:
+		return dt.replace(tzinfo=tzinfo)
+	return dt.astimezone(tzinfo)
+
+
+def _digits(string: str) -> int:
+	"""Return the int of a string of ASCII digits, without signs or spaces."""
+	if not (string.isascii() and string.isdigit()):
+		raise ValueError('Expected digits, not {!r}'.format(string))
+	return int(string)
+
+
+class Interval():
+	"""An Interval is a specific timespan, with fixed beginning and end datetimes.
+
+	At least 2 of beg, end and delta must be passed to determine the interval.
+	If all 3 are passed, then `end - beg == delta`.
+
+	Args:
+		beg: The start of the interval, inclusive.
+		end: The end of the interval, exclusive.
+		delta: The length of the interval.
+	Raises:
+		TypeError: If beg has tzinfo and end does not or vice versa.
+		ValueError: If at least 2 args are not passed or all 3 are but don't
+			match
+	"""
+
+	__slots__ = ('_beg', '_delta')
+
+	def __init__(
+			self,
+			beg: datetime = None,
+			end: datetime = None,
+			delta: timedelta = None,
+			) -> None:
+		"""Create an Interval with arbitrary beg and end datetimes."""
+		if beg:
+			self._beg = beg
+			if delta:
+				self._delta = delta
+				if end and self.end != end:
+					raise ValueError('delta != end - beg')
+			else:
+				if not end:
+					raise ValueError('Must pass at least 2 of beg, end & delta')
+				# Implicitly check that end and beg eith both have or don't
+				# have tzinfo
+				self._delta = end - beg
+		else:
+			if not (end and delta):
+				raise ValueError('Must pass at least 2 of beg, end & delta')
+			self._beg = end - delta
+			self._delta = delta
+
+	def __repr__(self):
+		return '{cls}(beg={self.beg!r}, end={self.end!r})'.format(
+			cls=self.__class__.__name__,
+			self=self,
+			)
+
+	def __str__(self):
+		return '{self.beg}-{self.end}'.format(self=self)
+
+	def __bool__(self):
+		return self.end > self.beg
+
+	@property
+	def beg(self) -> datetime:
+		"""The beginning of this Interval, inclusive."""
+		return self._beg
+
+	@property
+	def end(self) -> datetime:
+		"""The end of this Interval, exclusive."""
+		return self.beg + self.delta
+
+	@property
+	def delta(self) -> timedelta:
+		"""The length of this interval."""
+		return self._delta
+
+	@property
+	def tzinfo(self) -> tzinfo:
+		"""The tzinfo for this Interval."""
+		return self.beg.tzinfo
+
+	def __contains__(self, d: datetime):
+		return self.beg <= d < self.end
+
+	def __eq__(self, other):
+		if not isinstance(other, Interval):
+			return False
+		return (self.beg, self.end) == (other.beg, other.end)
+
+	def __hash__(self):
+		return hash((self.beg, self.end))
+
+	def __getstate__(self):
+		# Classes with __slots__ need this to pickle with protocols 0 and 1
+		return {
+			name: getattr(self, name)
+			for cls in type(self).__mro__
+			for name in cls.__dict__.get('__slots__', ())
+			if hasattr(self, name)
+			}
+
+	def __setstate__(self, state):
+		for name, value in state.items():
+			setattr(self, name, value)
+
+	def pace(self, dt=None) -> float:
+		"""Return how far through this interval dt is.
+
+		If dt isn't passed use datetime.now()
+		"""
+		if dt is None:
+			dt = datetime.now(self.tzinfo)
+		if dt < self.beg:
+			return 0.0
+		elif dt > self.end:
+			return 1.0
+		else:
+			return (dt - self.beg) / self.delta
+
+	def run_rate(self, dt: datetime = None, value=1):
+		"""Return the run rate for value at dt.
+
+		If dt is x% through the Interval, calulate the basic run rate for value.
+		"""
+		return value / self.pace(dt)
+
+	def pace_many(self, timestamps, unit: str = 'us'):
+		"""Return how far through this interval each of timestamps is.
+
+		This is a vectorized `pace` and requires numpy, see
+		`interval.vectorized.pace_many`.
+		"""
+		from .vectorized import pace_many
+		return pace_many(
+			_datetime_to_us(self.beg),
+			_datetime_to_us(self.end),
+			timestamps,
+			unit,
+			)
+
+	def run_rate_many(
+			self,
+			timestamps,
+			values=1,
+			unit: str = 'us',
+			fill_value=float('nan'),
+			):
+		"""Return the run rates for values at each of timestamps.
+
+		This is a vectorized `run_rate` and requires numpy. Where the pace is
+		0.0 the result is fill_value instead of raising ZeroDivisionError.
+		"""
+		from .vectorized import run_rate_many
+		return run_rate_many(
+			_datetime_to_us(self.beg),
+			_datetime_to_us(self.end),
+			timestamps,
+			values,
+			unit=unit,
+			fill_value=fill_value,
+			)
+
+	@classmethod
+	def from_string(cls, string: str, tzinfo: tzinfo = None):
+		"""Parse an ISO 8601 interval, eg. '2017-02-08T13:00/PT1H'.
+
+		Both 'start/duration' and 'start/end' are accepted. Durations can't
+		have years or months since those don't have a fixed length.
+
+		Args:
+			string: The interval.
+			tzinfo: If passed, naive datetimes are given tzinfo and aware
+				ones are converted to it.
+		Raises:
+			ValueError: If string isn't an ISO 8601 interval.
+		"""
+		beg, slash, rest = string.partition('/')
+		if not slash:
+			raise ValueError(
+				'{!r} is not a start/duration or start/end interval'.format(string)
+				)
+		beg = _parse_datetime(beg, tzinfo)
+		if rest.startswith('P'):
+			return cls(beg, delta=_parse_duration(rest))
+		return cls(beg, _parse_datetime(rest, tzinfo))
+
+	def to_string(self) -> str:
+		"""Return this Interval as an ISO 8601 'start/duration' string."""
+		return '{}/{}'.format(self.beg.isoformat(), _format_duration(self.delta))
+
+	def __add__(self, other):
+		if other.end == self.beg:
+			return Interval(other.beg, self.end)
+		elif self.end == other.beg:
+			return Interval(self.beg, other.end)
+		else:
+			raise ValueError('Interval is not consecutive with this Interval')
+
+
+class EpochInterval(Interval):
+	"""An Interval that also keeps its bounds as integer microseconds.
+
+	beg and end are stored as microseconds since 1970-01-01, in UTC if the
+	Interval is aware, so comparing EpochIntervals with each other never
+	calls utcoffset and is integer comparisons. beg and end still return
+	datetimes. delta is the elapsed time between them, so an aware
+	EpochInterval across a DST transition isn't shortened or lengthened by
+	the change in utcoffset, and delta is elapsed time when it is passed too.
+
+	EpochIntervals are equal to Intervals with the same beg and end and hash
+	the same, so the hash is computed from the datetimes once and kept.
+
+	Args:
+		beg: The start of the interval, inclusive.
+		end: The end of the interval, exclusive.
+		delta: The length of the interval.
+	Raises:
+		TypeError: If beg has tzinfo and end does not or vice versa.
+		ValueError: If at least 2 args are not passed or all 3 are but don't
+			match
+	"""
+
+	__slots__ = ('_end', '_beg_us', '_end_us', '_hash')
+
+	def __init__(
+			self,
+			beg: datetime = None,
+			end: datetime = None,
+			delta: timedelta = None,
+			) -> None:
+		"""Create an EpochInterval with arbitrary beg and end datetimes."""
+		if beg:
+			beg_us = _datetime_to_us(beg)
+			if delta:
+				end_us = beg_us + delta // _MICROSECOND
+				if end and _datetime_to_us(end) != end_us:
+					raise ValueError('delta != end - beg')
+			else:
+				if not end:
+					raise ValueError('Must pass at least 2 of beg, end & delta')
+				if (beg.tzinfo is None) != (end.tzinfo is None):
+					raise TypeError("can't mix offset-naive and offset-aware datetimes")
+				end_us = _datetime_to_us(end)
+		else:
+			if not (end and delta):
+				raise ValueError('Must pass at least 2 of beg, end & delta')
+			end_us = _datetime_to_us(end)
+			beg_us = end_us - delta // _MICROSECOND
+			beg = _us_to_datetime(beg_us, end.tzinfo)
+		self._init_us(beg, beg_us, end_us)
+
+	def _init_us(self, beg: datetime, beg_us: int, end_us: int) -> None:
+		"""Set the bounds from beg_us and end_us, with beg already converted.
+
+		end and delta are elapsed time from beg_us to end_us, where subtracting
+		aware datetimes with the same tzinfo would give wall clock time.
+		"""
+		self._beg = beg
+		self._end = _us_to_datetime(end_us, beg.tzinfo)
+		self._delta = timedelta(microseconds=end_us - beg_us)
+		self._beg_us = beg_us
+		self._end_us = end_us
+		self._hash = None
+
+	@classmethod
+	def from_us(cls, beg_us: int, end_us: int, tzinfo: tzinfo = None):
+		"""Create an EpochInterval from microseconds since the epoch.
+
+		If tzinfo is passed, beg_us and end_us are counted in UTC.
+		"""
+		interval = cls.__new__(cls)
+		interval._init_us(_us_to_datetime(beg_us, tzinfo), beg_us, end_us)
+		return interval
+
+	@classmethod
+	def from_interval(cls, interval: Interval):
+		"""Create an EpochInterval with the same beg and end as interval."""
+		return cls(interval.beg, interval.end)
+
+	@property
+	def beg_us(self) -> int:
+		"""The beginning in microseconds since the epoch."""
+		return self._beg_us
+
+	@property
+	def end_us(self) -> int:
+		"""The end in microseconds since the epoch."""
+		return self._end_us
+
+	def __bool__(self):
+		return self._end_us > self._beg_us
+
+	def contains_us(self, us: int) -> bool:
+		"""Return whether us microseconds since the epoch is in this Interval."""
+		return self._beg_us <= us < self._end_us
+
+	@property
+	def end(self) -> datetime:
+		"""The end of this Interval, exclusive."""
+		return self._end
+
+	def __contains__(self, dt: datetime):
+		if self._beg.tzinfo is None or dt.tzinfo is None:
+			# Naive datetimes are wall clock time either way, and comparing
+			# naive with aware datetimes raises TypeError
+			return self._beg <= dt < self._end
+		return self._beg_us <= _datetime_to_us(dt) < self._end_us
+
+	def _same_clock(self, other) -> bool:
+		"""Return whether other is an EpochInterval that is naive iff self is."""
+		if not isinstance(other, EpochInterval):
+			return False
+		return (self._beg.tzinfo is None) == (other._beg.tzinfo is None)
+
+	def __eq__(self, other):
+		if self._same_clock(other):
+			return self._beg_us == other._beg_us and self._end_us == other._end_us
+		return super().__eq__(other)
+
+	def __hash__(self):
+		if self._hash is None:
+			self._hash = super().__hash__()
+		return self._hash
+
+	def __lt__(self, other):
+		if not self._same_clock(other):
+			return NotImplemented
+		return (self._beg_us, self._end_us) < (other._beg_us, other._end_us)
+
+	def __le__(self, other):
+		if not self._same_clock(other):
+			return NotImplemented
+		return (self._beg_us, self._end_us) <= (other._beg_us, other._end_us)
+
+	def __gt__(self, other):
+		if not self._same_clock(other):
+			return NotImplemented
+		return (self._beg_us, self._end_us) > (other._beg_us, other._end_us)
+
+	def __ge__(self, other):
+		if not self._same_clock(other):
+			return NotImplemented
+		return (self._beg_us, self._end_us) >= (other._beg_us, other._end_us)
+
+	def overlaps(self, other) -> bool:
+		"""Return whether this and another EpochInterval overlap."""
+		return self._beg_us < other._end_us and other._beg_us < self._end_us
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+def _intern_key(arg):
+	"""Return arg as a key that tells apart args making different Intervals.
+
+	Aware datetimes are equal if they are the same instant, even in different
+	timezones or folds, and tzinfos can be equal without being the same, so
+	they are keyed by wall clock time, tzinfo identity and fold. The interned
+	instance keeps its tzinfo alive so its id isn't reused.
+	"""
+	if isinstance(arg, datetime):
+		return arg.replace(tzinfo=None), id(arg.tzinfo), arg.fold
+	if isinstance(arg, tzinfo):
+		return id(arg)
+	return arg
+
+
+class _InternCache():
+	"""A bounded LRU cache of ProperIntervals keyed by their constructor args."""
+
+	__slots__ = ('maxsize', 'hits', 'misses', '_instances', '_lock')
+
+	def __init__(self, maxsize: int) -> None:
+		if maxsize < 1:
+			raise ValueError('maxsize must be at least 1')
+		self.maxsize = maxsize
+		self.hits = 0
+		self.misses = 0
+		self._instances = OrderedDict()
+		self._lock = Lock()
+
+	def get(self, cls, args):
+		"""Return the interned cls(*args), creating it if necessary."""
+		key = (cls, tuple(map(_intern_key, args)))
+		with self._lock:
+			instance = self._instances.get(key)
+			if instance is not None:
+				self._instances.move_to_end(key)
+				self.hits += 1
+				return instance
+		instance = cls(*args)
+		with self._lock:
+			self.misses += 1
+			self._instances[key] = instance
+			if len(self._instances) > self.maxsize:
+				self._instances.popitem(last=False)
+		return instance
+
+	def info(self) -> CacheInfo:
+		return CacheInfo(self.hits, self.misses, self.maxsize, len(self._instances))
+
+
+class _IterableInterval(metaclass=ABCMeta):
+	"""Mixin for classes that can be iterated over.
+
+	Adding an int n to an _IterableInterval returns the Interval n after it,
+	and subtracting two _IterableIntervals of the same type returns the number
+	of Intervals between them. Both take constant time for the built in types.
+	"""
+
+	__slots__ = ()
+
+	@property
+	def ordinal(self) -> int:
+		"""The position of this Interval among all Intervals of its type.
+
+		By default this is the number of steps from the Interval at the epoch
+		1970-01-01, in the same tzinfo. Subclasses that can do this
+		arithmetically should override this and from_ordinal.
+		"""
+		return self._ordinal_epoch(self.beg.tzinfo)._steps_to(self)
+
+	@classmethod
+	def from_ordinal(cls, ordinal: int, tzinfo: tzinfo = None):
+		"""Return the Interval of this type with ordinal, see `ordinal`."""
+		return cls._ordinal_epoch(tzinfo)._shift(ordinal)
+
+	@classmethod
+	def _ordinal_epoch(cls, tzinfo: tzinfo = None):
+		"""Return the Interval of this type with ordinal 0."""
+		return cls._first_at(_EPOCH.replace(tzinfo=tzinfo))
+
+	def __add__(self, other):
+		if isinstance(other, Integral):
+			return self._shift(int(other))
+		return Interval.__add__(self, other)
+
+	def __radd__(self, other):
+		if isinstance(other, Integral):
+			return self._shift(int(other))
+		return NotImplemented
+
+	def __sub__(self, other):
+		if isinstance(other, Integral):
+			return self._shift(-int(other))
+		if type(other) is type(self):
+			return other._steps_to(self)
+		return NotImplemented
+
+	@classmethod
+	def containing_many(
+			cls,
+			timestamps,
+			unit: str = 'us',
+			result: str = 'ordinal',
+			tzinfo: tzinfo = None,
+			**kwargs
+			):
+		"""Return the Intervals of this type containing each of timestamps.
+
+		This is a vectorized `containing` and requires numpy. For the built in
+		types it doesn't create any Intervals.
+
+		Args:
+			timestamps: An array of datetime64 or of integers since the epoch.
+			unit: The unit of integer timestamps, 's', 'ms', 'us' or 'ns'.
+			result: 'ordinal' to return an int64 array of ordinals or 'beg' to
+				return a datetime64[us] array of the beginnings.
+			tzinfo: If passed, timestamps are in UTC and are bucketed by wall
+				clock time in tzinfo, like the ordinals of aware Intervals. The
+				beginnings returned are wall clock times too, except for types
+				shorter than a day whose beginnings are in UTC, since wall
+				clock times repeat when clocks go back.
+			kwargs: Passed on to `containing`, eg. starts_on for a Week.
+		"""
+		from .vectorized import containing_many
+		return containing_many(
+			cls,
+			timestamps,
+			unit=unit,
+			result=result,
+			tzinfo=tzinfo,
+			**kwargs
+			)
+
+	@classmethod
+	@abstractmethod
+	def beginning(cls, dt: datetime):
+		"""Return an Interval of this type beginning on dt."""
+		raise NotImplementedError
+
+	@classmethod
+	def ending(cls, dt: datetime):
+		"""Return the instance of this class ending at datetime dt."""
+		return cls.beginning(dt).prev()
+
+	def next(self):
+		"""Return the next Interval of this type."""
+		return self.beginning(self.end)
+
+	@abstractmethod
+	def prev(self):
+		"""Return the previous Interval of this type."""
+		raise NotImplementedError
+
+	def _shift(self, n: int):
+		"""Return the Interval of this type n after self, or -n before if n < 0.
+
+		Subclasses that can do this arithmetically should override this.
+		"""
+		interval = self
+		step = type(self).next if n >= 0 else type(self).prev
+		for _ in range(abs(n)):
+			interval = step(interval)
+		return interval
+
+	def _take(self, count: int) -> list:
+		"""Return a list of count consecutive Intervals starting with self."""
+		return list(islice(self.iter(), count))
+
+	def _steps_to(self, other) -> int:
+		"""Return n such that `self._shift(n) == other`.
+
+		Subclasses that can do this arithmetically should override this.
+
+		Raises:
+			ValueError: If other can't be reached from self.
+		"""
+		steps = 0
+		interval = self
+		while interval.beg < other.beg:
+			interval = interval.next()
+			steps += 1
+		while interval.beg > other.beg:
+			interval = interval.prev()
+			steps -= 1
+		if interval != other:
+			raise ValueError('{other!r} does not line up with {self!r}'.format(
+				other=other,
+				self=self,
+				))
+		return steps
+
+	@classmethod
+	def divide(cls, interval: Interval, extras_action='raise', lazy=False):
+		"""Divide an interval into Intervals of this type.
+
+		extras_action can be 'raise', 'ignore', or 'partial'
+		'raise' - raise a ValueError if the passed IntervalType does not evenly
+			divide this Interval.
+		'ignore' - ignore parts of this Interval to divide self into subintervals
+			of interval_type
+		'partial' - return partial intervals not matching interval_type where
+			necessary
+
+		If lazy is True, return an IntervalRange instead of a list. Partial
+		intervals aren't of this type so lazy can't be used with 'partial'.
+		"""
+		possible_values = ('raise', 'ignore', 'partial')
+		if extras_action not in possible_values:
+			poss_values_str = '","'.join(possible_values)
+			raise ValueError('extras_action must be one of "%s"' % poss_values_str)
+		if lazy and extras_action == 'partial':
+			raise ValueError("extras_action can't be 'partial' if lazy")
+		if not interval:
+			return IntervalRange(cls._first_at(interval.beg), 0) if lazy else []
+		first, head = cls._divide_head(interval, extras_action)
+		count, tail = cls._divide_tail(interval, extras_action, first)
+		if lazy:
+			if head:
+				return IntervalRange(head[0], count + 1)
+			return IntervalRange(first, count)
+		return head + first._take(count) + tail
+
+	@classmethod
+	def _first_at(cls, dt: datetime):
+		"""Return the Interval of this type that dividing from dt starts with."""
+		return cls.containing(dt)
+
+	@classmethod
+	def _divide_head(cls, interval: Interval, extras_action):
+		"""Return the first whole Interval in interval and the extras before it."""
+		first = cls._first_at(interval.beg)
+		if first.beg == interval.beg:
+			return first, []
+		if extras_action == 'raise':
+			raise ValueError(
+				'The beginning of interval is not the beginning of a ' +
+				cls.__name__
+				)
+		elif extras_action == 'partial':
+			head = [Interval(beg=interval.beg, end=min(first.end, interval.end))]
+		else:
+			head = [first]
+		return first._shift(1), head
+
+	@classmethod
+	def _divide_tail(cls, interval: Interval, extras_action, first):
+		"""Return the number of whole Intervals from first and the extras after."""
+		if first.beg >= interval.end:
+			return 0, []
+		last = cls._last_at(first, interval.end)
+		count = first._steps_to(last)
+		if last.beg == interval.end:
+			return count, []
+		if extras_action == 'raise':
+			raise ValueError(
+				'The end of interval is does not line up with ' +
+				cls.__name__
+				)
+		elif extras_action == 'partial':
+			return count, [Interval(beg=last.beg, end=interval.end)]
+		if not count and first.beg == interval.beg:
+			# An Interval shorter than one of this type that begins on one
+			# has always been divided into that one
+			return 1, []
+		return count, []
+
+	@classmethod
+	def _last_at(cls, first, dt: datetime):
+		"""Return the Interval lined up with first that contains dt."""
+		return cls._first_at(dt)
+
+	def divide_into(self, interval_type, extras_action='raise', lazy=False):
+		"""Inverse way of calling `divide`.
+
+		Args:
+			interval_type (_IterableInterval): The type of interval to divide self into.
+			extras_action: See `divide`
+			lazy: See `divide`
+		"""
+		return interval_type.divide(self, extras_action=extras_action, lazy=lazy)
+
+	def iter(self, count=None, end=None, reverse=False):
+		"""Generate Intervals of this class starting with self.
+
+		Args:
+			count: If not None, generate at most count Intervals
+			end: If not None, stop before this is yielded
+			reverse: If true, generate backwards
+		"""
+		yielded_count = 0
+		next_interval = self
+		while True:
+			if count is not None and yielded_count >= count:
+				break
+			if next_interval == end:
+				break
+			yield next_interval
+			yielded_count += 1
+			if reverse:
+				next_interval = next_interval.prev()
+			else:
+				next_interval = next_interval.next()
+
+
+class IntervalRange(Sequence):
+	"""A lazy sequence of consecutive Intervals of one _IterableInterval type.
+
+	Like `range`, an IntervalRange only stores where it starts, its length and
+	its step. Intervals are created when they are accessed, and len, indexing,
+	slicing, `in` and `index` don't depend on the length.
+
+	Args:
+		start: The first Interval.
+		count: The number of Intervals.
+		step: The number of Intervals of start's type between each element.
+	"""
+
+	__slots__ = ('_start', '_offsets')
+
+	def __init__(
+			self,
+			start: _IterableInterval,
+			count: int,
+			step: int = 1,
+			) -> None:
+		if step == 0:
+			raise ValueError('step must not be zero')
+		self._start = start
+		self._offsets = range(0, max(count, 0) * step, step)
+
+	@classmethod
+	def _from_offsets(cls, start: _IterableInterval, offsets: range):
+		interval_range = cls.__new__(cls)
+		interval_range._start = start
+		interval_range._offsets = offsets
+		return interval_range
+
+	@classmethod
+	def between(
+			cls,
+			start: _IterableInterval,
+			stop: _IterableInterval,
+			step: int = 1,
+			):
+		"""Return the IntervalRange from start up to but not including stop."""
+		offsets = range(0, start._steps_to(stop), step)
+		return cls._from_offsets(start, offsets)
+
+	def __repr__(self):
+		# Slices keep the original start, so show the first element instead
+		start = self[0] if self._offsets else self._start
+		if self.step == 1:
+			return '{cls}({start!r}, {count})'.format(
+				cls=self.__class__.__name__,
+				start=start,
+				count=len(self),
+				)
+		return '{cls}({start!r}, {count}, step={step})'.format(
+			cls=self.__class__.__name__,
+			start=start,
+			count=len(self),
+			step=self.step,
+			)
+
+	@property
+	def step(self) -> int:
+		return self._offsets.step
+
+	def __len__(self):
+		return len(self._offsets)
+
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			return self._from_offsets(self._start, self._offsets[index])
+		return self._start._shift(self._offsets[index])
+
+	def __iter__(self):
+		if not self._offsets:
+			return iter(())
+		if self.step == 1:
+			return islice(self[0].iter(), len(self))
+		return map(self._start._shift, self._offsets)
+
+	def __reversed__(self):
+		if not self._offsets:
+			return iter(())
+		if self.step == 1:
+			return islice(self[-1].iter(reverse=True), len(self))
+		return map(self._start._shift, reversed(self._offsets))
+
+	def _offset_of(self, interval):
+		"""Return the offset from start of interval or None if not in self."""
+		if type(interval) is not type(self._start):
+			if not isinstance(interval, Interval):
+				return None
+			# Other Intervals are in self if they equal one of its elements
+			candidate = type(self._start)._first_at(interval.beg)
+			if type(candidate) is not type(self._start) or candidate != interval:
+				return None
+			interval = candidate
+		try:
+			offset = self._start._steps_to(interval)
+		except ValueError:
+			return None
+		if offset not in self._offsets:
+			return None
+		# Intervals of the same type can still differ, eg. in tzinfo
+		if self._start._shift(offset) != interval:
+			return None
+		return offset
+
+	def __contains__(self, interval):
+		return self._offset_of(interval) is not None
+
+	def index(self, interval):
+		offset = self._offset_of(interval)
+		if offset is None:
+			raise ValueError('{!r} is not in {}'.format(
+				interval,
+				self.__class__.__name__,
+				))
+		return self._offsets.index(offset)
+
+	def count(self, interval):
+		return int(interval in self)
+
+	def __eq__(self, other):
+		if not isinstance(other, IntervalRange):
+			return NotImplemented
+		if len(self) != len(other):
+			return False
+		# Two elements determine all the rest
+		return tuple(self[:2]) == tuple(other[:2])
+
+	def __hash__(self):
+		return hash((len(self), tuple(self[:2])))
+
+
+class ProperInterval(_IterableInterval, Interval, metaclass=ABCMeta):
+	"""A Interval representing a span on a clock or calendar, eg. a month or hour.
+
+	This is in contrast to a Interval starting at an abitrary point time.
+	1:00-2:00 can be a ProperInterval while 1:14-2:14 cannot.
+
+	ProperIntervals can be compared because they cannot overlap.
+
+	To create a new ProperInterval, inherit from ProperInterval and implement
+	classmthod `containing` and method `prev`.
+
+	ProperIntervals returned by `containing` can optionally be interned, see
+	`enable_interning`.
+	"""
+
+	__slots__ = ()
+
+	_intern_cache = None
+
+	@classmethod
+	@abstractmethod
+	def containing(cls, dt: datetime):
+		"""Return the instance of this class containing datetime dt."""
+		raise NotImplementedError
+
+	@classmethod
+	def beginning(cls, dt: datetime):
+		"""Return the instance of this class beginning at datetime dt."""
+		interval = cls.containing(dt)
+		if interval.beg != dt:
+			raise ValueError('dt is not the beggining of a {cls}'.format(cls=cls))
+		return interval
+
+	@classmethod
+	def first_after(cls, dt: datetime):
+		"""Return the first ProperInterval following datetime."""
+		return cls.containing(dt).next()
+
+	@classmethod
+	def last_before(cls, dt: datetime):
+		"""Return last ProperInterval before datetime."""
+		return cls.containing(dt).prev()
+
+	@classmethod
+	def enable_interning(cls, maxsize: int = 1024):
+		"""Return the same instance for repeated `containing` calls.
+
+		Instances are kept in a bounded LRU cache of size maxsize. Enabling
+		interning on a class applies to all of its subclasses that don't have
+		their own cache, eg. `ProperInterval.enable_interning()` shares one
+		cache between all ProperIntervals.
+		"""
+		cls._intern_cache = _InternCache(maxsize)
+
+	@classmethod
+	def disable_interning(cls):
+		"""Stop interning the instances returned by `containing`."""
+		cls._intern_cache = None
+
+	@classmethod
+	def interning_info(cls) -> CacheInfo:
+		"""Return the hits, misses, maxsize & currsize of the intern cache.
+
+		Returns None if interning isn't enabled for this class.
+		"""
+		if cls._intern_cache is None:
+			return None
+		return cls._intern_cache.info()
+
+	@classmethod
+	def _interned(cls, *args):
+		"""Return cls(*args), from the intern cache if interning is enabled."""
+		intern_cache = cls._intern_cache
+		if intern_cache is None:
+			return cls(*args)
+		return intern_cache.get(cls, args)
+
+	@classmethod
+	def _check_type(cls, other):
+		return isinstance(other, cls)
+
+	def __lt__(self, other):
+		if not self._check_type(other):
+			return NotImplemented
+		return self.beg < other.beg
+
+	def __gt__(self, other):
+		if not self._check_type(other):
+			return NotImplemented
+		return self.beg > other.beg
+
+	def __le__(self, other):
+		if not self._check_type(other):
+			return NotImplemented
+		return self.beg <= other.beg
+
+	def __ge__(self, other):
+		if not self._check_type(other):
+			return NotImplemented
+		return self.beg >= other.beg
+
+	def __str__(self):
+		return '<{type} starting {self.beg}>'.format(
+			type=type(self),
+			self=self,
+			)
+
+
+def _month_start(index: int) -> int:
+	"""Return the day ordinal of the first of a month.
+
+	Month index (year - 1) * 12 + month - 1, up to one past 9999-12.
+	"""
+	year, month = divmod(index, 12)
+	if year == MAXYEAR:
+		return date.max.toordinal() + 1
+	return date(year + 1, month + 1, 1).toordinal()
+
+
+class _MonthsInterval(ProperInterval):
+	"""Base class for ProperIntervals made up of whole months.
+
+	Subclasses set `_num_months` and implement `_month_index` and
+	`_set_bounds`. The boundaries are computed on first access and then kept
+	on the instance, subclasses must initialize them to None.
+	"""
+
+	__slots__ = ('_year', '_tzinfo', '_end')
+
+	_num_months = None
+
+	@property
+	@abstractmethod
+	def _month_index(self) -> int:
+		"""The month index, see `_month_start`, of the first month."""
+		raise NotImplementedError
+
+	@abstractmethod
+	def _set_bounds(self):
+		"""Compute and store _beg and _end."""
+		raise NotImplementedError
+
+	@property
+	def year(self) -> int:
+		return self._year
+
+	@property
+	def tzinfo(self) -> tzinfo:
+		return self._tzinfo
+
+	@property
+	def beg(self) -> datetime:
+		if self._beg is None:
+			self._set_bounds()
+		return self._beg
+
+	@property
+	def end(self) -> datetime:
+		if self._end is None:
+			self._set_bounds()
+		return self._end
+
+	@property
+	def delta(self) -> timedelta:
+		if self._delta is None:
+			self._delta = timedelta(days=self.num_days())
+		return self._delta
+
+	@classmethod
+	@abstractmethod
+	def _from_month_index(cls, index: int, tzinfo: tzinfo = None):
+		"""Return the instance of this class starting at month index."""
+		raise NotImplementedError
+
+	@property
+	def ordinal(self) -> int:
+		"""The position of this Interval counting from year 0.
+
+		This is `year` for a Year, `year * 4 + quarter - 1` for a Quarter and
+		`year * 12 + month - 1` for a Month.
+		"""
+		return (self._month_index + 12) // self._num_months
+
+	@classmethod
+	def from_ordinal(cls, ordinal: int, tzinfo: tzinfo = None):
+		return cls._from_month_index(ordinal * cls._num_months - 12, tzinfo)
+
+	def _shift(self, n: int):
+		index = self._month_index + n * self._num_months
+		return self._from_month_index(index, self._tzinfo)
+
+	def _steps_to(self, other) -> int:
+		return (other._month_index - self._month_index) // self._num_months
+
+	def _take(self, count: int) -> list:
+		return [self._shift(i) for i in range(count)]
+
+	def num_days(self) -> int:
+		"""Return the number of days in this Interval."""
+		index = self._month_index
+		return _month_start(index + self._num_months) - _month_start(index)
+
+	# Instances of the same type with the same tzinfo are compared by month
+	# index without computing their boundaries.
+
+	def __contains__(self, dt: datetime):
+		if isinstance(dt, datetime) and dt.tzinfo is self._tzinfo:
+			index = (dt.year - 1) * 12 + dt.month - 1
+			return 0 <= index - self._month_index < self._num_months
+		return super().__contains__(dt)
+
+	def __eq__(self, other):
+		if type(other) is type(self) and other._tzinfo is self._tzinfo:
+			return self._month_index == other._month_index
+		return super().__eq__(other)
+
+	__hash__ = Interval.__hash__
+
+	def __lt__(self, other):
+		if type(other) is type(self) and other._tzinfo is self._tzinfo:
+			return self._month_index < other._month_index
+		return super().__lt__(other)
+
+	def __gt__(self, other):
+		if type(other) is type(self) and other._tzinfo is self._tzinfo:
+			return self._month_index > other._month_index
+		return super().__gt__(other)
+
+	def __le__(self, other):
+		if type(other) is type(self) and other._tzinfo is self._tzinfo:
+			return self._month_index <= other._month_index
+		return super().__le__(other)
+
+	def __ge__(self, other):
+		if type(other) is type(self) and other._tzinfo is self._tzinfo:
+			return self._month_index >= other._month_index
+		return super().__ge__(other)
+
+
+class Year(_MonthsInterval):
+	"""A ProperInterval for a Year."""
+
+	__slots__ = ()
+
+	_num_months = 12
+
+	def __init__(self, year: int, tzinfo: tzinfo = None) -> None:
+		self._year = year
+		self._tzinfo = tzinfo
+		self._beg = self._end = self._delta = None
+
+	def __str__(self):
+		return str(self.year)
+
+	@classmethod
+	def from_string(cls, string: str, tzinfo: tzinfo = None):
+		"""Parse a year like '2017', see `to_string`."""
+		if len(string) != 4:
+			raise ValueError('{!r} is not a year like 2017'.format(string))
+		return cls._interned(_digits(string), tzinfo)
+
+	def to_string(self) -> str:
+		"""Return the year as four digits, like str but padded with zeros."""
+		return '{:04d}'.format(self._year)
+
+	@property
+	def _month_index(self) -> int:
+		return (self._year - 1) * 12
+
+	@classmethod
+	def _from_month_index(cls, index: int, tzinfo: tzinfo = None):
+		return cls(index // 12 + 1, tzinfo)
+
+	def _set_bounds(self):
+		self._beg = datetime(self._year, 1, 1, tzinfo=self._tzinfo)
+		self._end = datetime(self._year + 1, 1, 1, tzinfo=self._tzinfo)
+
+	@classmethod
+	def containing(cls, dt: datetime):
+		return cls._interned(dt.year, dt.tzinfo)
+
+	def prev(self):
+		return type(self)(self.year - 1, self.tzinfo)
+
+	def isleap(self):
+		return calendar.isleap(self.year)
+
+	def date(self, month, day):
+		return date(self.year, month, day)
+
+	def datetime(self, *args, **kwargs):
+		if 'tzinfo' not in kwargs:
+			kwargs['tzinfo'] = self.tzinfo
+		return datetime(self.year, *args, **kwargs)
+
+
+class Quarter(_MonthsInterval):
+	"""ProperInterval for a quarter (of a year)."""
+
+	__slots__ = ('_quarter', )
+
+	_num_months = 3
+
+	def __init__(self, year: int, quarter: int, tzinfo: tzinfo = None) -> None:
+		if not (1 <= quarter <= 4):
+			raise ValueError('quarter must be 1, 2, 3 or 4')
+		self._year = year
+		self._quarter = quarter
+		self._tzinfo = tzinfo
+		self._beg = self._end = self._delta = None
+
+	def __str__(self):
+		return '{self.year}-Q{self.quarter}'.format(self=self)
+
+	@classmethod
+	def from_string(cls, string: str, tzinfo: tzinfo = None):
+		"""Parse a quarter like '2017-Q1', see `to_string`."""
+		if len(string) != 7 or string[4:6] != '-Q':
+			raise ValueError('{!r} is not a quarter like 2017-Q1'.format(string))
+		return cls._interned(_digits(string[:4]), _digits(string[6]), tzinfo)
+
+	def to_string(self) -> str:
+		"""Return the quarter like str, padding the year with zeros."""
+		return '{:04d}-Q{}'.format(self._year, self._quarter)
+
+	@property
+	def quarter(self) -> int:
+		return self._quarter
+
+	@property
+	def _month_index(self) -> int:
+		return (self._year - 1) * 12 + (self._quarter - 1) * 3
+
+	@classmethod
+	def _from_month_index(cls, index: int, tzinfo: tzinfo = None):
+		year, month = divmod(index, 12)
+		return cls(year + 1, month // 3 + 1, tzinfo)
+
+	def _set_bounds(self):
+		year = self._year
+		month = self._quarter * 3 - 2
+		self._beg = datetime(year, month, 1, tzinfo=self._tzinfo)
+		if month == 10:
+			self._end = datetime(year + 1, 1, 1, tzinfo=self._tzinfo)
+		else:
+			self._end = datetime(year, month + 3, 1, tzinfo=self._tzinfo)
+
+	@classmethod
+	def containing(cls, dt: datetime):
+		quarter = (dt.month - 1) // 3 + 1
+		return cls._interned(dt.year, quarter, dt.tzinfo)
+
+	def prev(self):
+		if self.quarter == 1:
+			year = self.year - 1
+			quarter = 4
+		else:
+			year = self.year
+			quarter = self.quarter - 1
+		return type(self)(year, quarter, self.tzinfo)
+
+
+class Month(_MonthsInterval):
+	"""ProperInterval for a month."""
+
+	__slots__ = ('_month', )
+
+	_num_months = 1
+
+	def __init__(self, year: int, month: int, tzinfo: tzinfo = None) -> None:
+		if not (1 <= month <= 12):
+			raise ValueError
+		self._year = year
+		self._month = month
+		self._tzinfo = tzinfo
+		self._beg = self._end = self._delta = None
+
+	def __str__(self):
+		return '{self.name} {self.year}'.format(self=self)
+
+	@classmethod
+	def from_string(cls, string: str, tzinfo: tzinfo = None):
+		"""Parse an ISO 8601 month like '2017-02', see `to_string`."""
+		if len(string) != 7 or string[4] != '-':
+			raise ValueError('{!r} is not a month like 2017-02'.format(string))
+		month = _digits(string[5:])
+		if not 1 <= month <= 12:
+			raise ValueError('{!r} is not a month like 2017-02'.format(string))
+		return cls._interned(_digits(string[:4]), month, tzinfo)
+
+	def to_string(self) -> str:
+		"""Return the month in ISO 8601 form, eg. '2017-02'."""
+		return '{:04d}-{:02d}'.format(self._year, self._month)
+
+	@property
+	def month(self) -> int:
+		return self._month
+
+	@property
+	def _month_index(self) -> int:
+		return (self._year - 1) * 12 + self._month - 1
+
+	@classmethod
+	def _from_month_index(cls, index: int, tzinfo: tzinfo = None):
+		year, month = divmod(index, 12)
+		return cls(year + 1, month + 1, tzinfo)
+
+	def _set_bounds(self):
+		year = self._year
+		month = self._month
+		self._beg = datetime(year, month, 1, tzinfo=self._tzinfo)
+		if month == 12:
+			self._end = datetime(year + 1, 1, 1, tzinfo=self._tzinfo)
+		else:
+			self._end = datetime(year, month + 1, 1, tzinfo=self._tzinfo)
+
+	@classmethod
+	def containing(cls, dt: datetime):
+		return cls._interned(dt.year, dt.month, dt.tzinfo)
+
+	@property
+	def name(self):
+		return calendar.month_name[self.month]
+
+	@property
+	def abbr(self):
+		return calendar.month_abbr[self.month]
+
+	def prev(self):
+		if self.month == 1:
+			year = self.year - 1
+			month = 12
+		else:
+			year = self.year
+			month = self.month - 1
+		return Month(year, month, self.tzinfo)
+
+	def date(self, day):
+		return date(self.year, self.month, day)
+
+	def datetime(self, *args, **kwargs):
+		if 'tzinfo' not in kwargs:
+			kwargs['tzinfo'] = self.tzinfo
+		return datetime(self.year, self.month, *args, **kwargs)
+
+
+class FixedIntervalType(ABCMeta):
+	"""Type for FixedIntervals.
+
+	FixedIntervalTypes have an attribute delta that is the length of all
+	Intervals of that type.
+
+	FixedIntervalTypes can be multiplied by a number to get a new
+	FixedIntervalType.
+
+	The types made by `FixedInterval.create` and multiplication are kept in a
+	registry, so making the same type again returns the same class. They
+	pickle by how they were made rather than by name.
+	"""
+
+	# (base, delta, name) of each type made by create
+	_registry = {}
+	_registry_lock = Lock()
+
+	def __init__(cls, name, bases, namespace, **kwargs):
+		super().__init__(name, bases, namespace, **kwargs)
+		if isinstance(cls.__dict__.get('delta'), timedelta):
+			cls._absolute = cls.delta < timedelta(days=1)
+
+	def __mul__(self, value):
+		return self.create(value * self.delta)
+
+	@staticmethod
+	def registered_types() -> list:
+		"""Return the types made by `FixedInterval.create` in the registry."""
+		with FixedIntervalType._registry_lock:
+			return list(FixedIntervalType._registry.values())
+
+	@staticmethod
+	def clear_registry():
+		"""Forget the types made so far, the next create makes new ones.
+
+		Types already made keep working but aren't the same classes as the
+		ones made after clearing.
+		"""
+		with FixedIntervalType._registry_lock:
+			FixedIntervalType._registry.clear()
+
+
+def _create_fixed_interval_type(base, delta: timedelta, name: str):
+	"""Return base.create(delta, name), used to unpickle made types."""
+	return base.create(delta, name)
+
+
+def _reduce_fixed_interval_type(cls):
+	"""Pickle types made by create by how they were made, others by name."""
+	key = cls.__dict__.get('_registry_key')
+	if key is None:
+		return cls.__qualname__
+	return _create_fixed_interval_type, key
+
+
+copyreg.pickle(FixedIntervalType, _reduce_fixed_interval_type)
+
+
+class FixedInterval(_IterableInterval, Interval, metaclass=FixedIntervalType):
+	"""A Interval of a fixed length.
+
+	Ordinals count the number of deltas since the class attribute epoch.
+
+	Aware instances of types shorter than a day are delta of elapsed time
+	long, so an Hour across a DST transition still lasts an hour. Longer types
+	like Day are delta of wall clock time and run from midnight to midnight.
+	"""
+
+	__slots__ = ()
+
+	epoch = datetime(1970, 1, 1)
+
+	# Set by FixedIntervalType from delta
+	_absolute = False
+
+	def __init__(self, beg: datetime) -> None:
+		self._beg = beg
+
+	@property
+	@classmethod
+	@abstractmethod
+	def delta(self) -> timedelta:
+		raise NotImplementedError
+
+	@property
+	def end(self) -> datetime:
+		beg = self._beg
+		if beg.tzinfo is None or not self._absolute:
+			return beg + self.delta
+		return _add_absolute(beg, self.delta)
+
+	def __contains__(self, dt: datetime):
+		if dt.tzinfo is None or not self._absolute:
+			beg = self._beg
+			return beg <= dt < beg + self.delta
+		# Datetimes with the same tzinfo are compared by wall clock time
+		return timedelta(0) <= _sub_absolute(dt, self.beg) < self.delta
+
+	def prev(self):
+		return self.ending(self.beg)
+
+	@property
+	def ordinal(self) -> int:
+		"""The number of Intervals of this type between `epoch` and this one.
+
+		Intervals that don't start a multiple of delta from epoch are counted
+		as if they started at the preceding multiple. For aware Intervals the
+		local time is used, except for types shorter than a day which count
+		elapsed time from epoch in UTC, so that the hour repeated when clocks
+		go back has an ordinal of its own.
+		"""
+		if self._absolute and self.beg.tzinfo is not None:
+			return (self.beg - self.epoch.replace(tzinfo=timezone.utc)) // self.delta
+		return (self.beg.replace(tzinfo=None) - self.epoch) // self.delta
+
+	@classmethod
+	def from_ordinal(cls, ordinal: int, tzinfo: tzinfo = None):
+		if cls._absolute and tzinfo is not None:
+			# The Interval containing the last instant counted as ordinal, which
+			# begins in ordinal even if the UTC offset isn't a multiple of delta
+			last = cls.epoch.replace(tzinfo=timezone.utc) + (ordinal + 1) * cls.delta
+			return cls.containing((last - _MICROSECOND).astimezone(tzinfo))
+		beg = cls.epoch + ordinal * cls.delta
+		return cls(beg.replace(tzinfo=tzinfo))
+
+	def _shift(self, n: int):
+		beg = self._beg
+		if beg.tzinfo is None or not self._absolute:
+			return type(self)(beg + n * self.delta)
+		return type(self)(_add_absolute(beg, n * self.delta))
+
+	def _take(self, count: int) -> list:
+		if count <= 0:
+			return []
+		beg = self.beg
+		if self._absolute and beg.tzinfo is not None:
+			return [self._shift(i) for i in range(count)]
+		begs = accumulate(chain((beg, ), repeat(self.delta, count - 1)))
+		return list(map(type(self), begs))
+
+	def _steps_to(self, other) -> int:
+		if self._beg.tzinfo is None or not self._absolute:
+			elapsed = other.beg - self._beg
+		else:
+			elapsed = _sub_absolute(other.beg, self._beg)
+		steps, remainder = divmod(elapsed, self.delta)
+		if remainder:
+			raise ValueError('{other!r} does not line up with {self!r}'.format(
+				other=other,
+				self=self,
+				))
+		return steps
+
+	@classmethod
+	def _first_at(cls, dt: datetime):
+		# FixedIntervals that aren't ProperIntervals start wherever they're told
+		if issubclass(cls, ProperInterval):
+			return cls.containing(dt)
+		return cls.beginning(dt)
+
+	@classmethod
+	def _last_at(cls, first, dt: datetime):
+		if issubclass(cls, ProperInterval):
+			return cls.containing(dt)
+		if cls._absolute:
+			elapsed = _sub_absolute(dt, first.beg)
+		else:
+			elapsed = dt - first.beg
+		return first._shift(elapsed // cls.delta)
+
+	@classmethod
+	def containing(cls, dt: datetime):
+		"""Return the instance of this class containing datetime dt.
+
+		Instances are aligned on multiples of delta from epoch, in local time
+		for aware datetimes.
+		"""
+		naive = dt.replace(tzinfo=None)
+		beg = naive - (naive - cls.epoch) % cls.delta
+		# Types created from ProperIntervals can be interned
+		factory = getattr(cls, '_interned', cls)
+		if cls._absolute:
+			# Keep fold so the repeated hour when clocks go back is distinct
+			return factory(_existing(beg.replace(tzinfo=dt.tzinfo, fold=dt.fold)))
+		return factory(beg.replace(tzinfo=dt.tzinfo))
+
+	@classmethod
+	def beginning(cls, d: datetime):
+		"""Return the instance of this class beginning at datetime d."""
+		return cls(d)
+
+	@classmethod
+	def from_string(cls, string: str, tzinfo: tzinfo = None):
+		"""Parse an ISO 8601 'start/duration' or 'start/end' of this type.
+
+		Raises:
+			ValueError: If string isn't an interval of this type, ie. it isn't
+				delta long or a ProperInterval doesn't begin at start.
+		"""
+		beg, slash, rest = string.partition('/')
+		if not slash:
+			raise ValueError(
+				'{!r} is not a start/duration or start/end interval'.format(string)
+				)
+		beg = _parse_datetime(beg, tzinfo)
+		interval = cls._first_at(beg)
+		if interval.beg != beg:
+			raise ValueError('{!r} does not begin a {}'.format(string, cls.__name__))
+		if rest.startswith('P'):
+			matches = _parse_duration(rest) == cls.delta
+		else:
+			matches = _parse_datetime(rest, tzinfo) == interval.end
+		if not matches:
+			raise ValueError('{!r} is not a {} long'.format(string, cls.__name__))
+		return interval
+
+	@classmethod
+	def ending(cls, d: datetime):
+		"""Return the instance of this class ending at datetime d."""
+		if cls._absolute:
+			return cls(_add_absolute(d, -cls.delta))
+		return cls(d - cls.delta)
+
+	@classmethod
+	def create(cls, delta: timedelta, name='FixedInterval'):
+		"""Create a FixedIntervalType with delta delta.
+
+		The containing method of the new type aligns instances on multiples of
+		delta from epoch, even if cls has a containing specific to its delta.
+
+		Types are interned by cls, delta and name, so `Hour * 2` always
+		returns the same class, see `FixedIntervalType.registered_types`.
+		"""
+		key = (cls, delta, name)
+		registry = FixedIntervalType._registry
+		with FixedIntervalType._registry_lock:
+			interval_type = registry.get(key)
+			if interval_type is None:
+				interval_type = registry[key] = type(name, (cls, ), {
+					'delta': delta,
+					'containing': FixedInterval.__dict__['containing'],
+					'_registry_key': key,
+					'__module__': cls.__module__,
+					'__qualname__': name,
+					'__slots__': (),
+					})
+		return interval_type
+
+
+class Week(FixedInterval, ProperInterval):
+	"""ProperInterval for a week."""
+
+	__slots__ = ()
+
+	delta = timedelta(days=7)
+
+	# A Monday, so that ordinals count weeks starting on any day of the week
+	epoch = datetime(1970, 1, 5)
+
+	@classmethod
+	def containing(cls, dt: datetime, starts_on: int = None):
+		"""Create the week that starts on d.
+
+		Use calendar.setfirstweekday or pass starts_on to set the first
+		day of the week, must be 0(MONDAY) through 6 (SUNDAY).
+		"""
+		if starts_on is None:
+			starts_on = calendar.firstweekday()
+		days_prior = (dt.weekday() + 7 - starts_on) % 7
+		day_start = datetime(dt.year, dt.month, dt.day, tzinfo=dt.tzinfo)
+		week_start = day_start - timedelta(days=days_prior)
+		return cls._interned(week_start)
+
+	@classmethod
+	def from_ordinal(
+			cls,
+			ordinal: int,
+			tzinfo: tzinfo = None,
+			starts_on: int = None,
+			):
+		"""Return the week with ordinal starting on starts_on, see `containing`."""
+		if starts_on is None:
+			starts_on = calendar.firstweekday()
+		beg = cls.epoch + timedelta(weeks=ordinal, days=starts_on)
+		return cls(beg.replace(tzinfo=tzinfo))
+
+	@classmethod
+	def from_string(cls, string: str, tzinfo: tzinfo = None):
+		"""Parse an ISO 8601 week like '2017-W06', see `to_string`."""
+		length = len(string)
+		valid = length in (8, 10) and string[4:6] == '-W'
+		if not valid or length == 10 and string[8] != '-':
+			raise ValueError('{!r} is not a week like 2017-W06'.format(string))
+		weekday = _digits(string[9]) if length == 10 else 1
+		beg = datetime.fromisocalendar(
+			_digits(string[:4]),
+			_digits(string[6:8]),
+			weekday,
+			)
+		return cls._interned(beg.replace(tzinfo=tzinfo))
+
+	def to_string(self) -> str:
+		"""Return the ISO 8601 week, eg. '2017-W06'.
+
+		Weeks that don't start on Monday have the ISO weekday they start on
+		appended, eg. '2017-W05-7' for the week starting Sunday 2017-02-05.
+		"""
+		year, week, weekday = self.beg.isocalendar()
+		if weekday == 1:
+			return '{:04d}-W{:02d}'.format(year, week)
+		return '{:04d}-W{:02d}-{}'.format(year, week, weekday)
+
+
+class _SubDay():
+	"""A mixin for ProperIntervals shorter than a day."""
+
+	__slots__ = ()
+
+	@property
+	def year(self):
+		return self.beg.year
+
+	@property
+	def month(self):
+		return self.beg.month
+
+	@property
+	def day(self):
+		return self.beg.day
+
+	def weekday(self):
+		return self.beg.weekday()
+
+	def isoweekday(self):
+		return self.beg.isoweekday()
+
+	@property
+	def date(self):
+		return self.beg.date()
+
+
+class Day(FixedInterval, ProperInterval, _SubDay):
+	"""ProperInterval for a day."""
+
+	__slots__ = ()
+
+	delta = timedelta(days=1)
+
+	@classmethod
+	def containing(cls, dt: datetime):
+		d = datetime(dt.year, dt.month, dt.day, tzinfo=dt.tzinfo)
+		return cls._interned(d)
+
+	@classmethod
+	def from_string(cls, string: str, tzinfo: tzinfo = None):
+		"""Parse an ISO 8601 date like '2017-02-08', or an interval of a day."""
+		if '/' in string:
+			return super().from_string(string, tzinfo)
+		if len(string) != 10 or string[4] != '-' or string[7] != '-':
+			raise ValueError('{!r} is not a date like 2017-02-08'.format(string))
+		return cls._interned(datetime(
+			_digits(string[:4]),
+			_digits(string[5:7]),
+			_digits(string[8:]),
+			tzinfo=tzinfo,
+			))
+
+	def to_string(self) -> str:
+		"""Return the ISO 8601 date, eg. '2017-02-08'."""
+		return self.beg.date().isoformat()
+
+	@property
+	def name(self):
+		return calendar.day_name[self.weekday()]
+
+	@property
+	def abbr(self):
+		return calendar.day_abbr[self.weekday()]
+
+
+class Hour(FixedInterval, ProperInterval, _SubDay):
+	"""ProperInterval for an hour."""
+
+	__slots__ = ()
+
+	delta = timedelta(hours=1)
+
+	@classmethod
+	def containing(cls, dt: datetime):
+		dt = dt.replace(minute=0, second=0, microsecond=0)
+		return cls._interned(_existing(dt))
+
+
+class Minute(FixedInterval, ProperInterval, _SubDay):
+	"""ProperInterval for a minute."""
+
+	__slots__ = ()
+
+	delta = timedelta(minutes=1)
+
+	@classmethod
+	def containing(cls, dt: datetime):
+		dt = dt.replace(second=0, microsecond=0)
+		return cls._interned(_existing(dt))
+
+
+class Second(FixedInterval, ProperInterval, _SubDay):
+	"""ProperInterval for a second."""
+
+	__slots__ = ()
+
+	delta = timedelta(seconds=1)
+
+	@classmethod
+	def containing(cls, dt: datetime):
+		dt = dt.replace(microsecond=0)
+		return cls._interned(_existing(dt))
+
+
+class MilliSecond(FixedInterval, ProperInterval, _SubDay):
+	"""ProperInterval for a millisecond."""
+
+	__slots__ = ()
+
+	delta = timedelta(microseconds=1000)
+
+	@classmethod
+	def containing(cls, dt: datetime):
+		microsecond = dt.microsecond - dt.microsecond % 1000
+		dt = dt.replace(microsecond=microsecond)
+		return cls._interned(_existing(dt))
+
+
+class MicroSecond(FixedInterval, ProperInterval, _SubDay):
+	"""ProperInterval for a microsecond."""
+
+	__slots__ = ()
+
+	delta = timedelta(microseconds=1)
+
+	@classmethod
+	def containing(cls, dt: datetime):
+		return cls._interned(_existing(dt))
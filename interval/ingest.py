@@ -0,0 +1,219 @@
+"""Bucket the timestamps in large CSV or NDJSON files using a process pool.
+
+The file is split into byte ranges which are parsed and aggregated by
+separate processes. A range starts at the first line beginning in it, so the
+ranges don't have to line up with lines. Each process returns a dict of
+partial aggregates by bucket, which are then combined.
+
+CSV fields with quoted newlines aren't supported since the file is split on
+newlines.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import csv
+from datetime import datetime
+from decimal import Decimal, ROUND_FLOOR
+from functools import partial
+import json
+import os
+
+from .core import _us_to_datetime
+from .stream import get_reducer
+
+DEFAULT_CHUNK_SIZE = 64 * 1024 * 1024
+
+_EPOCH_UNITS = {
+	's': 1000000,
+	'ms': 1000,
+	'us': 1,
+	}
+
+
+def _epoch_us(field, multiplier: int) -> int:
+	"""Return an epoch timestamp field as whole microseconds, rounding down.
+
+	The digits are multiplied exactly, since a float doesn't have enough
+	precision for microseconds of a timestamp in seconds.
+	"""
+	if isinstance(field, int):
+		return field * multiplier
+	# Floats from NDJSON are converted by their shortest repr
+	us = Decimal(field if isinstance(field, str) else repr(field)) * multiplier
+	return int(us.to_integral_value(rounding=ROUND_FLOOR))
+
+
+def _parser(timestamp_format):
+	"""Return a function parsing a timestamp field."""
+	if timestamp_format is None:
+		return datetime.fromisoformat
+	if callable(timestamp_format):
+		return timestamp_format
+	if timestamp_format in _EPOCH_UNITS:
+		multiplier = _EPOCH_UNITS[timestamp_format]
+		return lambda field: _us_to_datetime(_epoch_us(field, multiplier))
+	return lambda field: datetime.strptime(field, timestamp_format)
+
+
+def chunks(path, chunk_size: int = DEFAULT_CHUNK_SIZE, start: int = 0) -> list:
+	"""Return (start, end) byte ranges covering the file at path from start."""
+	size = os.path.getsize(path)
+	byte_ranges = [
+		(beg, min(beg + chunk_size, size))
+		for beg in range(start, size, chunk_size)
+		]
+	return byte_ranges or [(start, start)]
+
+
+def _lines(path, start: int, end: int):
+	"""Generate the lines of a file beginning at or after start, before end."""
+	with open(path, 'rb') as file:
+		if start:
+			# A line beginning exactly at start follows a newline at start - 1
+			file.seek(start - 1)
+			file.readline()
+		position = file.tell()
+		while position < end:
+			line = file.readline()
+			if not line:
+				break
+			position += len(line)
+			yield line.decode()
+
+
+def _records(path, start: int, end: int, file_format: str, timestamp, value):
+	"""Generate (timestamp field, value field) for the lines in a byte range."""
+	lines = _lines(path, start, end)
+	if file_format == 'csv':
+		for row in csv.reader(lines):
+			if row:
+				yield row[timestamp], 1 if value is None else float(row[value])
+	else:
+		for line in lines:
+			if line.strip():
+				record = json.loads(line)
+				yield record[timestamp], 1 if value is None else record[value]
+
+
+def _aggregate_chunk(
+		byte_range,
+		path,
+		interval_type,
+		file_format: str,
+		timestamp,
+		value,
+		timestamp_format,
+		reducer: tuple,
+		kwargs: dict,
+		) -> dict:
+	"""Return the aggregates by bucket for the lines in byte_range."""
+	parse = _parser(timestamp_format)
+	initial, step, combine = reducer
+	totals = {}
+	bucket = beg = end = None
+	# Aggregate runs of rows in the same bucket before touching the dict
+	aggregate = None
+	records = _records(path, *byte_range, file_format, timestamp, value)
+	for field, row_value in records:
+		dt = parse(field)
+		if bucket is None or not beg <= dt < end:
+			if bucket is not None:
+				if bucket in totals:
+					aggregate = combine(totals[bucket], aggregate)
+				totals[bucket] = aggregate
+			bucket = interval_type.containing(dt, **kwargs)
+			beg, end = bucket.beg, bucket.end
+			aggregate = initial()
+		aggregate = step(aggregate, row_value)
+	if bucket is not None:
+		if bucket in totals:
+			aggregate = combine(totals[bucket], aggregate)
+		totals[bucket] = aggregate
+	return totals
+
+
+def ingest(
+		path,
+		interval_type,
+		timestamp=0,
+		value=None,
+		file_format: str = None,
+		timestamp_format=None,
+		reducer='sum',
+		workers: int = None,
+		chunk_size: int = DEFAULT_CHUNK_SIZE,
+		header: bool = True,
+		**kwargs
+		) -> dict:
+	"""Aggregate the values in a CSV or NDJSON file by interval_type.
+
+	Args:
+		path: The path of the file.
+		interval_type: The ProperInterval type of the buckets.
+		timestamp: The column name or index for CSV, or the key for NDJSON, of
+			the timestamps.
+		value: The column name or index, or key, of the values. If None each
+			row counts as 1.
+		file_format: 'csv' or 'ndjson', by default from the extension of path.
+		timestamp_format: None for ISO 8601, 's', 'ms' or 'us' for numbers
+			since the epoch in UTC, a strptime format or a function parsing the
+			field.
+		reducer: A Reducer or the name of one, see interval.stream. Custom
+			Reducers and timestamp functions must be picklable.
+		workers: The number of processes, by default the number of CPUs. With
+			1 the file is read in this process.
+		chunk_size: The number of bytes in each chunk.
+		header: Whether the first line of a CSV file is column names.
+		kwargs: Passed on to interval_type.containing.
+	Returns:
+		A dict of the aggregate of each bucket, ordered by beg.
+	"""
+	if file_format is None:
+		file_format = 'csv' if str(path).endswith('.csv') else 'ndjson'
+	if file_format not in ('csv', 'ndjson'):
+		raise ValueError('file_format must be "csv" or "ndjson"')
+	reducer = get_reducer(reducer)
+	start = 0
+	if file_format == 'csv' and header:
+		with open(path, 'rb') as file:
+			header_line = file.readline()
+		start = len(header_line)
+		names = next(csv.reader([header_line.decode()]), [])
+		if isinstance(timestamp, str):
+			timestamp = names.index(timestamp)
+		if isinstance(value, str):
+			value = names.index(value)
+	aggregate_chunk = partial(
+		_aggregate_chunk,
+		path=path,
+		interval_type=interval_type,
+		file_format=file_format,
+		timestamp=timestamp,
+		value=value,
+		timestamp_format=timestamp_format,
+		reducer=tuple(reducer),
+		kwargs=kwargs,
+		)
+	byte_ranges = chunks(path, chunk_size, start)
+	workers = workers or os.cpu_count() or 1
+	if workers == 1 or len(byte_ranges) == 1:
+		partials = map(aggregate_chunk, byte_ranges)
+		return _merge(partials, reducer)
+	workers = min(workers, len(byte_ranges))
+	with ProcessPoolExecutor(max_workers=workers) as executor:
+		return _merge(executor.map(aggregate_chunk, byte_ranges), reducer)
+
+
+def _merge(partials, reducer) -> dict:
+	"""Combine dicts of partial aggregates by bucket."""
+	combine = reducer.combine
+	totals = {}
+	for chunk_totals in partials:
+		for bucket, aggregate in chunk_totals.items():
+			if bucket in totals:
+				totals[bucket] = combine(totals[bucket], aggregate)
+			else:
+				totals[bucket] = aggregate
+	return dict(sorted(totals.items(), key=_beg_of_item))
+
+
+def _beg_of_item(item):
+	return item[0].beg
@@ -0,0 +1,213 @@
+"""Count and time the hot paths of the Interval classes.
+
+Instrumentation is off by default and then costs nothing: `enable` replaces
+the methods below on every Interval class with wrappers that count and time
+their calls, and `disable` puts the originals back.
+
+===========  ===========================================================
+operation    what is counted
+===========  ===========================================================
+containing   `containing` calls
+divide       `divide` calls
+iter         Intervals generated by `iter`, timing each step
+next, prev   `next` and `prev` calls, including those made by `iter`
+shift        `_shift` calls, which `divide` and adding ints use
+init         instances created with their constructor
+bounds       computing the datetimes of a Year, Quarter or Month
+end          reading `end`, which is computed for most types
+===========  ===========================================================
+
+Calls are counted by the name of the class they were made on and times are
+inclusive, eg. the time of `divide` includes the time of the instances it
+creates. Counting isn't thread safe so counts can be lost if several threads
+use Intervals at once.
+
+	>>> from interval import Month, Year, instrument
+	>>> with instrument.collect() as stats:
+	...     months = Month.divide(Year(2017))
+	>>> sorted(stats['Month'])
+	['bounds', 'containing', 'divide', 'init', 'shift']
+	>>> stats['Month']['shift']['count']
+	12
+"""
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter_ns
+
+from .core import Interval, _IterableInterval
+
+# Method names and the operation they're counted as
+OPERATIONS = {
+	'containing': 'containing',
+	'divide': 'divide',
+	'iter': 'iter',
+	'next': 'next',
+	'prev': 'prev',
+	'_shift': 'shift',
+	'__init__': 'init',
+	'_set_bounds': 'bounds',
+	'end': 'end',
+	}
+
+_enabled = False
+# The count and total nanoseconds by (class name, operation)
+_stats = defaultdict(lambda: [0, 0])
+
+
+def _record(key, elapsed: int):
+	record = _stats[key]
+	record[0] += 1
+	record[1] += elapsed
+
+
+def _wrap(function, name: str):
+	"""Return a function counting and timing calls to function."""
+	operation = OPERATIONS[name]
+	if name == 'iter':
+		@wraps(function)
+		def wrapper(self, *args, **kwargs):
+			key = (type(self).__name__, operation)
+			iterator = function(self, *args, **kwargs)
+			while True:
+				began = perf_counter_ns()
+				try:
+					interval = next(iterator)
+				except StopIteration:
+					return
+				_record(key, perf_counter_ns() - began)
+				yield interval
+	elif name == '__init__':
+		@wraps(function)
+		def wrapper(self, *args, **kwargs):
+			began = perf_counter_ns()
+			function(self, *args, **kwargs)
+			# Don't count super().__init__ calls as creating another instance
+			if type(self).__init__ is wrapper:
+				_record((type(self).__name__, operation), perf_counter_ns() - began)
+	else:
+		@wraps(function)
+		def wrapper(self_or_cls, *args, **kwargs):
+			began = perf_counter_ns()
+			result = function(self_or_cls, *args, **kwargs)
+			cls = self_or_cls if isinstance(self_or_cls, type) else type(self_or_cls)
+			_record((cls.__name__, operation), perf_counter_ns() - began)
+			return result
+	return wrapper
+
+
+def _function_of(attribute):
+	"""Return the function implementing a method, classmethod or property."""
+	if isinstance(attribute, classmethod):
+		return attribute.__func__
+	if isinstance(attribute, property):
+		return attribute.fget
+	return attribute
+
+
+def _classes():
+	"""Return all the Interval and _IterableInterval classes defined so far."""
+	classes = set()
+	pending = [Interval, _IterableInterval]
+	while pending:
+		cls = pending.pop()
+		if cls not in classes:
+			classes.add(cls)
+			pending.extend(cls.__subclasses__())
+	return classes
+
+
+def is_enabled() -> bool:
+	"""Return whether the Interval classes are instrumented."""
+	return _enabled
+
+
+def enable():
+	"""Start counting and timing the operations of all Interval classes.
+
+	Classes defined while enabled aren't instrumented until enable is called
+	again, except types created by `FixedInterval.create`.
+	"""
+	global _enabled
+	for cls in _classes():
+		for name in OPERATIONS:
+			attribute = cls.__dict__.get(name)
+			function = _function_of(attribute)
+			if not callable(function) or hasattr(function, '_instrumented'):
+				continue
+			if getattr(function, '__isabstractmethod__', False):
+				continue
+			wrapper = _wrap(function, name)
+			wrapper._instrumented = attribute
+			if isinstance(attribute, classmethod):
+				wrapper = classmethod(wrapper)
+			elif isinstance(attribute, property):
+				wrapper = property(
+					wrapper,
+					attribute.fset,
+					attribute.fdel,
+					attribute.__doc__,
+					)
+			setattr(cls, name, wrapper)
+	_enabled = True
+
+
+def disable():
+	"""Stop counting and restore the original methods. The stats are kept."""
+	global _enabled
+	for cls in _classes():
+		for name in OPERATIONS:
+			function = _function_of(cls.__dict__.get(name))
+			if hasattr(function, '_instrumented'):
+				setattr(cls, name, function._instrumented)
+	_enabled = False
+
+
+def reset():
+	"""Clear the stats collected so far."""
+	_stats.clear()
+
+
+def snapshot() -> dict:
+	"""Return the stats collected so far.
+
+	Returns:
+		A dict by class name of dicts by operation of dicts with the 'count'
+		and the total time in 'seconds'.
+	"""
+	stats = {}
+	for (class_name, operation), (count, elapsed) in sorted(_stats.items()):
+		stats.setdefault(class_name, {})[operation] = {
+			'count': count,
+			'seconds': elapsed / 1e9,
+			}
+	return stats
+
+
+@contextmanager
+def collect():
+	"""Collect stats for the duration of a with block.
+
+	Yields an empty dict that is filled with the `snapshot` of the block when
+	it exits. Stats collected in the block are also added to the global stats
+	if instrumentation was already enabled.
+	"""
+	global _stats
+	was_enabled = _enabled
+	outer = _stats
+	_stats = defaultdict(lambda: [0, 0])
+	stats = {}
+	if not was_enabled:
+		enable()
+	try:
+		yield stats
+	finally:
+		if not was_enabled:
+			disable()
+		stats.update(snapshot())
+		if was_enabled:
+			for key, (count, elapsed) in _stats.items():
+				record = outer[key]
+				record[0] += count
+				record[1] += elapsed
+		_stats = outer
@@ -0,0 +1,130 @@
+"""Join two collections of Intervals on overlap."""
+from collections import namedtuple
+from datetime import timedelta
+import heapq
+from itertools import count
+
+from .core import Interval
+
+Overlap = namedtuple('Overlap', ('left', 'right', 'interval', 'duration'))
+Overlap.__doc__ = """A pair of overlapping Intervals from a join.
+
+Args:
+	left: The Interval from the left collection.
+	right: The Interval from the right collection, None if a left join found
+		no match.
+	interval: The intersection of left and right, None if there is no right.
+	duration: The length of interval.
+"""
+
+_LEFT = 0
+_RIGHT = 1
+_ZERO = timedelta(0)
+
+
+def _beg(interval):
+	return interval.beg
+
+
+def overlap_join(left, right, how: str = 'inner', presorted: bool = False):
+	"""Generate an Overlap for every pair of overlapping Intervals.
+
+	Both collections are swept in order of beg, keeping the Intervals that
+	haven't ended yet in a heap ordered by end. Each Interval is compared only
+	with the active Intervals from the other side, which it all overlaps, so
+	a join takes O((n + m) log(n + m) + k) for k pairs.
+
+	Empty Intervals don't overlap anything.
+
+	Args:
+		left: An iterable of Intervals.
+		right: An iterable of Intervals.
+		how: 'inner' for only overlapping pairs or 'left' to also generate an
+			Overlap with right None for each left Interval with no match.
+		presorted: If the iterables are already sorted by beg they are consumed
+			lazily instead of being sorted first, so they can be streams.
+	Raises:
+		ValueError: If presorted and an iterable isn't sorted by beg.
+	"""
+	if how not in ('inner', 'left'):
+		raise ValueError('how must be "inner" or "left"')
+	if not presorted:
+		left = sorted(left, key=_beg)
+		right = sorted(right, key=_beg)
+	keep_unmatched = how == 'left'
+	iterators = (iter(left), iter(right))
+	heads = [next(iterators[_LEFT], None), next(iterators[_RIGHT], None)]
+	# Entries are [end, sequence, interval, matched]
+	active = ([], [])
+	sequence = count()
+	while True:
+		if heads[_LEFT] is None and (heads[_RIGHT] is None or not active[_LEFT]):
+			break
+		side = _next_side(heads)
+		interval = _advance(heads, iterators, side)
+		yield from _retire(active, interval.beg, keep_unmatched)
+		if not interval.beg < interval.end:
+			if side == _LEFT and keep_unmatched:
+				yield Overlap(interval, None, None, _ZERO)
+			continue
+		entry = [interval.end, next(sequence), interval, False]
+		yield from _overlaps(entry, side, active[1 - side])
+		heapq.heappush(active[side], entry)
+	if keep_unmatched:
+		for entry in sorted(active[_LEFT]):
+			if not entry[3]:
+				yield Overlap(entry[2], None, None, _ZERO)
+
+
+def _next_side(heads) -> int:
+	"""Return the side whose next Interval begins first, left on ties."""
+	left, right = heads
+	if right is None or left is not None and left.beg <= right.beg:
+		return _LEFT
+	return _RIGHT
+
+
+def _advance(heads, iterators, side: int):
+	"""Return the head of side and replace it with the next Interval.
+
+	Raises:
+		ValueError: If the next Interval begins before the head.
+	"""
+	interval = heads[side]
+	following = next(iterators[side], None)
+	if following is not None and following.beg < interval.beg:
+		raise ValueError('Intervals must be sorted by beg when presorted')
+	heads[side] = following
+	return interval
+
+
+def _retire(active, beg, keep_unmatched: bool):
+	"""Remove the active Intervals that end by beg.
+
+	Generates an Overlap without a right for each unmatched left Interval
+	removed if keep_unmatched.
+	"""
+	for side, retiring in enumerate(active):
+		while retiring and retiring[0][0] <= beg:
+			entry = heapq.heappop(retiring)
+			if side == _LEFT and keep_unmatched and not entry[3]:
+				yield Overlap(entry[2], None, None, _ZERO)
+
+
+def _overlaps(entry, side: int, others):
+	"""Generate the Overlaps of a new entry with the active others.
+
+	Every active Interval from the other side began no later than the new one
+	and ends after it begins, so they all overlap. Marks them all matched.
+	"""
+	interval = entry[2]
+	beg, end = interval.beg, entry[0]
+	for other in others:
+		other[3] = True
+		entry[3] = True
+		overlap_end = min(end, other[0])
+		intersection = Interval(beg, overlap_end)
+		if side == _LEFT:
+			yield Overlap(interval, other[2], intersection, overlap_end - beg)
+		else:
+			yield Overlap(other[2], interval, intersection, overlap_end - beg)
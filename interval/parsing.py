@@ -0,0 +1,106 @@
+"""Parse and format many interval strings at once.
+
+The forms are those of the `from_string` and `to_string` methods:
+
+===================================  ========
+string                               type
+===================================  ========
+2017                                 Year
+2017-Q1                              Quarter
+2017-02                              Month
+2017-W06, 2017-W05-7                 Week
+2017-02-08                           Day
+2017-02-08T13:00:00/PT1H             Interval
+2017-02-08T13:00:00/2017-02-08T14:00 Interval
+===================================  ========
+
+The type is told from the length of the string and the characters at a few
+positions, without regular expressions. Pass interval_type to parse strings
+of one type, eg. Hour for 'start/duration' strings of hours.
+
+Each type's parser is wrapped in an LRU cache so repeated strings return the
+same instance without being parsed again, and `parse_many` parses each
+distinct string in a batch once.
+"""
+from functools import lru_cache
+
+from .core import Interval, Year, Quarter, Month, Week, Day
+
+CACHE_SIZE = 4096
+
+_parsers = {}
+
+
+def interval_type_of(string: str):
+	"""Return the type that string is the form of, see the module docstring.
+
+	Raises:
+		ValueError: If string isn't one of the forms.
+	"""
+	length = len(string)
+	if '/' in string:
+		return Interval
+	if length == 4:
+		return Year
+	if length == 7 and string[4] == '-':
+		return Quarter if string[5] == 'Q' else Month
+	if length in (8, 10) and string[4:6] == '-W':
+		return Week
+	if length == 10:
+		return Day
+	raise ValueError('Unrecognized interval {!r}'.format(string))
+
+
+def _parser(interval_type):
+	"""Return interval_type.from_string wrapped in a cache."""
+	parser = _parsers.get(interval_type)
+	if parser is None:
+		cache = lru_cache(maxsize=CACHE_SIZE)
+		parser = _parsers[interval_type] = cache(interval_type.from_string)
+	return parser
+
+
+def parse(string: str, interval_type=None, tzinfo=None):
+	"""Return the Interval that string is the form of.
+
+	Args:
+		string: The interval, eg. '2017-Q1'.
+		interval_type: The type of the Interval, by default told from string.
+		tzinfo: Passed on to from_string.
+	Raises:
+		ValueError: If string isn't an interval, or of interval_type.
+	"""
+	if interval_type is None:
+		interval_type = interval_type_of(string)
+	return _parser(interval_type)(string, tzinfo)
+
+
+def parse_many(strings, interval_type=None, tzinfo=None) -> list:
+	"""Return a list of the Intervals that each of strings is the form of.
+
+	Each distinct string is parsed once.
+
+	Args:
+		strings: An iterable of strings, eg. a list or a 1-d numpy array.
+		interval_type: See `parse`.
+		tzinfo: See `parse`.
+	"""
+	if hasattr(strings, 'tolist'):
+		strings = strings.tolist()
+	elif not isinstance(strings, (list, tuple)):
+		strings = list(strings)
+	intervals = dict.fromkeys(strings)
+	for string in intervals:
+		intervals[string] = parse(string, interval_type, tzinfo)
+	return list(map(intervals.__getitem__, strings))
+
+
+def format_many(intervals) -> list:
+	"""Return a list of the `to_string` of each of intervals."""
+	return [interval.to_string() for interval in intervals]
+
+
+def cache_clear():
+	"""Empty the caches of parsed strings."""
+	for parser in _parsers.values():
+		parser.cache_clear()
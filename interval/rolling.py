@@ -0,0 +1,207 @@
+"""Aggregate streams of timestamped values over rolling windows of Intervals.
+
+A window is the latest `periods` Intervals of a type, eg. the last 7 Days or
+the trailing 3 Months, and moves forward one Interval at a time.
+"""
+from collections import deque
+
+from .core import Interval
+
+
+class RollingWindow():
+	"""The sum, count, mean, min and max of the values in a rolling window.
+
+	Values are pushed in order of their datetimes and the window moves
+	forward with `next` to the Interval containing each one. The sum and count
+	of each Interval in the window are kept so they can be subtracted when it
+	leaves the window, which makes every push O(1) amortized. The min and max
+	are kept in monotonic deques holding at most one value per Interval, so
+	memory is bounded by periods no matter how many values are pushed.
+
+	Values older than the current Interval are dropped and counted in
+	`dropped`.
+
+	Args:
+		interval_type: The _IterableInterval type of the periods, eg. Day.
+		periods: The number of Intervals in the window.
+		kwargs: Passed on to interval_type.containing.
+	"""
+
+	__slots__ = (
+		'interval_type',
+		'periods',
+		'dropped',
+		'_kwargs',
+		'_current',
+		'_index',
+		'_totals',
+		'_count',
+		'_sum',
+		'_mins',
+		'_maxes',
+		)
+
+	def __init__(self, interval_type, periods: int, **kwargs) -> None:
+		if periods < 1:
+			raise ValueError('periods must be at least 1')
+		self.interval_type = interval_type
+		self.periods = periods
+		self.dropped = 0
+		self._kwargs = kwargs
+		self._current = None
+		# The index of the current Interval counting from the first
+		self._index = 0
+		# [count, sum] of each Interval in the window, oldest first
+		self._totals = deque()
+		self._count = 0
+		self._sum = 0
+		# (index, value) with values increasing for _mins, decreasing for _maxes
+		self._mins = deque()
+		self._maxes = deque()
+
+	def __repr__(self):
+		return '{cls}({interval_type.__name__}, {periods})'.format(
+			cls=self.__class__.__name__,
+			interval_type=self.interval_type,
+			periods=self.periods,
+			)
+
+	@property
+	def current(self):
+		"""The latest Interval in the window, None before the first push."""
+		return self._current
+
+	@property
+	def window(self) -> Interval:
+		"""The Interval spanned by the window, None before the first push."""
+		if self._current is None:
+			return None
+		return Interval((self._current - (self.periods - 1)).beg, self._current.end)
+
+	@property
+	def count(self) -> int:
+		return self._count
+
+	@property
+	def sum(self):
+		return self._sum
+
+	@property
+	def mean(self):
+		"""The mean of the values in the window, None if there are none."""
+		if not self._count:
+			return None
+		return self._sum / self._count
+
+	@property
+	def min(self):
+		"""The least value in the window, None if there are none."""
+		return self._mins[0][1] if self._mins else None
+
+	@property
+	def max(self):
+		"""The greatest value in the window, None if there are none."""
+		return self._maxes[0][1] if self._maxes else None
+
+	def stats(self) -> dict:
+		"""Return the count, sum, mean, min and max of the window."""
+		return {
+			'count': self.count,
+			'sum': self.sum,
+			'mean': self.mean,
+			'min': self.min,
+			'max': self.max,
+			}
+
+	def push(self, dt, value):
+		"""Add value at dt, moving the window forward to dt if necessary."""
+		current = self._current
+		if current is None:
+			self._start(dt)
+		elif dt >= current.end:
+			self.advance_to(dt)
+		elif dt < current.beg:
+			self.dropped += 1
+			return
+		index = self._index
+		totals = self._totals[-1]
+		totals[0] += 1
+		totals[1] += value
+		self._count += 1
+		self._sum += value
+		# Values that expire no later than value and aren't less than it can
+		# never be the min again. Only the least value of an Interval is kept.
+		mins = self._mins
+		while mins and mins[-1][1] >= value:
+			mins.pop()
+		if not mins or mins[-1][0] != index:
+			mins.append((index, value))
+		maxes = self._maxes
+		while maxes and maxes[-1][1] <= value:
+			maxes.pop()
+		if not maxes or maxes[-1][0] != index:
+			maxes.append((index, value))
+
+	def _start(self, dt):
+		"""Empty the window and make the Interval containing dt current."""
+		self._current = self.interval_type.containing(dt, **self._kwargs)
+		self._index += self.periods
+		self._totals.clear()
+		self._totals.append([0, 0])
+		self._count = 0
+		self._sum = 0
+		self._mins.clear()
+		self._maxes.clear()
+
+	def advance(self):
+		"""Move the window forward one Interval."""
+		if self._current is None:
+			raise ValueError('The window has no Intervals before the first push')
+		self._current = self._current.next()
+		self._index += 1
+		totals = self._totals
+		totals.append([0, 0])
+		if len(totals) > self.periods:
+			count, total = totals.popleft()
+			self._count -= count
+			# Start again from exactly 0 rather than accumulating float error
+			self._sum = self._sum - total if self._count else 0
+		oldest = self._index - self.periods
+		for extremes in (self._mins, self._maxes):
+			while extremes and extremes[0][0] <= oldest:
+				extremes.popleft()
+
+	def advance_to(self, dt):
+		"""Move the window forward until the current Interval contains dt.
+
+		After periods steps every value has left the window, so the rest of
+		the way is one jump instead of a step per Interval.
+		"""
+		if self._current is None:
+			self._start(dt)
+			return
+		for _ in range(self.periods):
+			if dt < self._current.end:
+				return
+			self.advance()
+		if dt >= self._current.end:
+			self._start(dt)
+
+
+def rolling(pairs, interval_type, periods: int, **kwargs):
+	"""Generate (interval, stats) for an iterable of (datetime, value).
+
+	One pair is generated for every Interval from the first value's to the
+	last value's, including Intervals without values, with the
+	`RollingWindow.stats` of the window ending with that Interval.
+	"""
+	window = RollingWindow(interval_type, periods, **kwargs)
+	for dt, value in pairs:
+		current = window.current
+		while current is not None and dt >= current.end:
+			yield current, window.stats()
+			window.advance()
+			current = window.current
+		window.push(dt, value)
+	if window.current is not None:
+		yield window.current, window.stats()
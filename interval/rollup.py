@@ -0,0 +1,130 @@
+"""Aggregates kept at several calendar levels at once."""
+from .core import Day, Month, Quarter, Year
+from .stream import get_reducer
+
+
+class Rollup():
+	"""Aggregates of values at every level of a hierarchy of ProperIntervals.
+
+	Each value added is aggregated into the bucket containing it at every level,
+	so all the levels are always up to date. The aggregate for an arbitrary
+	range is then computed from the fewest buckets that cover it, whole Years
+	first, then whole Quarters at either end and so on down to Days. A range of
+	several years takes a few dozen lookups instead of thousands.
+
+	Buckets are stored by ordinal so all of the values should be in the same
+	timezone.
+
+	Args:
+		levels: ProperInterval types from finest to coarsest. Every bucket of a
+			level must be made up of whole buckets of the level before it.
+		reducer: A Reducer or the name of one, see interval.stream.
+	"""
+
+	__slots__ = ('levels', 'reducer', '_totals')
+
+	def __init__(self, levels=(Day, Month, Quarter, Year), reducer='sum') -> None:
+		if not levels:
+			raise ValueError('levels must not be empty')
+		self.levels = tuple(levels)
+		self.reducer = get_reducer(reducer)
+		self._totals = [{} for _ in self.levels]
+
+	def __repr__(self):
+		return '{cls}(levels={levels!r})'.format(
+			cls=self.__class__.__name__,
+			levels=self.levels,
+			)
+
+	def add(self, dt, value):
+		"""Aggregate value into the buckets containing dt at every level."""
+		initial, step = self.reducer.initial, self.reducer.step
+		for level, totals in zip(self.levels, self._totals):
+			key = level.containing(dt).ordinal
+			try:
+				aggregate = totals[key]
+			except KeyError:
+				aggregate = initial()
+			totals[key] = step(aggregate, value)
+
+	def update(self, pairs):
+		"""Add each (datetime, value) in pairs."""
+		for dt, value in pairs:
+			self.add(dt, value)
+
+	def __getitem__(self, interval):
+		"""Return the aggregate for a bucket of one of the levels."""
+		try:
+			index = self.levels.index(type(interval))
+		except ValueError:
+			raise KeyError(interval)
+		try:
+			return self._totals[index][interval.ordinal]
+		except KeyError:
+			return self.reducer.initial()
+
+	def cover(self, interval) -> list:
+		"""Return the fewest buckets that make up interval.
+
+		Raises:
+			ValueError: If interval doesn't begin and end on boundaries of the
+				finest level.
+		"""
+		tzinfo = interval.beg.tzinfo
+		coarsest = len(self.levels) - 1
+		spans = self._cover(interval.beg, interval.end, coarsest)
+		return [
+			self.levels[index].from_ordinal(ordinal, tzinfo)
+			for index, start, stop in spans
+			for ordinal in range(start, stop)
+			]
+
+	def total(self, interval):
+		"""Return the aggregate of the values in interval.
+
+		Raises:
+			ValueError: If interval doesn't begin and end on boundaries of the
+				finest level.
+		"""
+		combine = self.reducer.combine
+		result = self.reducer.initial()
+		coarsest = len(self.levels) - 1
+		spans = self._cover(interval.beg, interval.end, coarsest)
+		for index, start, stop in spans:
+			totals = self._totals[index]
+			for ordinal in range(start, stop):
+				try:
+					result = combine(result, totals[ordinal])
+				except KeyError:
+					pass
+		return result
+
+	def _cover(self, beg, end, index: int):
+		"""Generate (level index, start ordinal, stop ordinal) covering beg to end.
+
+		Whole buckets of levels[index] are used for the middle of the range and
+		the ends are covered recursively by the finer levels.
+		"""
+		if not beg < end:
+			return
+		level = self.levels[index]
+		first = level.containing(beg)
+		start = first.ordinal
+		if first.beg < beg:
+			start += 1
+		last = level.containing(end)
+		stop = last.ordinal
+		if index == 0:
+			if first.beg != beg or last.beg != end:
+				raise ValueError('interval must begin and end on {} boundaries'.format(
+					level.__name__,
+					))
+			yield index, start, stop
+			return
+		if start >= stop:
+			yield from self._cover(beg, end, index - 1)
+			return
+		yield index, start, stop
+		middle = level.from_ordinal(start, beg.tzinfo)
+		yield from self._cover(beg, middle.beg, index - 1)
+		yield from self._cover(last.beg, end, index - 1)
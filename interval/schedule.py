@@ -0,0 +1,267 @@
+"""Run jobs at the boundaries of Intervals with asyncio."""
+import asyncio
+from datetime import datetime
+import heapq
+import inspect
+from itertools import count
+from math import sqrt
+
+from .core import IntervalRange
+
+POLICIES = ('coalesce', 'catch_up')
+
+
+class Job():
+	"""A callback run each time an Interval of interval_type ends.
+
+	Jobs are created by `Scheduler.add`. The lateness of a run is how long
+	after the end of its Interval the callback was called. It's kept in
+	seconds as a count, sum and sum of squares so the mean and the jitter
+	(standard deviation) are available without storing every run.
+	"""
+
+	__slots__ = (
+		'interval_type',
+		'callback',
+		'policy',
+		'kwargs',
+		'interval',
+		'cancelled',
+		'runs',
+		'skipped',
+		'errors',
+		'last_error',
+		'max_lateness',
+		'_lateness_sum',
+		'_lateness_squares',
+		)
+
+	def __init__(
+			self,
+			interval_type,
+			callback,
+			policy: str,
+			interval,
+			kwargs: dict,
+			) -> None:
+		self.interval_type = interval_type
+		self.callback = callback
+		self.policy = policy
+		self.kwargs = kwargs
+		self.interval = interval
+		self.cancelled = False
+		self.runs = 0
+		self.skipped = 0
+		self.errors = 0
+		self.last_error = None
+		self.max_lateness = 0.0
+		self._lateness_sum = 0.0
+		self._lateness_squares = 0.0
+
+	def __repr__(self):
+		template = '{cls}({interval_type.__name__}, {callback!r}, policy={policy!r})'
+		return template.format(
+			cls=self.__class__.__name__,
+			interval_type=self.interval_type,
+			callback=self.callback,
+			policy=self.policy,
+			)
+
+	def _record(self, lateness: float):
+		self.runs += 1
+		self.max_lateness = max(self.max_lateness, lateness)
+		self._lateness_sum += lateness
+		self._lateness_squares += lateness * lateness
+
+	@property
+	def mean_lateness(self) -> float:
+		"""The mean lateness of the runs in seconds, 0.0 if there are none."""
+		if not self.runs:
+			return 0.0
+		return self._lateness_sum / self.runs
+
+	@property
+	def jitter(self) -> float:
+		"""The standard deviation of the lateness of the runs in seconds."""
+		if not self.runs:
+			return 0.0
+		mean = self.mean_lateness
+		return sqrt(max(0.0, self._lateness_squares / self.runs - mean * mean))
+
+	def stats(self) -> dict:
+		"""Return the counts and lateness of this job's runs."""
+		return {
+			'runs': self.runs,
+			'skipped': self.skipped,
+			'errors': self.errors,
+			'mean_lateness': self.mean_lateness,
+			'max_lateness': self.max_lateness,
+			'jitter': self.jitter,
+			}
+
+
+class Scheduler():
+	"""Run jobs when Intervals end, from one heap of deadlines.
+
+	Each job waits for the end of the Interval of its type containing the time
+	it was added. All the jobs due by the time the scheduler wakes up are
+	started together and each callback is passed the Interval that just ended.
+
+	If the scheduler wakes up after more than one Interval of a job has ended,
+	eg. because the event loop was blocked, the job's policy decides what runs.
+	'coalesce' calls the callback once with the latest ended Interval and
+	counts the others in `skipped`. 'catch_up' calls it for each ended Interval
+	in order.
+
+	Callbacks can be functions or coroutine functions. Exceptions they raise
+	are counted in the job's errors and kept in last_error.
+
+	Args:
+		max_concurrency: The most callbacks running at the same time.
+		clock: A function returning the current datetime, datetime.now by
+			default. Aware clocks schedule aware Intervals.
+		sleep: A coroutine function sleeping for a number of seconds,
+			asyncio.sleep by default.
+	"""
+
+	def __init__(
+			self,
+			max_concurrency: int = 100,
+			clock=None,
+			sleep=None,
+			) -> None:
+		if max_concurrency < 1:
+			raise ValueError('max_concurrency must be at least 1')
+		self.max_concurrency = max_concurrency
+		self._clock = clock or datetime.now
+		self._sleep = sleep or asyncio.sleep
+		self._heap = []
+		self._sequence = count()
+		self._jobs = set()
+		self._tasks = set()
+		self._semaphore = None
+		self._changed = None
+		self._running = False
+
+	def __len__(self):
+		"""Return the number of jobs."""
+		return len(self._jobs)
+
+	@property
+	def jobs(self) -> list:
+		return list(self._jobs)
+
+	def add(
+			self,
+			interval_type,
+			callback,
+			policy: str = 'coalesce',
+			**kwargs
+			) -> Job:
+		"""Add a job calling callback(interval) whenever an Interval ends.
+
+		Args:
+			interval_type: An iterable Interval type, eg. Minute or a type from
+				FixedInterval.create.
+			callback: A function or coroutine function of the Interval that
+				ended.
+			policy: 'coalesce' or 'catch_up', see Scheduler.
+			kwargs: Passed on to interval_type.containing.
+		"""
+		if policy not in POLICIES:
+			raise ValueError('policy must be one of {}'.format(POLICIES))
+		interval = interval_type.containing(self._clock(), **kwargs)
+		job = Job(interval_type, callback, policy, interval, kwargs)
+		self._jobs.add(job)
+		self._push(job)
+		if self._changed is not None:
+			self._changed.set()
+		return job
+
+	def remove(self, job: Job):
+		"""Stop running job."""
+		self._jobs.remove(job)
+		job.cancelled = True
+
+	def _push(self, job: Job):
+		heapq.heappush(self._heap, (job.interval.end, next(self._sequence), job))
+
+	def stop(self):
+		"""Make `run` return after the callbacks already started finish."""
+		self._running = False
+		if self._changed is not None:
+			self._changed.set()
+
+	async def run(self, until: datetime = None):
+		"""Run the jobs until `stop` is called or the clock passes until."""
+		self._semaphore = asyncio.Semaphore(self.max_concurrency)
+		self._changed = asyncio.Event()
+		self._running = True
+		try:
+			while self._running:
+				now = self._clock()
+				if until is not None and now >= until:
+					break
+				while self._heap and self._heap[0][2].cancelled:
+					heapq.heappop(self._heap)
+				if self._heap and self._heap[0][0] <= now:
+					self._fire_due(now)
+					# Let the callbacks start before sleeping again
+					await asyncio.sleep(0)
+					continue
+				wake = self._heap[0][0] if self._heap else until
+				if until is not None and wake is not None:
+					wake = min(wake, until)
+				await self._wait(None if wake is None else (wake - now).total_seconds())
+			if self._tasks:
+				await asyncio.gather(*self._tasks)
+		finally:
+			self._running = False
+			self._changed = None
+
+	async def _wait(self, seconds):
+		"""Wait for seconds, or until a job is added or stop is called."""
+		self._changed.clear()
+		changed = asyncio.ensure_future(self._changed.wait())
+		waiters = {changed}
+		if seconds is not None:
+			waiters.add(asyncio.ensure_future(self._sleep(seconds)))
+		done, pending = await asyncio.wait(
+			waiters,
+			return_when=asyncio.FIRST_COMPLETED,
+			)
+		for waiter in pending:
+			waiter.cancel()
+
+	def _fire_due(self, now: datetime):
+		"""Start the callbacks of all the jobs whose Intervals ended by now."""
+		heap = self._heap
+		while heap and heap[0][0] <= now:
+			job = heapq.heappop(heap)[2]
+			if job.cancelled:
+				continue
+			ended = job.interval
+			current = job.interval_type.containing(now, **job.kwargs)
+			missed = current - ended
+			if job.policy == 'catch_up':
+				intervals = IntervalRange(ended, missed)
+			else:
+				intervals = [current - 1]
+				job.skipped += missed - 1
+			job.interval = current
+			self._push(job)
+			task = asyncio.ensure_future(self._run_job(job, intervals))
+			self._tasks.add(task)
+			task.add_done_callback(self._tasks.discard)
+
+	async def _run_job(self, job: Job, intervals):
+		for interval in intervals:
+			async with self._semaphore:
+				job._record((self._clock() - interval.end).total_seconds())
+				try:
+					result = job.callback(interval)
+					if inspect.isawaitable(result):
+						await result
+				except Exception as error:
+					job.errors += 1
+					job.last_error = error
@@ -0,0 +1,222 @@
+"""Sets of points in time stored as sorted, disjoint Intervals."""
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+
+from .core import Interval
+
+
+class IntervalSet():
+	"""A set of points in time made up of sorted, disjoint Intervals.
+
+	Intervals that overlap or are adjacent are joined and empty Intervals are
+	dropped, so an IntervalSet is always normalized. Membership tests take
+	O(log n) and the set operations take O(n + m).
+
+	Args:
+		intervals: An iterable of Intervals to initialize the set with.
+	"""
+
+	__slots__ = ('_begs', '_ends')
+
+	def __init__(self, intervals=()) -> None:
+		self._begs = []
+		self._ends = []
+		self.update(intervals)
+
+	@classmethod
+	def _from_sorted(cls, begs: list, ends: list):
+		"""Create an IntervalSet from begs and ends that are already normalized."""
+		interval_set = cls.__new__(cls)
+		interval_set._begs = begs
+		interval_set._ends = ends
+		return interval_set
+
+	def __repr__(self):
+		return '{cls}({intervals!r})'.format(
+			cls=self.__class__.__name__,
+			intervals=list(self),
+			)
+
+	def __iter__(self):
+		return map(Interval, self._begs, self._ends)
+
+	def __len__(self):
+		"""Return the number of disjoint Intervals in this set."""
+		return len(self._begs)
+
+	def __bool__(self):
+		return bool(self._begs)
+
+	def __eq__(self, other):
+		if not isinstance(other, IntervalSet):
+			return NotImplemented
+		return self._begs == other._begs and self._ends == other._ends
+
+	__hash__ = None
+
+	def __contains__(self, item):
+		"""Return whether a datetime or all of an Interval is in this set."""
+		if isinstance(item, Interval):
+			if not item:
+				return True
+			index = bisect_right(self._begs, item.beg) - 1
+			return index >= 0 and item.end <= self._ends[index]
+		index = bisect_right(self._begs, item) - 1
+		return index >= 0 and item < self._ends[index]
+
+	def overlaps(self, interval: Interval) -> bool:
+		"""Return whether any of interval is in this set."""
+		index = bisect_right(self._ends, interval.beg)
+		return index < len(self._begs) and self._begs[index] < interval.end
+
+	@property
+	def duration(self) -> timedelta:
+		"""The total length of the Intervals in this set."""
+		return sum(map(datetime.__sub__, self._ends, self._begs), timedelta(0))
+
+	@property
+	def span(self) -> Interval:
+		"""The smallest Interval containing all of this set, None if empty."""
+		if not self._begs:
+			return None
+		return Interval(self._begs[0], self._ends[-1])
+
+	def copy(self):
+		return self._from_sorted(list(self._begs), list(self._ends))
+
+	def add(self, interval: Interval):
+		"""Add interval to this set in O(log n) plus the cost of the list update."""
+		if not interval:
+			return
+		beg, end = interval.beg, interval.end
+		lo = bisect_left(self._ends, beg)
+		hi = bisect_right(self._begs, end)
+		if lo < hi:
+			beg = min(beg, self._begs[lo])
+			end = max(end, self._ends[hi - 1])
+		self._begs[lo:hi] = [beg]
+		self._ends[lo:hi] = [end]
+
+	def discard(self, interval: Interval):
+		"""Remove all of interval from this set."""
+		if not interval:
+			return
+		beg, end = interval.beg, interval.end
+		lo = bisect_right(self._ends, beg)
+		hi = bisect_left(self._begs, end)
+		if lo >= hi:
+			return
+		new_begs = []
+		new_ends = []
+		if self._begs[lo] < beg:
+			new_begs.append(self._begs[lo])
+			new_ends.append(beg)
+		if end < self._ends[hi - 1]:
+			new_begs.append(end)
+			new_ends.append(self._ends[hi - 1])
+		self._begs[lo:hi] = new_begs
+		self._ends[lo:hi] = new_ends
+
+	def update(self, *iterables):
+		"""Add all the Intervals in iterables, sorting only once."""
+		pairs = list(zip(self._begs, self._ends))
+		for intervals in iterables:
+			pairs.extend((i.beg, i.end) for i in intervals if i)
+		# Timsort takes advantage of the pairs already in order
+		pairs.sort()
+		begs = []
+		ends = []
+		for beg, end in pairs:
+			if ends and beg <= ends[-1]:
+				if end > ends[-1]:
+					ends[-1] = end
+			else:
+				begs.append(beg)
+				ends.append(end)
+		self._begs = begs
+		self._ends = ends
+
+	def union(self, *others):
+		"""Return the union of this set and others."""
+		result = self.copy()
+		result.update(*others)
+		return result
+
+	def __or__(self, other):
+		if not isinstance(other, IntervalSet):
+			return NotImplemented
+		return self.union(other)
+
+	def __ior__(self, other):
+		if not isinstance(other, IntervalSet):
+			return NotImplemented
+		self.update(other)
+		return self
+
+	def intersection(self, other):
+		"""Return the points in both this set and other."""
+		begs = []
+		ends = []
+		i = j = 0
+		while i < len(self._begs) and j < len(other._begs):
+			beg = max(self._begs[i], other._begs[j])
+			end = min(self._ends[i], other._ends[j])
+			if beg < end:
+				begs.append(beg)
+				ends.append(end)
+			if self._ends[i] < other._ends[j]:
+				i += 1
+			else:
+				j += 1
+		return self._from_sorted(begs, ends)
+
+	def __and__(self, other):
+		if not isinstance(other, IntervalSet):
+			return NotImplemented
+		return self.intersection(other)
+
+	def difference(self, other):
+		"""Return the points in this set that aren't in other."""
+		begs = []
+		ends = []
+		other_begs, other_ends = other._begs, other._ends
+		j = 0
+		for beg, end in zip(self._begs, self._ends):
+			# Skip the Intervals of other entirely before this one
+			while j < len(other_begs) and other_ends[j] <= beg:
+				j += 1
+			k = j
+			while k < len(other_begs) and other_begs[k] < end:
+				if beg < other_begs[k]:
+					begs.append(beg)
+					ends.append(other_begs[k])
+				beg = max(beg, other_ends[k])
+				k += 1
+			if beg < end:
+				begs.append(beg)
+				ends.append(end)
+		return self._from_sorted(begs, ends)
+
+	def __sub__(self, other):
+		if not isinstance(other, IntervalSet):
+			return NotImplemented
+		return self.difference(other)
+
+	def clip(self, within: Interval):
+		"""Return the part of this set within an Interval in O(log n + k)."""
+		lo = bisect_right(self._ends, within.beg)
+		hi = bisect_left(self._begs, within.end)
+		begs = self._begs[lo:hi]
+		ends = self._ends[lo:hi]
+		if begs:
+			begs[0] = max(begs[0], within.beg)
+			ends[-1] = min(ends[-1], within.end)
+		return self._from_sorted(begs, ends)
+
+	def complement(self, within: Interval):
+		"""Return the points in within that aren't in this set."""
+		clipped = self.clip(within)
+		begs = [within.beg] + clipped._ends
+		ends = clipped._begs + [within.end]
+		pairs = [(beg, end) for beg, end in zip(begs, ends) if beg < end]
+		return self._from_sorted([p[0] for p in pairs], [p[1] for p in pairs])
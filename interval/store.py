@@ -0,0 +1,253 @@
+"""A memory-mapped file of Intervals sorted by beg.
+
+The file is a 16 byte header followed by one record per Interval. All numbers
+are little-endian, on big-endian platforms the records are read into memory
+and byte swapped rather than used from the mapping.
+
+Header:
+	magic: 4 bytes, b'INTV'
+	version: uint16, 1
+	flags: uint16, bit 0 is set if the Intervals are aware
+	max_len: int64, the longest Interval in microseconds
+
+Record:
+	beg: int64 microseconds since 1970-01-01, in UTC if aware
+	end: int64 microseconds since 1970-01-01, in UTC if aware
+
+Records are sorted by beg so queries can binary search on it. Because no
+Interval is longer than max_len, only the records beginning less than max_len
+before a query have to be scanned.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import timezone
+import mmap
+import os
+import struct
+import sys
+
+from .core import Interval, _datetime_to_us, _us_to_datetime
+
+MAGIC = b'INTV'
+VERSION = 1
+FLAG_AWARE = 1
+
+_HEADER = struct.Struct('<4sHHq')
+_RECORD = struct.Struct('<qq')
+
+
+def _encode(intervals, aware: bool):
+	"""Return sorted intervals as (beg, end) pairs of microseconds."""
+	records = []
+	for interval in intervals:
+		if (interval.beg.tzinfo is not None) != aware:
+			raise ValueError('Intervals must be all naive or all aware')
+		records.append((
+			_datetime_to_us(interval.beg),
+			_datetime_to_us(interval.end),
+			))
+	records.sort()
+	return records
+
+
+def _max_len(records) -> int:
+	return max((end - beg for beg, end in records), default=0)
+
+
+class IntervalStore():
+	"""Read Intervals from a memory-mapped file.
+
+	Only the header is read when opening a store. Records are read by the
+	operating system as queries touch them and Intervals are only created for
+	the rows returned.
+
+	Use `create` to write a new file.
+
+	Args:
+		path: The path of the file.
+		tzinfo: The tzinfo to return aware Intervals in, UTC by default.
+	Raises:
+		ValueError: If the file isn't an interval store.
+	"""
+
+	__slots__ = (
+		'path',
+		'_tzinfo',
+		'_aware',
+		'_max_len',
+		'_file',
+		'_mmap',
+		'_records',
+		'_begs',
+		)
+
+	def __init__(self, path, tzinfo=None) -> None:
+		self.path = path
+		self._tzinfo = tzinfo
+		self._file = None
+		self._mmap = None
+		self._records = None
+		self._begs = None
+		self._map()
+
+	@classmethod
+	def create(cls, path, intervals=(), aware: bool = None, tzinfo=None):
+		"""Write intervals to a new file at path and return the store for it.
+
+		Args:
+			path: The path of the file, which is overwritten if it exists.
+			intervals: An iterable of Intervals in any order.
+			aware: Whether the Intervals are aware, by default the same as the
+				first Interval.
+			tzinfo: See IntervalStore.
+		"""
+		intervals = list(intervals)
+		if aware is None:
+			aware = bool(intervals) and intervals[0].beg.tzinfo is not None
+		records = _encode(intervals, aware)
+		with open(path, 'wb') as file:
+			file.write(_HEADER.pack(
+				MAGIC,
+				VERSION,
+				FLAG_AWARE if aware else 0,
+				_max_len(records),
+				))
+			for record in records:
+				file.write(_RECORD.pack(*record))
+		return cls(path, tzinfo)
+
+	def _map(self):
+		"""Map the file and read its header."""
+		with open(self.path, 'rb') as file:
+			header = file.read(_HEADER.size)
+		if len(header) < _HEADER.size or header[:4] != MAGIC:
+			raise ValueError('{} is not an interval store'.format(self.path))
+		magic, version, flags, self._max_len = _HEADER.unpack(header)
+		if version != VERSION:
+			raise ValueError('Unsupported interval store version {}'.format(version))
+		self._file = open(self.path, 'rb')
+		self._aware = bool(flags & FLAG_AWARE)
+		self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+		size = len(self._mmap) - _HEADER.size
+		size -= size % _RECORD.size
+		data = memoryview(self._mmap)[_HEADER.size:_HEADER.size + size]
+		if sys.byteorder == 'little':
+			self._records = data.cast('q')
+		else:
+			records = array('q')
+			records.frombytes(data)
+			records.byteswap()
+			data.release()
+			self._records = memoryview(records)
+		self._begs = self._records[::2]
+
+	def close(self):
+		"""Unmap and close the file."""
+		if self._mmap is None:
+			return
+		self._begs.release()
+		self._records.release()
+		self._mmap.close()
+		self._file.close()
+		self._begs = self._records = self._mmap = self._file = None
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+	def __repr__(self):
+		return '{cls}({path!r})'.format(cls=self.__class__.__name__, path=self.path)
+
+	@property
+	def aware(self) -> bool:
+		return self._aware
+
+	@property
+	def max_len(self) -> int:
+		"""The length of the longest Interval in microseconds."""
+		return self._max_len
+
+	def _check_open(self):
+		if self._mmap is None:
+			raise ValueError('I/O operation on closed store')
+
+	def __len__(self):
+		self._check_open()
+		return len(self._begs)
+
+	def _interval(self, index: int) -> Interval:
+		records = self._records
+		tzinfo = (self._tzinfo or timezone.utc) if self._aware else None
+		return Interval(
+			_us_to_datetime(records[2 * index], tzinfo),
+			_us_to_datetime(records[2 * index + 1], tzinfo),
+			)
+
+	def __getitem__(self, index: int) -> Interval:
+		if index < 0:
+			index += len(self)
+		if not 0 <= index < len(self):
+			raise IndexError('IntervalStore index out of range')
+		return self._interval(index)
+
+	def __iter__(self):
+		for index in range(len(self)):
+			yield self._interval(index)
+
+	def _to_us(self, dt) -> int:
+		if (dt.tzinfo is not None) != self._aware:
+			raise TypeError('Can not compare naive and aware datetimes')
+		return _datetime_to_us(dt)
+
+	def _rows(self, beg: int, end: int):
+		"""Generate the indices of the rows overlapping beg to end."""
+		self._check_open()
+		records = self._records
+		lo = bisect_right(self._begs, beg - self._max_len)
+		hi = bisect_left(self._begs, end)
+		for index in range(lo, hi):
+			record_end = records[2 * index + 1]
+			if record_end > beg and records[2 * index] < record_end:
+				yield index
+
+	def at(self, dt) -> list:
+		"""Return the Intervals that contain datetime dt."""
+		us = self._to_us(dt)
+		return [self._interval(index) for index in self._rows(us, us + 1)]
+
+	def overlapping(self, interval) -> list:
+		"""Return the Intervals that overlap interval."""
+		beg = self._to_us(interval.beg)
+		end = self._to_us(interval.end)
+		if not beg < end:
+			return []
+		return [self._interval(index) for index in self._rows(beg, end)]
+
+	def append(self, intervals):
+		"""Append intervals to the file.
+
+		Raises:
+			ValueError: If an Interval begins before the last one in the store.
+		"""
+		records = _encode(intervals, self._aware)
+		if not records:
+			return
+		if len(self) and records[0][0] < self._begs[-1]:
+			raise ValueError(
+				'Appended Intervals must not begin before the last one in the '
+				'store'
+				)
+		max_len = max(self._max_len, _max_len(records))
+		self.close()
+		with open(self.path, 'r+b') as file:
+			file.seek(0, os.SEEK_END)
+			for record in records:
+				file.write(_RECORD.pack(*record))
+			if max_len != self._max_len:
+				file.seek(0)
+				magic, version, flags, _ = _HEADER.unpack(file.read(_HEADER.size))
+				file.seek(0)
+				file.write(_HEADER.pack(magic, version, flags, max_len))
+		self._map()
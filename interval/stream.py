@@ -0,0 +1,216 @@
+"""Aggregate streams of timestamped values into ProperInterval buckets."""
+from collections import namedtuple
+from datetime import timedelta
+import heapq
+from itertools import count
+
+Reducer = namedtuple('Reducer', ('initial', 'step', 'combine'))
+Reducer.__doc__ = """How values are aggregated in a bucket.
+
+Args:
+	initial: A function with no arguments returning the empty aggregate.
+	step: A function of an aggregate and a value returning the new aggregate.
+	combine: A function of two aggregates returning one, used to merge the
+		partial aggregates of the same bucket.
+"""
+
+
+def _zero():
+	return 0
+
+
+def _none():
+	return None
+
+
+def _add(total, value):
+	return total + value
+
+
+def _increment(count, value):
+	return count + 1
+
+
+def _min(current, value):
+	if current is None or value < current:
+		return value
+	return current
+
+
+def _max(current, value):
+	if current is None or value > current:
+		return value
+	return current
+
+
+REDUCERS = {
+	'sum': Reducer(_zero, _add, _add),
+	'count': Reducer(_zero, _increment, _add),
+	'min': Reducer(_none, _min, _min),
+	'max': Reducer(_none, _max, _max),
+	}
+
+
+def get_reducer(reducer) -> Reducer:
+	"""Return the Reducer for a name in REDUCERS or a Reducer itself."""
+	if isinstance(reducer, Reducer):
+		return reducer
+	try:
+		return REDUCERS[reducer]
+	except KeyError:
+		raise ValueError('reducer must be a Reducer or one of {}'.format(
+			sorted(REDUCERS),
+			))
+
+
+class BucketAggregator():
+	"""Aggregate (datetime, value) pairs into buckets of a ProperInterval type.
+
+	Only the buckets that are still open are kept. The watermark is the latest
+	datetime pushed minus allowed_lateness and a bucket is finished once the
+	watermark reaches its end. Values arriving for a bucket that has already
+	been finished are dropped and counted in `dropped`.
+
+	Args:
+		interval_type: The ProperInterval type of the buckets.
+		reducer: A Reducer or the name of one in REDUCERS.
+		allowed_lateness: How far behind the latest datetime values can be and
+			still be aggregated.
+		kwargs: Passed on to interval_type.containing.
+	"""
+
+	__slots__ = (
+		'interval_type',
+		'reducer',
+		'allowed_lateness',
+		'dropped',
+		'_kwargs',
+		'_buckets',
+		'_heap',
+		'_sequence',
+		'_watermark',
+		'_last',
+		)
+
+	def __init__(
+			self,
+			interval_type,
+			reducer='sum',
+			allowed_lateness: timedelta = timedelta(0),
+			**kwargs
+			) -> None:
+		self.interval_type = interval_type
+		self.reducer = get_reducer(reducer)
+		self.allowed_lateness = allowed_lateness
+		self.dropped = 0
+		self._kwargs = kwargs
+		self._buckets = {}
+		# (end, sequence, interval) so Intervals are never compared
+		self._heap = []
+		self._sequence = count()
+		self._watermark = None
+		self._last = None
+
+	@property
+	def watermark(self):
+		"""The datetime before which buckets are finished, None if empty."""
+		return self._watermark
+
+	def __len__(self):
+		"""Return the number of open buckets."""
+		return len(self._buckets)
+
+	def push(self, dt, value) -> list:
+		"""Add value at dt and return the buckets it finished.
+
+		Returns:
+			A list of (interval, aggregate) pairs ordered by interval end.
+		"""
+		bucket = self._last
+		if bucket is None or not bucket.beg <= dt < bucket.end:
+			bucket = self.interval_type.containing(dt, **self._kwargs)
+			self._last = bucket
+		watermark = self._watermark
+		if watermark is not None and bucket.end <= watermark:
+			self.dropped += 1
+			return []
+		buckets = self._buckets
+		try:
+			aggregate = buckets[bucket]
+		except KeyError:
+			aggregate = self.reducer.initial()
+			heapq.heappush(self._heap, (bucket.end, next(self._sequence), bucket))
+		buckets[bucket] = self.reducer.step(aggregate, value)
+		new_watermark = dt - self.allowed_lateness
+		if watermark is None or new_watermark > watermark:
+			self._watermark = new_watermark
+			return self._finish(new_watermark)
+		return []
+
+	def _finish(self, watermark) -> list:
+		finished = []
+		heap = self._heap
+		while heap and heap[0][0] <= watermark:
+			bucket = heapq.heappop(heap)[-1]
+			finished.append((bucket, self._buckets.pop(bucket)))
+		return finished
+
+	def flush(self) -> list:
+		"""Finish and return all of the open buckets ordered by end."""
+		finished = []
+		while self._heap:
+			bucket = heapq.heappop(self._heap)[-1]
+			finished.append((bucket, self._buckets.pop(bucket)))
+		if finished:
+			end = finished[-1][0].end
+			if self._watermark is None or end > self._watermark:
+				self._watermark = end
+		return finished
+
+
+def aggregate(
+		pairs,
+		interval_type,
+		reducer='sum',
+		allowed_lateness: timedelta = timedelta(0),
+		**kwargs
+		):
+	"""Generate (interval, aggregate) pairs for an iterable of (datetime, value).
+
+	Buckets are generated as soon as they are finished, see BucketAggregator,
+	and the open ones when pairs is exhausted.
+	"""
+	aggregator = BucketAggregator(
+		interval_type,
+		reducer,
+		allowed_lateness,
+		**kwargs
+		)
+	push = aggregator.push
+	for dt, value in pairs:
+		finished = push(dt, value)
+		if finished:
+			yield from finished
+	yield from aggregator.flush()
+
+
+async def aggregate_async(
+		pairs,
+		interval_type,
+		reducer='sum',
+		allowed_lateness: timedelta = timedelta(0),
+		**kwargs
+		):
+	"""Asynchronous version of aggregate for an async iterable of pairs."""
+	aggregator = BucketAggregator(
+		interval_type,
+		reducer,
+		allowed_lateness,
+		**kwargs
+		)
+	push = aggregator.push
+	async for dt, value in pairs:
+		for finished in push(dt, value):
+			yield finished
+	for finished in aggregator.flush():
+		yield finished
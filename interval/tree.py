@@ -0,0 +1,221 @@
+"""An index of Intervals answering stabbing and overlap queries."""
+from collections import Counter
+
+
+class _Node():
+	"""A node of a centered interval tree.
+
+	All of the Intervals at a node contain center. They are kept sorted by beg
+	ascending and by end descending, with the keys in separate lists so that
+	queries can stop at the first Interval that doesn't match.
+	"""
+
+	__slots__ = ('center', 'by_beg', 'begs', 'by_end', 'ends', 'left', 'right')
+
+	def __init__(self, center, intervals: list, left, right) -> None:
+		self.center = center
+		self.by_beg = intervals
+		self.begs = [i.beg for i in intervals]
+		self.by_end = sorted(intervals, key=_end, reverse=True)
+		self.ends = [i.end for i in self.by_end]
+		self.left = left
+		self.right = right
+
+
+def _beg(interval):
+	return interval.beg
+
+
+def _end(interval):
+	return interval.end
+
+
+def _build(intervals: list):
+	"""Build a tree from non-empty intervals sorted by beg and return its root.
+
+	The center of each node is the median beg, so neither side has more than
+	half of the intervals and the tree has O(log n) depth.
+	"""
+	if not intervals:
+		return None
+	center = intervals[len(intervals) // 2].beg
+	left = []
+	here = []
+	right = []
+	for interval in intervals:
+		if interval.end <= center:
+			left.append(interval)
+		elif interval.beg > center:
+			right.append(interval)
+		else:
+			here.append(interval)
+	return _Node(center, here, _build(left), _build(right))
+
+
+class IntervalTree():
+	"""An index of arbitrary Intervals for stabbing and overlap queries.
+
+	The index is a centered interval tree built in bulk in O(n log n). Finding
+	the Intervals containing a datetime or overlapping an Interval takes
+	O(log n + k) for k results.
+
+	Intervals added after the tree is built are kept in a small buffer and
+	removed Intervals are remembered until either grows to about sqrt(n),
+	then the tree is rebuilt. So queries cost an extra O(sqrt(n)) at worst
+	and updates take amortized O(sqrt(n) log n).
+
+	Empty Intervals can be stored but never contain or overlap anything.
+
+	Args:
+		intervals: An iterable of Intervals to build the tree from.
+	"""
+
+	__slots__ = ('_root', '_intervals', '_pending', '_removed', '_counts')
+
+	def __init__(self, intervals=()) -> None:
+		self._intervals = list(intervals)
+		self._counts = Counter(self._intervals)
+		self._pending = []
+		self._removed = Counter()
+		self._root = None
+		self._rebuild()
+
+	def _rebuild(self):
+		if self._removed:
+			removed = self._removed
+			self._intervals = [i for i in self._intervals if not _take(removed, i)]
+		self._intervals.extend(self._pending)
+		self._pending = []
+		self._removed = Counter()
+		nonempty = sorted((i for i in self._intervals if i), key=_beg)
+		self._root = _build(nonempty)
+
+	def _max_pending(self) -> int:
+		return max(32, int(len(self._intervals) ** 0.5))
+
+	def __repr__(self):
+		return '{cls}({intervals!r})'.format(
+			cls=self.__class__.__name__,
+			intervals=list(self),
+			)
+
+	def __len__(self):
+		removed = sum(self._removed.values())
+		return len(self._intervals) + len(self._pending) - removed
+
+	def __iter__(self):
+		yield from self._live(self._intervals)
+		yield from self._pending
+
+	def __contains__(self, interval):
+		return self._counts[interval] > 0
+
+	def add(self, interval):
+		"""Add interval to the index."""
+		self._pending.append(interval)
+		self._counts[interval] += 1
+		if len(self._pending) > self._max_pending():
+			self._rebuild()
+
+	def update(self, intervals):
+		"""Add many Intervals to the index, rebuilding it at most once."""
+		intervals = list(intervals)
+		self._pending.extend(intervals)
+		self._counts.update(intervals)
+		if len(self._pending) > self._max_pending():
+			self._rebuild()
+
+	def remove(self, interval):
+		"""Remove one Interval equal to interval from the index.
+
+		Raises:
+			KeyError: If no such Interval is in the index.
+		"""
+		if self._counts[interval] <= 0:
+			raise KeyError(interval)
+		self._counts[interval] -= 1
+		try:
+			self._pending.remove(interval)
+		except ValueError:
+			self._removed[interval] += 1
+			if sum(self._removed.values()) > self._max_pending():
+				self._rebuild()
+
+	def discard(self, interval):
+		"""Remove one Interval equal to interval from the index if present."""
+		if interval in self:
+			self.remove(interval)
+
+	def _live(self, intervals):
+		"""Generate intervals except the ones that have been removed."""
+		if not self._removed:
+			yield from intervals
+			return
+		skipped = Counter()
+		for interval in intervals:
+			if skipped[interval] < self._removed[interval]:
+				skipped[interval] += 1
+			else:
+				yield interval
+
+	def at(self, dt) -> list:
+		"""Return the Intervals that contain datetime dt."""
+		found = []
+		node = self._root
+		while node is not None:
+			if dt < node.center:
+				for beg, interval in zip(node.begs, node.by_beg):
+					if beg > dt:
+						break
+					found.append(interval)
+				node = node.left
+			else:
+				for end, interval in zip(node.ends, node.by_end):
+					if end <= dt:
+						break
+					found.append(interval)
+				node = node.right
+		found = list(self._live(found))
+		found.extend(i for i in self._pending if dt in i)
+		return found
+
+	def overlapping(self, interval) -> list:
+		"""Return the Intervals that overlap interval."""
+		beg, end = interval.beg, interval.end
+		if not beg < end:
+			return []
+		found = []
+		self._overlapping(self._root, beg, end, found)
+		found = list(self._live(found))
+		found.extend(
+			i for i in self._pending
+			if i.beg < end and beg < i.end and i
+			)
+		return found
+
+	def _overlapping(self, node, beg, end, found: list):
+		while node is not None:
+			if end <= node.center:
+				for node_beg, interval in zip(node.begs, node.by_beg):
+					if node_beg >= end:
+						break
+					found.append(interval)
+				node = node.left
+			elif beg > node.center:
+				for node_end, interval in zip(node.ends, node.by_end):
+					if node_end <= beg:
+						break
+					found.append(interval)
+				node = node.right
+			else:
+				found.extend(node.by_beg)
+				self._overlapping(node.left, beg, end, found)
+				node = node.right
+
+
+def _take(counter: Counter, key) -> bool:
+	"""Decrement counter[key] and return True if it was positive."""
+	if counter[key] > 0:
+		counter[key] -= 1
+		return True
+	return False
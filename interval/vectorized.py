@@ -0,0 +1,451 @@
+"""Vectorized Interval operations using numpy.
+
+Timestamps are handled as int64 microseconds since 1970-01-01. Naive
+datetimes are treated as if they were UTC and aware ones are converted to UTC.
+"""
+import calendar
+from datetime import timedelta, timezone
+from functools import lru_cache
+
+import numpy as np
+
+from .core import (
+	_EPOCH as EPOCH,
+	_EPOCH_UTC as EPOCH_UTC,
+	_datetime_to_us,
+	FixedInterval,
+	Year,
+	Quarter,
+	Month,
+	Week,
+	Day,
+	Hour,
+	Minute,
+	Second,
+	MilliSecond,
+	MicroSecond,
+	)
+
+_UNITS = {
+	's': 1000000,
+	'ms': 1000,
+	'us': 1,
+	}
+
+_DAY_US = 86400 * 1000000
+
+# Month index (see _MonthsInterval) of 1970-01
+_EPOCH_MONTH_INDEX = 1969 * 12
+
+
+def _containing_function(interval_type):
+	"""Return the function of interval_type.containing.
+
+	Instrumentation wraps containing, see `interval.instrument`, so the
+	original is followed to dispatch the same way while it is enabled.
+	"""
+	function = interval_type.containing.__func__
+	original = getattr(function, '_instrumented', None)
+	if original is not None:
+		return original.__func__
+	return function
+
+
+_MONTHS_CONTAINING = {
+	_containing_function(cls)
+	for cls in (Year, Quarter, Month)
+	}
+_WEEK_CONTAINING = _containing_function(Week)
+_EPOCH_CONTAINING = {
+	_containing_function(cls)
+	for cls in (
+		FixedInterval,
+		Day,
+		Hour,
+		Minute,
+		Second,
+		MilliSecond,
+		MicroSecond,
+		)
+	}
+
+
+def timedelta_us(delta: timedelta) -> int:
+	"""Return delta as an integer number of microseconds."""
+	return delta // timedelta(microseconds=1)
+
+
+def to_epoch_us(timestamps, unit: str = 'us') -> np.ndarray:
+	"""Return timestamps as an int64 array of microseconds since the epoch.
+
+	Args:
+		timestamps: An array of datetime64, of integers since the epoch or of
+			datetimes.
+		unit: The unit of integer timestamps, 's', 'ms', 'us' or 'ns'.
+	"""
+	timestamps = np.asarray(timestamps)
+	if timestamps.dtype.kind == 'M':
+		return timestamps.astype('datetime64[us]').view(np.int64)
+	if timestamps.dtype.kind == 'O':
+		return np.fromiter(
+			map(_datetime_to_us, timestamps.ravel()),
+			dtype=np.int64,
+			count=timestamps.size,
+			).reshape(timestamps.shape)
+	if timestamps.dtype.kind not in 'iu':
+		raise TypeError('timestamps must be datetime64 or integers')
+	timestamps = timestamps.astype(np.int64, copy=False)
+	if unit == 'ns':
+		return timestamps // 1000
+	try:
+		return timestamps * _UNITS[unit]
+	except KeyError:
+		raise ValueError('unit must be one of "s", "ms", "us" or "ns"')
+
+
+def containing_many(
+		interval_type,
+		timestamps,
+		unit: str = 'us',
+		result: str = 'ordinal',
+		tzinfo=None,
+		**kwargs
+		):
+	"""Vectorized version of interval_type.containing.
+
+	See `_IterableInterval.containing_many`.
+	"""
+	if result not in ('ordinal', 'beg'):
+		raise ValueError('result must be "ordinal" or "beg"')
+	us = to_epoch_us(timestamps, unit)
+	containing = _containing_function(interval_type)
+	if tzinfo is not None and getattr(interval_type, '_absolute', False):
+		if containing in _EPOCH_CONTAINING:
+			return _absolute_containing(interval_type, us, result, tzinfo)
+	local = us if tzinfo is None else utc_to_local_us(us, tzinfo)
+	if containing in _MONTHS_CONTAINING:
+		ordinals = _months_ordinals(interval_type, local)
+	elif containing is _WEEK_CONTAINING:
+		ordinals = _fixed_ordinals(interval_type, local, _week_offset_us(**kwargs))
+	elif containing in _EPOCH_CONTAINING:
+		ordinals = _fixed_ordinals(interval_type, local)
+	else:
+		return _containing_scalar(interval_type, us, result, tzinfo, **kwargs)
+	if result == 'ordinal':
+		return ordinals
+	return begs_from_ordinals(interval_type, ordinals, **kwargs)
+
+
+def begs_from_ordinals(
+		interval_type,
+		ordinals,
+		starts_on: int = None,
+		) -> np.ndarray:
+	"""Return the beginnings of the Intervals with ordinals as datetime64[us].
+
+	This is a vectorized interval_type.from_ordinal(ordinal).beg for the built
+	in types.
+	"""
+	ordinals = np.asarray(ordinals, dtype=np.int64)
+	containing = _containing_function(interval_type)
+	if containing in _MONTHS_CONTAINING:
+		months = ordinals * interval_type._num_months - 12 - _EPOCH_MONTH_INDEX
+		return months.astype('datetime64[M]').astype('datetime64[us]')
+	offset = timedelta_us(interval_type.epoch - EPOCH)
+	if containing is _WEEK_CONTAINING:
+		offset += _week_offset_us(starts_on)
+	us = offset + ordinals * timedelta_us(interval_type.delta)
+	return us.astype('datetime64[us]')
+
+
+def pace_many(beg, end, timestamps, unit: str = 'us') -> np.ndarray:
+	"""Vectorized version of Interval.pace.
+
+	beg, end and timestamps are broadcast against each other, so pass arrays
+	of the same length for one timestamp per Interval, one timestamp for many
+	Intervals or `timestamps[:, None]` for every pair.
+
+	A timestamp before beg is 0.0 and one at or after end is 1.0, so an empty
+	Interval never divides by zero.
+
+	Args:
+		beg: The beginnings as datetime64 or integer microseconds.
+		end: The ends as datetime64 or integer microseconds.
+		timestamps: An array of datetime64 or of integers since the epoch.
+		unit: The unit of integer timestamps, 's', 'ms', 'us' or 'ns'.
+	"""
+	beg = to_epoch_us(beg)
+	end = to_epoch_us(end)
+	us = to_epoch_us(timestamps, unit)
+	delta = end - beg
+	elapsed = np.clip(us - beg, 0, delta)
+	return np.divide(
+		elapsed,
+		delta,
+		out=(us >= end).astype(np.float64),
+		where=delta > 0,
+		)
+
+
+def run_rate_many(
+		beg,
+		end,
+		timestamps,
+		values=1,
+		unit: str = 'us',
+		fill_value=np.nan,
+		) -> np.ndarray:
+	"""Vectorized version of Interval.run_rate.
+
+	Where the pace is 0.0 the result is fill_value instead of dividing by zero.
+	See `pace_many` for the arguments, values is broadcast too.
+	"""
+	pace = pace_many(beg, end, timestamps, unit)
+	values = np.asarray(values, dtype=np.float64)
+	shape = np.broadcast_shapes(pace.shape, values.shape)
+	return np.divide(
+		values,
+		pace,
+		out=np.full(shape, fill_value, dtype=np.float64),
+		where=pace > 0,
+		)
+
+
+def apportion_many(
+		interval_type,
+		begs,
+		ends,
+		values,
+		unit: str = 'us',
+		**kwargs
+		):
+	"""Vectorized version of `interval.apportion.apportion`.
+
+	The shares of the intervals wholly covered by each record are added with a
+	difference array of the records' rates, so the cost is linear in the
+	number of records plus the number of intervals spanned.
+
+	Args:
+		interval_type: The ProperInterval type to spread the values over.
+		begs: The beginnings of the records as datetime64 or integers.
+		ends: The ends of the records as datetime64 or integers.
+		values: The values of the records.
+		unit: The unit of integer begs and ends, 's', 'ms', 'us' or 'ns'.
+		kwargs: Passed on to `containing_many`, eg. starts_on for a Week.
+	Returns:
+		An int64 array of consecutive ordinals of interval_type and a float64
+		array of the total value for each.
+	"""
+	begs = to_epoch_us(begs, unit)
+	ends = to_epoch_us(ends, unit)
+	values = np.broadcast_to(np.asarray(values, dtype=np.float64), begs.shape)
+	if not len(begs):
+		return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+	first = containing_many(interval_type, begs, **kwargs)
+	last = containing_many(interval_type, ends, **kwargs)
+	last_begs = begs_from_ordinals(interval_type, last, **kwargs).view(np.int64)
+	last = np.maximum(last - (last_begs == ends), first)
+	lo = first.min()
+	ordinals = np.arange(lo, last.max() + 1, dtype=np.int64)
+	bounds = np.append(ordinals, ordinals[-1] + 1)
+	period_begs = begs_from_ordinals(interval_type, bounds, **kwargs)
+	period_begs = period_begs.view(np.int64)
+	n = len(ordinals)
+	spans = first < last
+	duration = ends - begs
+	rates = np.divide(values, duration, out=np.zeros(len(values)), where=spans)
+	# Records within one interval. bincount of no records is int64, so add
+	# to float64 zeros rather than starting from it.
+	totals = np.zeros(n)
+	totals += np.bincount(first[~spans] - lo, values[~spans], minlength=n)
+	# The clipped first and last intervals of the others
+	first, last = first[spans] - lo, last[spans] - lo
+	rates, begs, ends = rates[spans], begs[spans], ends[spans]
+	heads = rates * (period_begs[first + 1] - begs)
+	totals += np.bincount(first, heads, minlength=n)
+	tails = rates * (ends - period_begs[last])
+	totals += np.bincount(last, tails, minlength=n)
+	# The intervals wholly covered in between
+	covering = np.bincount(first + 1, rates, minlength=n + 1)
+	covering -= np.bincount(last, rates, minlength=n + 1)
+	totals += np.cumsum(covering)[:n] * np.diff(period_begs)
+	return ordinals, totals
+
+
+def utc_to_local_us(us, tzinfo) -> np.ndarray:
+	"""Convert microseconds since the epoch in UTC to wall clock time in tzinfo.
+
+	The UTC offsets come from a table of the transitions in each year, which
+	is computed once per zone and year, so converting doesn't call utcoffset
+	for each timestamp.
+	"""
+	us = np.asarray(us, dtype=np.int64)
+	if isinstance(tzinfo, timezone):
+		return us + timedelta_us(tzinfo.utcoffset(None))
+	if not us.size:
+		return us.copy()
+	instants, offsets = _zone_table(tzinfo, us)
+	# Look up by day rather than binary searching for each timestamp, with
+	# the instant and new offset of the transition on days that have one
+	days = us // _DAY_US
+	first_day = days.min()
+	day_begs = np.arange(first_day, days.max() + 1, dtype=np.int64) * _DAY_US
+	index = np.searchsorted(instants, day_begs, side='right') - 1
+	following = instants[index + 1]
+	changes = np.where(following < day_begs + _DAY_US, following, instants[-1])
+	days -= first_day
+	changed = us >= changes[days]
+	return us + np.where(changed, offsets[index + 1][days], offsets[index][days])
+
+
+def _zone_table(tzinfo, us: np.ndarray):
+	"""Return the transitions of tzinfo in the years of us, see _zone_transitions.
+
+	The instants end with the largest int64 and the offsets with the last
+	offset repeated, so every instant has a next one.
+	"""
+	bounds = np.array([us.min(), us.max()]).astype('datetime64[us]')
+	first_year, last_year = bounds.astype('datetime64[Y]').view(np.int64) + 1970
+	instants = []
+	offsets = []
+	for year in range(int(first_year), int(last_year) + 1):
+		year_instants, year_offsets = _zone_transitions(tzinfo, year)
+		instants.extend(year_instants)
+		offsets.extend(year_offsets)
+	instants = np.array(instants + [np.iinfo(np.int64).max], dtype=np.int64)
+	offsets = np.array(offsets + [offsets[-1]], dtype=np.int64)
+	return instants, offsets
+
+
+def _near_transitions(us: np.ndarray, tzinfo, delta_us: int) -> np.ndarray:
+	"""Return where the UTC offset of tzinfo changes within delta_us of us.
+
+	The window is widened by the largest change in offset, since that is how
+	far wall clock time can jump.
+	"""
+	if isinstance(tzinfo, timezone) or not us.size:
+		return np.zeros(us.shape, dtype=bool)
+	instants, offsets = _zone_table(tzinfo, us)
+	changed = offsets[1:] != offsets[:-1]
+	margin = delta_us + int(np.abs(offsets[1:] - offsets[:-1]).max())
+	transitions = np.append(instants[1:][changed], np.iinfo(np.int64).max)
+	index = np.searchsorted(transitions, us - margin)
+	return transitions[index] <= us + margin
+
+
+def _absolute_containing(interval_type, us: np.ndarray, result: str, tzinfo):
+	"""Bucket UTC timestamps into an aware FixedInterval type shorter than a day.
+
+	Like `FixedInterval.containing` the Intervals are aligned in wall clock
+	time, but like `FixedInterval.ordinal` they are numbered by their
+	beginning in UTC, so the hour repeated when clocks go back is a bucket of
+	its own. Timestamps near a change in UTC offset, where the Interval can
+	begin at another offset, are bucketed by calling containing.
+	"""
+	delta = timedelta_us(interval_type.delta)
+	epoch = timedelta_us(interval_type.epoch - EPOCH)
+	local = utc_to_local_us(us, tzinfo)
+	begs = us - (local - epoch) % delta
+	near = _near_transitions(us, tzinfo, delta)
+	if near.any():
+		begs[near] = [
+			_datetime_to_us(interval_type.containing(
+				(EPOCH_UTC + timedelta(microseconds=int(instant))).astimezone(tzinfo)
+				).beg)
+			for instant in us[near]
+			]
+	if result == 'ordinal':
+		return (begs - epoch) // delta
+	return begs.astype('datetime64[us]')
+
+
+def _utcoffset_us(tzinfo, us: int) -> int:
+	"""Return the UTC offset of tzinfo at us microseconds since the epoch."""
+	dt = (EPOCH_UTC + timedelta(microseconds=us)).astimezone(tzinfo)
+	return timedelta_us(dt.utcoffset())
+
+
+@lru_cache(maxsize=4096)
+def _zone_transitions(tzinfo, year: int):
+	"""Return the instants in a year that the UTC offset of tzinfo changes.
+
+	The first instant is the start of the year in UTC. The offset is probed
+	once a day and each change is then found to the second by bisection.
+
+	Returns:
+		A tuple of the instants as microseconds since the epoch and a tuple of
+		the offsets in microseconds from each instant.
+	"""
+	start = timedelta_us(EPOCH_UTC.replace(year=year) - EPOCH_UTC)
+	days = 366 if calendar.isleap(year) else 365
+	instants = [start]
+	offsets = [_utcoffset_us(tzinfo, start)]
+	previous = start
+	for day in range(1, days + 1):
+		instant = start + day * _DAY_US
+		offset = _utcoffset_us(tzinfo, instant)
+		if offset == offsets[-1]:
+			previous = instant
+			continue
+		# Find the first second with the new offset
+		lo, hi = previous // 1000000, instant // 1000000
+		while hi - lo > 1:
+			mid = (lo + hi) // 2
+			if _utcoffset_us(tzinfo, mid * 1000000) == offsets[-1]:
+				lo = mid
+			else:
+				hi = mid
+		instants.append(hi * 1000000)
+		offsets.append(offset)
+		previous = instant
+	return tuple(instants), tuple(offsets)
+
+
+def _months_ordinals(interval_type, us: np.ndarray) -> np.ndarray:
+	months = us.astype('datetime64[us]').astype('datetime64[M]').view(np.int64)
+	return (months + _EPOCH_MONTH_INDEX + 12) // interval_type._num_months
+
+
+def _fixed_ordinals(
+		interval_type,
+		us: np.ndarray,
+		offset_us: int = 0,
+		) -> np.ndarray:
+	offset_us += timedelta_us(interval_type.epoch - EPOCH)
+	return (us - offset_us) // timedelta_us(interval_type.delta)
+
+
+def _week_offset_us(starts_on: int = None) -> int:
+	if starts_on is None:
+		starts_on = calendar.firstweekday()
+	return timedelta_us(timedelta(days=starts_on))
+
+
+def _containing_scalar(
+		interval_type,
+		us: np.ndarray,
+		result: str,
+		tzinfo=None,
+		**kwargs
+		):
+	"""Fall back to calling containing for each timestamp.
+
+	With tzinfo the timestamps are in UTC and containing is passed them in
+	tzinfo. The beginnings returned are wall clock times, or UTC for types
+	shorter than a day, like the other paths of containing_many.
+	"""
+	datetimes = us.astype('datetime64[us]').astype(object)
+	if tzinfo is not None:
+		datetimes = [
+			dt.replace(tzinfo=timezone.utc).astimezone(tzinfo)
+			for dt in datetimes
+			]
+	intervals = [interval_type.containing(dt, **kwargs) for dt in datetimes]
+	if result == 'ordinal':
+		return np.array([i.ordinal for i in intervals], dtype=np.int64)
+	begs = [i.beg for i in intervals]
+	if tzinfo is not None:
+		if getattr(interval_type, '_absolute', False):
+			begs = [beg.astimezone(timezone.utc) for beg in begs]
+		begs = [beg.replace(tzinfo=None) for beg in begs]
+	return np.array(begs, dtype='datetime64[us]')
@@ -6,7 +6,7 @@ from setuptools import setup
 
 setup(
 	name='interval',
-	py_modules=['interval'],
+	packages=['interval'],
 	version='0.1.0',
 	description='Intervals of time',
 	author='Michael Lenzen',
@@ -37,6 +37,9 @@ setup(
 		],
 	long_description=open(join(dirname(__file__), 'README.rst')).read(),
 	install_requires=['setuptools'],
+	extras_require={
+		'numpy': ['numpy'],
+		},
 	tests_require=['pytest', 'pytest-runner'],
 	package_data={'': ['README.rst', 'LICENSE']},
 	)
@@ -1,15 +1,35 @@
 """Tests for interval."""
-from datetime import date, datetime, timedelta, tzinfo
+import calendar
+import random
+import sys
+from datetime import date, datetime, timedelta, timezone, tzinfo
 
 import pytest
 
+try:
+	import numpy as np
+except ImportError:  # pragma: no cover
+	np = None
+
 from interval import (
+	CacheInfo,
+	EpochInterval,
+	Year,
+	Quarter,
 	Month,
 	Week,
 	Day,
+	Hour,
+	Minute,
+	Second,
+	MilliSecond,
+	MicroSecond,
 	ProperInterval,
 	FixedInterval,
 	Interval,
+	IntervalRange,
+	IntervalSet,
+	IntervalTree,
 	)
 
 
@@ -27,6 +47,8 @@ class UTCType(tzinfo):
 
 UTC = UTCType()
 
+requires_numpy = pytest.mark.skipif(np is None, reason='numpy is not installed')
+
 
 def test_interval_init():
 	i = Interval(datetime(2017, 3, 22), datetime(2017, 3, 24))
@@ -191,6 +213,10 @@ def test_custom_proper_interval():
 	assert FiscalYear.beginning(datetime(2016, 2, 1)) == fy2016
 	with pytest.raises(ValueError):
 		FiscalYear.beginning(datetime(2016, 1, 1))
+	assert FiscalYear.from_ordinal(0) == FiscalYear.containing(datetime(1970, 1, 1))
+	assert fy2016.ordinal == 47
+	assert FiscalYear.from_ordinal(47) == fy2016
+	assert FiscalYear.from_ordinal(-3).ordinal == -3
 
 
 def test_day_name():
@@ -228,3 +254,1383 @@ def test_fixed_interval_factory():
 	cls = FixedInterval.create(timedelta(days=3))
 	obj = cls(datetime(2017, 3, 21))
 	assert obj.end == datetime(2017, 3, 24)
+
+
+@pytest.mark.parametrize('obj', [
+	Interval(datetime(2017, 3, 22), datetime(2017, 3, 24)),
+	Month(2017, 3),
+	Day(datetime(2017, 3, 21)),
+	FixedInterval.create(timedelta(days=3))(datetime(2017, 3, 21)),
+	])
+def test_no_instance_dict(obj):
+	assert not hasattr(obj, '__dict__')
+	with pytest.raises(AttributeError):
+		obj.foo = 1
+
+
+@pytest.mark.parametrize('obj', [
+	Interval(datetime(2017, 3, 22), datetime(2017, 3, 24)),
+	EpochInterval(datetime(2017, 3, 22), datetime(2017, 3, 24)),
+	Year(2017),
+	Quarter(2017, 1),
+	Month(2017, 3, UTC),
+	Week(datetime(2017, 3, 20)),
+	Day(datetime(2017, 3, 21)),
+	Hour(datetime(2017, 3, 21, 5)),
+	MicroSecond(datetime(2017, 3, 21, 5)),
+	])
+def test_pickle(obj):
+	import pickle
+	for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+		unpickled = pickle.loads(pickle.dumps(obj, protocol))
+		assert type(unpickled) is type(obj)
+		assert unpickled == obj
+		assert (unpickled.beg, unpickled.end) == (obj.beg, obj.end)
+
+
+def test_hash():
+	i = Interval(datetime(2017, 3, 1), datetime(2017, 4, 1))
+	assert hash(i) == hash(Month(2017, 3))
+	assert len({i, Month(2017, 3), Month(2017, 4)}) == 2
+	assert {Month(2017, 3): 1}[Month.containing(datetime(2017, 3, 5))] == 1
+
+
+def test_quarter_containing():
+	assert Quarter.containing(datetime(2017, 3, 31)) == Quarter(2017, 1)
+	assert Quarter.containing(datetime(2017, 4, 1)) == Quarter(2017, 2)
+	assert Quarter.containing(datetime(2017, 12, 31)) == Quarter(2017, 4)
+
+
+def test_interning():
+	assert Month.interning_info() is None
+	Month.enable_interning(maxsize=2)
+	try:
+		m = Month.containing(datetime(2017, 3, 1))
+		assert Month.containing(datetime(2017, 3, 31, 12)) is m
+		assert Month.interning_info() == CacheInfo(1, 1, 2, 1)
+		Month.containing(datetime(2017, 4, 1))
+		Month.containing(datetime(2017, 5, 1))
+		assert Month.interning_info().currsize == 2
+		assert Month.containing(datetime(2017, 3, 1)) is not m
+		assert Day.interning_info() is None
+	finally:
+		Month.disable_interning()
+	assert Month.containing(datetime(2017, 3, 1)) is not Month.containing(datetime(2017, 3, 1))
+
+
+def test_interning_shared():
+	ProperInterval.enable_interning()
+	try:
+		h = Hour.containing(datetime(2017, 3, 1, 12, 30))
+		assert Hour.containing(datetime(2017, 3, 1, 12, 45)) is h
+		assert Day.containing(datetime(2017, 3, 1, 12)) == Day(datetime(2017, 3, 1))
+		assert Year.interning_info() == CacheInfo(1, 2, 1024, 2)
+	finally:
+		ProperInterval.disable_interning()
+
+
+def test_interning_aware():
+	from zoneinfo import ZoneInfo
+	new_york = ZoneInfo('America/New_York')
+	Hour.enable_interning()
+	try:
+		utc = Hour.containing(datetime(2017, 1, 1, 5, 30, tzinfo=timezone.utc))
+		# The same instant in another timezone
+		eastern = Hour.containing(datetime(2017, 1, 1, 0, 30, tzinfo=timezone(timedelta(hours=-5))))
+		assert eastern is not utc
+		assert eastern.beg.utcoffset() == timedelta(hours=-5)
+		assert eastern.beg.hour == 0
+		edt = Hour.containing(datetime(2017, 11, 5, 1, 30, tzinfo=new_york))
+		est = Hour.containing(datetime(2017, 11, 5, 1, 30, tzinfo=new_york, fold=1))
+		assert est is not edt
+		assert est.beg.fold == 1
+		assert est.end == datetime(2017, 11, 5, 2, tzinfo=new_york)
+		assert edt.end == datetime(2017, 11, 5, 1, tzinfo=new_york, fold=1)
+		assert Hour.containing(datetime(2017, 11, 5, 1, 45, tzinfo=new_york, fold=1)) is est
+	finally:
+		Hour.disable_interning()
+
+
+@pytest.mark.parametrize('interval, beg, end', [
+	(Year(2016), datetime(2016, 1, 1), datetime(2017, 1, 1)),
+	(Quarter(2016, 4), datetime(2016, 10, 1), datetime(2017, 1, 1)),
+	(Quarter(2017, 2), datetime(2017, 4, 1), datetime(2017, 7, 1)),
+	(Month(2016, 2), datetime(2016, 2, 1), datetime(2016, 3, 1)),
+	(Month(1900, 2), datetime(1900, 2, 1), datetime(1900, 3, 1)),
+	(Month(2016, 12), datetime(2016, 12, 1), datetime(2017, 1, 1)),
+	])
+def test_months_interval_bounds(interval, beg, end):
+	assert interval.beg == beg
+	assert interval.end == end
+	assert interval.delta == end - beg
+	assert interval.num_days() == (end - beg).days
+	assert interval.beg is interval.beg
+	assert interval.end is interval.end
+
+
+def test_months_interval_tzinfo():
+	q = Quarter(2017, 1, tzinfo=UTC)
+	assert q.beg == datetime(2017, 1, 1, tzinfo=UTC)
+	assert q.end.tzinfo is UTC
+
+
+def test_divide():
+	months = Month.divide(Quarter(2017, 1))
+	assert months == [Month(2017, 1), Month(2017, 2), Month(2017, 3)]
+	assert len(Day.divide(Year(2016))) == 366
+	assert Quarter(2017, 1).divide_into(Month) == months
+
+
+def test_divide_fixed_interval():
+	days = Day.divide(Interval(datetime(2017, 3, 1), datetime(2017, 3, 4)))
+	assert days == [Day(datetime(2017, 3, d)) for d in (1, 2, 3)]
+	Fortnight = FixedInterval.create(timedelta(weeks=2))
+	i = Interval(datetime(2017, 3, 1), delta=timedelta(weeks=6))
+	assert [f.beg for f in Fortnight.divide(i)] == [
+		datetime(2017, 3, 1),
+		datetime(2017, 3, 15),
+		datetime(2017, 3, 29),
+		]
+
+
+def test_divide_extras():
+	i = Interval(datetime(2017, 1, 15), datetime(2017, 3, 15))
+	with pytest.raises(ValueError):
+		Month.divide(i)
+	with pytest.raises(ValueError):
+		Month.divide(Interval(datetime(2017, 1, 1), datetime(2017, 3, 15)))
+	assert Month.divide(i, extras_action='ignore') == [Month(2017, 1), Month(2017, 2)]
+	assert Month.divide(i, extras_action='partial') == [
+		Interval(datetime(2017, 1, 15), datetime(2017, 2, 1)),
+		Month(2017, 2),
+		Interval(datetime(2017, 3, 1), datetime(2017, 3, 15)),
+		]
+	with pytest.raises(ValueError):
+		Month.divide(i, extras_action='bad')
+
+
+def test_divide_within_one():
+	i = Interval(datetime(2017, 1, 15), datetime(2017, 1, 20))
+	assert Month.divide(i, extras_action='partial') == [i]
+	assert Day.divide(Interval(datetime(2017, 1, 15), datetime(2017, 1, 15))) == []
+	for beg in (datetime(2017, 1, 1), datetime(2017, 1, 3)):
+		i = Interval(beg, datetime(2017, 1, 15))
+		assert Month.divide(i, extras_action='ignore') == [Month(2017, 1)]
+		assert list(Month.divide(i, extras_action='ignore', lazy=True)) == [Month(2017, 1)]
+
+
+def test_divide_extras_unaligned_type():
+	Fortnight = FixedInterval.create(timedelta(weeks=2))
+	first = Fortnight(datetime(2017, 1, 1))
+	i = Interval(datetime(2017, 1, 1), datetime(2017, 1, 20))
+	with pytest.raises(ValueError):
+		Fortnight.divide(i)
+	assert Fortnight.divide(i, extras_action='ignore') == [first]
+	assert Fortnight.divide(i, extras_action='partial') == [
+		first,
+		Interval(datetime(2017, 1, 15), datetime(2017, 1, 20)),
+		]
+	long = Interval(datetime(2017, 1, 1), datetime(2017, 2, 20))
+	assert Fortnight.divide(long, extras_action='ignore', lazy=True) == IntervalRange(first, 3)
+
+
+def test_interval_range():
+	months = IntervalRange(Month(2017, 1), 12)
+	assert len(months) == 12
+	assert months[0] == Month(2017, 1)
+	assert months[-1] == Month(2017, 12)
+	assert list(months) == Month.divide(Year(2017))
+	assert list(reversed(months)) == list(reversed(Month.divide(Year(2017))))
+	assert Month(2017, 5) in months
+	assert Month(2018, 1) not in months
+	assert Interval(datetime(2017, 2, 1), datetime(2017, 3, 1)) in months
+	assert Day(datetime(2017, 2, 1)) not in months
+	assert months.index(Month(2017, 5)) == 4
+	with pytest.raises(ValueError):
+		months.index(Month(2016, 5))
+	with pytest.raises(IndexError):
+		months[12]
+	assert repr(months[:1]) == 'IntervalRange({!r}, 1)'.format(Month(2017, 1))
+
+
+def test_interval_range_slice():
+	hours = IntervalRange(Hour(datetime(2017, 1, 1)), 24)
+	evens = hours[::2]
+	assert len(evens) == 12
+	assert evens.step == 2
+	assert evens[1] == Hour(datetime(2017, 1, 1, 2))
+	assert list(evens[-2:]) == [Hour(datetime(2017, 1, 1, 20)), Hour(datetime(2017, 1, 1, 22))]
+	assert Hour(datetime(2017, 1, 1, 3)) not in evens
+	assert evens.index(Hour(datetime(2017, 1, 1, 4))) == 2
+	assert list(reversed(evens))[0] == Hour(datetime(2017, 1, 1, 22))
+	assert evens == IntervalRange(Hour(datetime(2017, 1, 1)), 12, step=2)
+	assert hours[5:5] == IntervalRange(Day(datetime(2017, 1, 1)), 0)
+	backwards = hours[::-1][:2]
+	assert list(backwards) == [Hour(datetime(2017, 1, 1, 23)), Hour(datetime(2017, 1, 1, 22))]
+	assert repr(backwards) == 'IntervalRange({!r}, 2, step=-1)'.format(Hour(datetime(2017, 1, 1, 23)))
+
+
+def test_interval_range_weeks_starting_on_sunday():
+	weeks = IntervalRange(Week.containing(datetime(2017, 1, 4), starts_on=6), 4)
+	assert weeks[0] == Week(datetime(2017, 1, 1))
+	assert weeks[1] in weeks
+	assert weeks.index(weeks[2]) == 2
+	assert Week(datetime(2017, 1, 9)) not in weeks
+
+
+def test_interval_range_between():
+	days = IntervalRange.between(Day(datetime(2017, 1, 30)), Day(datetime(2017, 2, 2)))
+	assert list(days) == [Day(datetime(2017, 1, d)) for d in (30, 31)] + [Day(datetime(2017, 2, 1))]
+
+
+def test_divide_lazy():
+	minutes = Minute.divide(Year(2017), lazy=True)
+	assert isinstance(minutes, IntervalRange)
+	assert len(minutes) == 525600
+	assert minutes[-1] == Minute(datetime(2017, 12, 31, 23, 59))
+	assert Minute(datetime(2017, 6, 1, 12, 30)) in minutes
+	i = Interval(datetime(2017, 1, 15), datetime(2017, 3, 15))
+	assert list(Month.divide(i, extras_action='ignore', lazy=True)) == [
+		Month(2017, 1),
+		Month(2017, 2),
+		]
+	with pytest.raises(ValueError):
+		Month.divide(i, extras_action='partial', lazy=True)
+	assert Quarter(2017, 1).divide_into(Month, lazy=True) == IntervalRange(Month(2017, 1), 3)
+
+
+@pytest.mark.parametrize('interval', [
+	Year(2017),
+	Quarter(2017, 3),
+	Month(2017, 12),
+	Month(1, 1),
+	Week(datetime(2017, 3, 20)),
+	Week(datetime(2017, 3, 19)),
+	Day(datetime(2017, 3, 21)),
+	Day(datetime(1969, 12, 31)),
+	Hour(datetime(2017, 3, 21, 13)),
+	FixedInterval.create(timedelta(days=3))(datetime(1970, 1, 4)),
+	])
+def test_ordinal_round_trip(interval):
+	if isinstance(interval, Week):
+		copy = Week.from_ordinal(interval.ordinal, starts_on=interval.beg.weekday())
+	else:
+		copy = type(interval).from_ordinal(interval.ordinal)
+	assert copy == interval
+	assert interval.next().ordinal == interval.ordinal + 1
+
+
+def test_ordinal_values():
+	assert Year(2017).ordinal == 2017
+	assert Quarter(2017, 1).ordinal == 2017 * 4
+	assert Month(2017, 3).ordinal == 2017 * 12 + 2
+	assert Day(datetime(1970, 1, 2)).ordinal == 1
+	assert Week(datetime(1970, 1, 5)).ordinal == 0
+	assert Week(datetime(1970, 1, 4)).ordinal == -1
+	assert Month.from_ordinal(Month(2017, 3).ordinal, tzinfo=UTC).tzinfo is UTC
+
+
+def test_ordinal_arithmetic():
+	m = Month(2017, 3)
+	assert m + 1 == Month(2017, 4)
+	assert 10 + m == Month(2018, 1)
+	assert m - 36 == Month(2014, 3)
+	assert m - Month(2014, 3) == 36
+	assert Month(2014, 3) - m == -36
+	assert Quarter(2017, 1) - 1 == Quarter(2016, 4)
+	assert Year(2017) + 3 == Year(2020)
+	h = Hour(datetime(2017, 3, 21, 13))
+	assert h + 24 == Hour(datetime(2017, 3, 22, 13))
+	assert Hour(datetime(2017, 3, 22, 13)) - h == 24
+	with pytest.raises(TypeError):
+		m - h
+	with pytest.raises(ValueError):
+		Hour(datetime(2017, 3, 21, 13, 30)) - h
+
+
+def test_week_starts_on_monday():
+	calendar.setfirstweekday(calendar.SUNDAY)
+	try:
+		w = Week.containing(datetime(2017, 3, 21), starts_on=calendar.MONDAY)
+		assert w.beg == datetime(2017, 3, 20)
+		assert Week.containing(datetime(2017, 3, 21)).beg == datetime(2017, 3, 19)
+	finally:
+		calendar.setfirstweekday(calendar.MONDAY)
+
+
+def test_millisecond_containing():
+	ms = MilliSecond.containing(datetime(2017, 3, 21, 12, 0, 0, 999999))
+	assert ms.beg == datetime(2017, 3, 21, 12, 0, 0, 999000)
+
+
+def test_fixed_interval_containing():
+	Fortnight = FixedInterval.create(timedelta(weeks=2))
+	fortnight = Fortnight.containing(datetime(2017, 3, 21, 12))
+	assert fortnight.beg == datetime(2017, 3, 9)
+	assert (Hour * 2).containing(datetime(2017, 3, 21, 13, 30)).beg == datetime(2017, 3, 21, 12)
+	assert len(Fortnight.divide(Interval(datetime(2017, 3, 21), delta=timedelta(weeks=4)))) == 2
+
+
+CONTAINING_MANY_TYPES = [
+	Year,
+	Quarter,
+	Month,
+	Week,
+	Day,
+	Hour,
+	Minute,
+	Second,
+	MilliSecond,
+	MicroSecond,
+	FixedInterval.create(timedelta(days=3)),
+	Hour * 6,
+	]
+
+
+@requires_numpy
+@pytest.mark.parametrize('interval_type', CONTAINING_MANY_TYPES)
+def test_containing_many(interval_type):
+	dts = [
+		datetime(1969, 12, 31, 23, 59, 59, 999999),
+		datetime(1970, 1, 1),
+		datetime(2016, 2, 29, 13, 30, 15, 123456),
+		datetime(2017, 12, 31, 23, 59, 59),
+		datetime(1900, 3, 1, 0, 0, 0, 1),
+		]
+	timestamps = np.array(dts, dtype='datetime64[us]')
+	ordinals = interval_type.containing_many(timestamps)
+	begs = interval_type.containing_many(timestamps, result='beg')
+	assert ordinals.dtype == np.int64
+	for dt, ordinal, beg in zip(dts, ordinals, begs.tolist()):
+		interval = interval_type.containing(dt)
+		assert interval.ordinal == ordinal
+		assert interval.beg == beg
+
+
+@requires_numpy
+@pytest.mark.parametrize('starts_on', range(7))
+def test_containing_many_week_starts_on(starts_on):
+	dts = [datetime(2017, 3, d) for d in range(1, 15)]
+	begs = Week.containing_many(np.array(dts, dtype='datetime64[D]'), result='beg', starts_on=starts_on)
+	assert begs.tolist() == [Week.containing(dt, starts_on=starts_on).beg for dt in dts]
+
+
+@requires_numpy
+def test_containing_many_units():
+	seconds = np.array([0, 86399, 86400, -1])
+	assert Day.containing_many(seconds, unit='s').tolist() == [0, 0, 1, -1]
+	assert Day.containing_many(seconds * 10 ** 9, unit='ns').tolist() == [0, 0, 1, -1]
+	assert Month.containing_many(seconds * 1000, unit='ms').tolist() == [
+		Month(1970, 1).ordinal,
+		Month(1970, 1).ordinal,
+		Month(1970, 1).ordinal,
+		Month(1969, 12).ordinal,
+		]
+	with pytest.raises(ValueError):
+		Day.containing_many(seconds, unit='h')
+
+
+@requires_numpy
+def test_containing_many_custom_type():
+	class FiscalYear(Year):
+		__slots__ = ()
+
+		@classmethod
+		def containing(cls, dt):
+			return cls(dt.year if dt.month >= 2 else dt.year - 1)
+
+	timestamps = np.array(['2017-01-31', '2017-02-01'], dtype='datetime64[us]')
+	assert FiscalYear.containing_many(timestamps).tolist() == [2016, 2017]
+
+
+@requires_numpy
+def test_containing_many_custom_type_tzinfo():
+	from zoneinfo import ZoneInfo
+	new_york = ZoneInfo('America/New_York')
+	utc = timezone.utc
+
+	class CustomHour(Hour):
+		__slots__ = ()
+
+		@classmethod
+		def containing(cls, dt):
+			return cls(dt.replace(minute=0, second=0, microsecond=0))
+
+	class FiscalYear(Year):
+		__slots__ = ()
+
+		@classmethod
+		def containing(cls, dt):
+			return cls(dt.year if dt.month >= 2 else dt.year - 1, dt.tzinfo)
+
+	timestamps = np.array(
+		['2017-07-01T12:30', '2017-11-05T06:30', '2018-02-01T02:00'],
+		dtype='datetime64[us]',
+		)
+	aware = [dt.replace(tzinfo=utc).astimezone(new_york) for dt in timestamps.astype(object)]
+	for cls in (CustomHour, FiscalYear):
+		intervals = [cls.containing(dt) for dt in aware]
+		assert cls.containing_many(timestamps, tzinfo=new_york).tolist() == [
+			i.ordinal for i in intervals
+			]
+	assert CustomHour.containing_many(timestamps, tzinfo=new_york).tolist() == (
+		Hour.containing_many(timestamps, tzinfo=new_york).tolist()
+		)
+	assert CustomHour.containing_many(timestamps, result='beg', tzinfo=new_york).tolist() == (
+		Hour.containing_many(timestamps, result='beg', tzinfo=new_york).tolist()
+		)
+	assert FiscalYear.containing_many(timestamps, result='beg', tzinfo=new_york).tolist() == [
+		datetime(2017, 1, 1),
+		datetime(2017, 1, 1),
+		datetime(2017, 1, 1),
+		]
+
+
+@requires_numpy
+def test_interval_array_round_trip():
+	from interval.array import IntervalArray
+	intervals = [
+		Interval(datetime(2017, 3, 22), datetime(2017, 3, 24)),
+		Month(2017, 1),
+		Interval(datetime(1969, 12, 31, 12), datetime(1970, 1, 1, 0, 0, 0, 1)),
+		]
+	array = IntervalArray.from_intervals(intervals)
+	assert len(array) == 3
+	assert array.to_intervals() == intervals
+	assert array[1] == Month(2017, 1)
+	assert array[1:].to_intervals() == intervals[1:]
+	assert array.beg_us.dtype == np.int64
+	assert array.delta[0] == np.timedelta64(2, 'D')
+	assert IntervalArray(array.beg, array.end) == array
+
+
+@requires_numpy
+def test_interval_array_aware():
+	from interval.array import IntervalArray
+	i = Interval(datetime(2017, 3, 22, tzinfo=UTC), datetime(2017, 3, 24, tzinfo=UTC))
+	array = IntervalArray.from_intervals([i])
+	assert array.tzinfo is UTC
+	assert array.to_intervals() == [i]
+	assert array.to_intervals()[0].tzinfo is UTC
+
+
+@requires_numpy
+def test_interval_array_contains_overlaps():
+	from interval.array import IntervalArray
+	array = IntervalArray.from_intervals([Day(datetime(2017, 3, d)) for d in (1, 2, 5)])
+	assert array.contains(datetime(2017, 3, 2, 12)).tolist() == [False, True, False]
+	dts = np.array(['2017-03-01', '2017-03-03', '2017-03-05T23'], dtype='datetime64[us]')
+	assert array.contains(dts).tolist() == [True, False, True]
+	assert array.contains(dts[:, None]).sum(axis=1).tolist() == [1, 0, 1]
+	window = Interval(datetime(2017, 3, 2, 12), datetime(2017, 3, 5))
+	assert array.overlaps(window).tolist() == [False, True, False]
+	assert array.overlaps(array).all()
+
+
+@requires_numpy
+def test_interval_array_sort_merge():
+	from interval.array import IntervalArray
+	days = [Day(datetime(2017, 3, d)) for d in (5, 2, 1, 3, 7)]
+	array = IntervalArray.from_intervals(days)
+	assert array.sort().to_intervals() == sorted(days)
+	assert array.merge_adjacent().to_intervals() == [
+		Interval(datetime(2017, 3, 1), datetime(2017, 3, 4)),
+		Day(datetime(2017, 3, 5)),
+		Day(datetime(2017, 3, 7)),
+		]
+
+
+@requires_numpy
+def test_interval_array_pace():
+	from interval.array import IntervalArray
+	array = IntervalArray.from_intervals([
+		Interval(datetime(2017, 3, 22), datetime(2017, 3, 24)),
+		Interval(datetime(2017, 3, 24), datetime(2017, 3, 26)),
+		Interval(datetime(2017, 3, 23), datetime(2017, 3, 23)),
+		])
+	dt = datetime(2017, 3, 23)
+	assert array.pace(dt).tolist() == [0.5, 0.0, 1.0]
+	assert array.pace(dt)[:2].tolist() == [i.pace(dt) for i in array.to_intervals()[:2]]
+
+	run_rates = array.run_rate(dt, np.array([10, 10, 3]), fill_value=-1)
+	assert run_rates.tolist() == [20.0, -1.0, 3.0]
+
+
+@requires_numpy
+def test_pace_many():
+	from interval.vectorized import pace_many
+	month = Month(2017, 2)
+	timestamps = np.array(
+		['2017-01-31', '2017-02-01', '2017-02-08', '2017-02-15T06', '2017-03-01', '2017-04-01'],
+		dtype='datetime64[us]',
+		)
+	expected = [month.pace(dt) for dt in timestamps.astype(object)]
+	assert month.pace_many(timestamps).tolist() == expected
+	run_rates = month.run_rate_many(timestamps, 7)
+	assert np.isnan(run_rates[:2]).all()
+	assert run_rates[2:].tolist() == [month.run_rate(dt, 7) for dt in timestamps[2:].astype(object)]
+	quarters = [Quarter(2017, 1), Quarter(2017, 2)]
+	begs = np.array([q.beg for q in quarters], dtype='datetime64[us]')
+	ends = np.array([q.end for q in quarters], dtype='datetime64[us]')
+	paces = pace_many(begs, ends, timestamps[:, None])
+	assert paces.shape == (6, 2)
+	assert paces.tolist() == [[q.pace(dt) for q in quarters] for dt in timestamps.astype(object)]
+
+
+@requires_numpy
+def test_interval_array_buffer():
+	from interval.array import IntervalArray
+	array = IntervalArray(np.array([0, 10]), np.array([5, 20]))
+	view = array.buffer
+	assert view.itemsize == 8
+	assert view.shape == (2, 2)
+	assert view.tolist() == [[0, 5], [10, 20]]
+	assert np.shares_memory(np.asarray(array), array.beg_us)
+	assert np.shares_memory(np.frombuffer(array.buffer, dtype=np.int64), array.beg_us)
+	if sys.version_info >= (3, 12):
+		assert memoryview(array).tolist() == [[0, 5], [10, 20]]
+	else:
+		with pytest.raises(TypeError):
+			memoryview(array)
+
+
+def hours(*ranges):
+	"""Return Intervals for ranges of hours on 2017-03-01."""
+	beg = datetime(2017, 3, 1)
+	return [Interval(beg + timedelta(hours=b), beg + timedelta(hours=e)) for b, e in ranges]
+
+
+def test_interval_set_normalized():
+	s = IntervalSet(hours((5, 6), (0, 2), (1, 3), (3, 4), (8, 8)))
+	assert list(s) == hours((0, 4), (5, 6))
+	assert len(s) == 2
+	assert s.duration == timedelta(hours=5)
+	assert s.span == hours((0, 6))[0]
+	assert not IntervalSet()
+
+
+def test_interval_set_contains():
+	s = IntervalSet(hours((0, 2), (5, 6)))
+	assert datetime(2017, 3, 1, 1, 59) in s
+	assert datetime(2017, 3, 1, 2) not in s
+	assert datetime(2017, 2, 28) not in s
+	assert hours((0, 1))[0] in s
+	assert hours((1, 5))[0] not in s
+	assert s.overlaps(hours((1, 5))[0])
+	assert not s.overlaps(hours((2, 5))[0])
+
+
+def test_interval_set_add_discard():
+	s = IntervalSet(hours((0, 2), (5, 6), (8, 9)))
+	s.add(hours((2, 5))[0])
+	assert list(s) == hours((0, 6), (8, 9))
+	s.discard(hours((1, 2))[0])
+	assert list(s) == hours((0, 1), (2, 6), (8, 9))
+	s.discard(hours((3, 8))[0])
+	assert list(s) == hours((0, 1), (2, 3), (8, 9))
+	s.update(hours((1, 2)), hours((9, 10)))
+	assert list(s) == hours((0, 3), (8, 10))
+
+
+def test_interval_set_algebra():
+	a = IntervalSet(hours((0, 4), (6, 10)))
+	b = IntervalSet(hours((2, 7), (9, 12)))
+	assert list(a | b) == hours((0, 12))
+	assert list(a & b) == hours((2, 4), (6, 7), (9, 10))
+	assert list(a - b) == hours((0, 2), (7, 9))
+	assert list(b - a) == hours((4, 6), (10, 12))
+	within = hours((3, 11))[0]
+	assert list(a.clip(within)) == hours((3, 4), (6, 10))
+	assert list(a.complement(within)) == hours((4, 6), (10, 11))
+	assert a.union(b, IntervalSet(hours((20, 21)))) == IntervalSet(hours((0, 12), (20, 21)))
+
+
+def bounds(interval):
+	return interval.beg, interval.end
+
+
+def test_interval_tree_queries():
+	intervals = hours((0, 4), (1, 2), (3, 8), (5, 6), (6, 9), (7, 7), (10, 12))
+	tree = IntervalTree(intervals)
+	assert len(tree) == 7
+	at = datetime(2017, 3, 1, 3, 30)
+	assert sorted(tree.at(at), key=bounds) == sorted([i for i in intervals if at in i], key=bounds)
+	assert tree.at(datetime(2017, 3, 1, 9)) == []
+	window = hours((4, 7))[0]
+	assert sorted(tree.overlapping(window), key=bounds) == hours((3, 8), (5, 6), (6, 9))
+	assert tree.overlapping(hours((7, 7))[0]) == []
+
+
+def test_interval_tree_insert_delete():
+	random.seed(10)
+	intervals = []
+	for _ in range(500):
+		beg = random.randrange(200)
+		intervals.extend(hours((beg, beg + random.randrange(10))))
+	tree = IntervalTree(intervals[:200])
+	for interval in intervals[200:]:
+		tree.add(interval)
+	for interval in intervals[:300:3]:
+		tree.remove(interval)
+		intervals.remove(interval)
+	with pytest.raises(KeyError):
+		tree.remove(hours((500, 501))[0])
+	assert sorted(tree, key=bounds) == sorted(intervals, key=bounds)
+	for hour in range(0, 210, 7):
+		dt = datetime(2017, 3, 1) + timedelta(hours=hour, minutes=30)
+		assert sorted(tree.at(dt), key=bounds) == sorted([i for i in intervals if dt in i], key=bounds)
+		window = hours((hour, hour + 5))[0]
+		expected = [i for i in intervals if i and i.beg < window.end and window.beg < i.end]
+		assert sorted(tree.overlapping(window), key=bounds) == sorted(expected, key=bounds)
+
+
+def test_aggregate_stream():
+	from interval.stream import BucketAggregator, Reducer, aggregate
+	beg = datetime(2017, 3, 1)
+	events = [(beg + timedelta(minutes=m), m) for m in (0, 10, 50, 65, 40, 130, 61)]
+	assert list(aggregate(events, Hour)) == [
+		(Hour(datetime(2017, 3, 1, 0)), 60),
+		(Hour(datetime(2017, 3, 1, 1)), 65),
+		(Hour(datetime(2017, 3, 1, 2)), 130),
+		]
+	late = list(aggregate(events, Hour, 'count', allowed_lateness=timedelta(minutes=30)))
+	assert late == [
+		(Hour(datetime(2017, 3, 1, 0)), 4),
+		(Hour(datetime(2017, 3, 1, 1)), 2),
+		(Hour(datetime(2017, 3, 1, 2)), 1),
+		]
+	aggregator = BucketAggregator(Hour, 'max')
+	assert aggregator.push(beg, 3) == []
+	assert aggregator.push(beg + timedelta(minutes=5), 7) == []
+	assert len(aggregator) == 1
+	assert aggregator.push(beg + timedelta(hours=1), 1) == [(Hour(datetime(2017, 3, 1, 0)), 7)]
+	assert aggregator.push(beg, 9) == []
+	assert aggregator.dropped == 1
+	assert aggregator.flush() == [(Hour(datetime(2017, 3, 1, 1)), 1)]
+	mean = Reducer(
+		lambda: (0, 0),
+		lambda acc, value: (acc[0] + value, acc[1] + 1),
+		lambda a, b: (a[0] + b[0], a[1] + b[1]),
+		)
+	assert list(aggregate(events[:3], Day, mean)) == [(Day(datetime(2017, 3, 1)), (60, 3))]
+	with pytest.raises(ValueError):
+		BucketAggregator(Hour, 'median')
+
+
+def test_aggregate_stream_async():
+	import asyncio
+	from interval.stream import aggregate_async
+	beg = datetime(2017, 3, 1)
+
+	async def events():
+		for minutes in range(0, 24 * 60, 90):
+			yield beg + timedelta(minutes=minutes), 1
+
+	async def collect():
+		return [pair async for pair in aggregate_async(events(), Day, 'count')]
+
+	assert asyncio.run(collect()) == [(Day(datetime(2017, 3, 1)), 16)]
+
+
+def test_rollup():
+	from interval.rollup import Rollup
+	random.seed(12)
+	beg = datetime(2015, 12, 1)
+	events = [(beg + timedelta(hours=random.randrange(3 * 365 * 24)), random.randrange(100)) for _ in range(2000)]
+	rollup = Rollup()
+	rollup.update(events)
+	assert rollup[Year(2016)] == sum(v for dt, v in events if dt.year == 2016)
+	assert rollup[Month(2017, 2)] == sum(v for dt, v in events if (dt.year, dt.month) == (2017, 2))
+	interval = Interval(datetime(2016, 2, 27), datetime(2018, 5, 3))
+	assert rollup.cover(interval) == [
+		Year(2017),
+		Quarter(2016, 2),
+		Quarter(2016, 3),
+		Quarter(2016, 4),
+		Month(2016, 3),
+		Day(datetime(2016, 2, 27)),
+		Day(datetime(2016, 2, 28)),
+		Day(datetime(2016, 2, 29)),
+		Quarter(2018, 1),
+		Month(2018, 4),
+		Day(datetime(2018, 5, 1)),
+		Day(datetime(2018, 5, 2)),
+		]
+	for _ in range(50):
+		first = beg + timedelta(days=random.randrange(3 * 365))
+		interval = Interval(first, first + timedelta(days=random.randrange(500)))
+		assert rollup.total(interval) == sum(v for dt, v in events if dt in interval)
+	with pytest.raises(ValueError):
+		rollup.total(Interval(datetime(2016, 1, 1, 12), datetime(2017, 1, 1)))
+	extremes = Rollup(reducer='max')
+	extremes.update(events)
+	assert extremes.total(Year(2017)) == max(v for dt, v in events if dt.year == 2017)
+
+
+def test_apportion():
+	from interval.apportion import apportion
+	records = [
+		(Interval(datetime(2017, 1, 31, 12), datetime(2017, 3, 1, 12)), 58),
+		(Interval(datetime(2017, 2, 10), datetime(2017, 2, 11)), 5),
+		(Interval(datetime(2017, 4, 2), datetime(2017, 4, 2)), 1),
+		]
+	assert apportion(records, Month) == {
+		Month(2017, 1): 1.0,
+		Month(2017, 2): 61.0,
+		Month(2017, 3): 1.0,
+		Month(2017, 4): 1,
+		}
+	days = apportion(records, Day)
+	assert len(days) == 31
+	assert days[Day(datetime(2017, 1, 31))] == 1.0
+	assert days[Day(datetime(2017, 2, 10))] == 7.0
+	assert days[Day(datetime(2017, 3, 1))] == 1.0
+
+
+@requires_numpy
+def test_apportion_many():
+	from interval.apportion import apportion
+	from interval.vectorized import apportion_many
+	random.seed(14)
+	records = []
+	for _ in range(300):
+		beg = datetime(2016, 1, 1) + timedelta(minutes=random.randrange(2 * 365 * 24 * 60))
+		end = beg + timedelta(minutes=random.choice([0, 1, 500, 5000, 50000, 500000]))
+		records.append((Interval(beg, end), random.randrange(1, 100)))
+	begs = np.array([i.beg for i, v in records], dtype='datetime64[us]')
+	ends = np.array([i.end for i, v in records], dtype='datetime64[us]')
+	values = np.array([v for i, v in records])
+	for interval_type in (Day, Week, Month, Quarter):
+		expected = apportion(records, interval_type)
+		ordinals, totals = apportion_many(interval_type, begs, ends, values)
+		assert np.isclose(totals.sum(), values.sum())
+		actual = {interval_type.from_ordinal(o): t for o, t in zip(ordinals.tolist(), totals) if t}
+		assert list(actual) == list(expected)
+		assert np.allclose(list(actual.values()), list(expected.values()))
+
+
+@requires_numpy
+def test_apportion_many_all_spanning():
+	from interval.vectorized import apportion_many
+	# No record fits inside a single Day
+	begs = np.array(['2017-01-01T12', '2017-01-02T00'], dtype='datetime64[us]')
+	ends = np.array(['2017-01-03T12', '2017-01-04T00'], dtype='datetime64[us]')
+	ordinals, totals = apportion_many(Day, begs, ends, [4, 2])
+	assert [Day.from_ordinal(o).beg.day for o in ordinals.tolist()] == [1, 2, 3]
+	assert totals.tolist() == [1.0, 3.0, 2.0]
+
+
+def test_overlap_join():
+	from interval.join import Overlap, overlap_join
+	sessions = hours((0, 3), (2, 4), (5, 5), (10, 11))
+	windows = hours((1, 2), (3, 6))
+	assert list(overlap_join(sessions, windows)) == [
+		Overlap(sessions[0], windows[0], windows[0], timedelta(hours=1)),
+		Overlap(sessions[1], windows[1], hours((3, 4))[0], timedelta(hours=1)),
+		]
+	unmatched = [o for o in overlap_join(sessions, windows, how='left') if o.right is None]
+	assert [o.left for o in unmatched] == [sessions[2], sessions[3]]
+	with pytest.raises(ValueError):
+		list(overlap_join(reversed(sessions), windows, presorted=True))
+	random.seed(15)
+	left = []
+	right = []
+	for _ in range(200):
+		beg = random.randrange(300)
+		left.extend(hours((beg, beg + random.randrange(6))))
+		beg = random.randrange(300)
+		right.extend(hours((beg, beg + random.randrange(1, 3))))
+	expected = sorted(
+		(l.beg, l.end, r.beg, r.end, max(l.beg, r.beg), min(l.end, r.end))
+		for l in left for r in right
+		if l.beg < r.end and r.beg < l.end and l and r
+		)
+	for presorted in (False, True):
+		if presorted:
+			left.sort(key=bounds)
+			right.sort(key=bounds)
+		pairs = list(overlap_join(iter(left), iter(right), presorted=presorted))
+		assert sorted(
+			(o.left.beg, o.left.end, o.right.beg, o.right.end, o.interval.beg, o.interval.end)
+			for o in pairs
+			) == expected
+		assert all(o.duration == o.interval.delta for o in pairs)
+		left_join = list(overlap_join(left, right, how='left'))
+		assert len(left_join) == len(pairs) + sum(
+			1 for l in left
+			if not any(l.beg < r.end and r.beg < l.end and l and r for r in right)
+			)
+
+
+def test_interval_store(tmp_path):
+	from interval.store import IntervalStore
+	random.seed(16)
+	intervals = []
+	for _ in range(300):
+		beg = random.randrange(500)
+		intervals.extend(hours((beg, beg + random.randrange(12))))
+	path = tmp_path / 'intervals.intv'
+	with IntervalStore.create(path, intervals[:200]) as store:
+		assert len(store) == 200
+		assert store.max_len <= 11 * 3600 * 10 ** 6
+		assert list(store) == sorted(intervals[:200], key=bounds)
+		assert store[-1] == max(intervals[:200], key=bounds)
+		later = sorted(intervals[200:], key=bounds)
+		with pytest.raises(ValueError):
+			store.append(later)
+		later = [i for i in later if i.beg >= store[-1].beg]
+		store.append(later)
+		stored = sorted(intervals[:200], key=bounds) + later
+		assert list(store) == stored
+	with IntervalStore(path) as store:
+		for hour in range(0, 520, 7):
+			dt = datetime(2017, 3, 1) + timedelta(hours=hour, minutes=30)
+			assert store.at(dt) == [i for i in stored if dt in i]
+			window = hours((hour, hour + 3))[0]
+			assert store.overlapping(window) == [
+				i for i in stored if i and i.beg < window.end and window.beg < i.end
+				]
+		with pytest.raises(TypeError):
+			store.at(datetime(2017, 3, 1, tzinfo=UTC))
+	with pytest.raises(ValueError):
+		len(store)
+	with pytest.raises(ValueError):
+		store.at(datetime(2017, 3, 1))
+	aware = [Interval(datetime(2017, 3, 1, tzinfo=UTC), datetime(2017, 3, 2, tzinfo=UTC))]
+	with IntervalStore.create(tmp_path / 'aware.intv', aware, tzinfo=UTC) as store:
+		assert store.aware
+		assert store.at(datetime(2017, 3, 1, 12, tzinfo=UTC)) == aware
+	(tmp_path / 'other').write_bytes(b'not an interval store')
+	with pytest.raises(ValueError):
+		IntervalStore(tmp_path / 'other')
+
+
+def test_epoch_interval():
+	from zoneinfo import ZoneInfo
+	new_york = ZoneInfo('America/New_York')
+	beg = datetime(2017, 3, 1, tzinfo=new_york)
+	interval = EpochInterval(beg, delta=timedelta(days=1))
+	assert interval.beg == beg
+	assert interval.end == datetime(2017, 3, 2, tzinfo=new_york)
+	assert interval.beg_us == 1488344400 * 10 ** 6
+	assert interval.end_us - interval.beg_us == 86400 * 10 ** 6
+	same = EpochInterval.from_us(interval.beg_us, interval.end_us, UTC)
+	assert same.beg.tzinfo is UTC
+	assert same == interval
+	assert same == Interval(beg, delta=timedelta(days=1))
+	assert hash(same) == hash(interval) == hash(Interval(beg, delta=timedelta(days=1)))
+	assert datetime(2017, 3, 1, 12, tzinfo=UTC) in interval
+	assert datetime(2017, 3, 1, 4, tzinfo=UTC) not in interval
+	assert datetime(2017, 3, 1, 23, tzinfo=new_york) in interval
+	assert interval.contains_us(interval.beg_us)
+	assert not interval.contains_us(interval.end_us)
+	later = EpochInterval.from_interval(Day(datetime(2017, 3, 1, 12, tzinfo=new_york)))
+	assert interval < later
+	assert interval.overlaps(later)
+	naive = EpochInterval(datetime(2017, 3, 1), datetime(2017, 3, 2))
+	assert naive != EpochInterval.from_us(naive.beg_us, naive.end_us, UTC)
+	assert datetime(2017, 3, 1, 5) in naive
+	with pytest.raises(TypeError):
+		datetime(2017, 3, 1, 5, tzinfo=UTC) in naive
+
+
+
+def test_epoch_interval_dst():
+	from zoneinfo import ZoneInfo
+	new_york = ZoneInfo('America/New_York')
+	# The New York fall back hour, 01:00 EDT to 01:00 EST
+	beg_us = 1509858000 * 10 ** 6
+	interval = EpochInterval.from_us(beg_us, beg_us + 3600 * 10 ** 6, new_york)
+	assert interval.beg == datetime(2017, 11, 5, 1, tzinfo=new_york)
+	assert interval.end == datetime(2017, 11, 5, 1, fold=1, tzinfo=new_york)
+	assert interval.end.fold == 1
+	assert interval.delta == timedelta(hours=1)
+	assert interval
+	inside = datetime(2017, 11, 5, 5, 30, tzinfo=timezone.utc)
+	assert interval.contains_us(1509859800 * 10 ** 6)
+	assert inside in interval
+	assert inside.astimezone(new_york) in interval
+	assert datetime(2017, 11, 5, 1, 30, fold=1, tzinfo=new_york) not in interval
+	assert interval == EpochInterval(interval.beg, interval.end)
+	assert interval == EpochInterval(interval.beg, delta=timedelta(hours=1))
+	assert interval == EpochInterval(end=interval.end, delta=timedelta(hours=1))
+	hour = EpochInterval.from_interval(Hour.containing(inside.astimezone(new_york)))
+	assert hour.end_us - hour.beg_us == 3600 * 10 ** 6
+	assert hour == interval
+	with pytest.raises(ValueError):
+		EpochInterval(interval.beg, interval.end, timedelta(minutes=30))
+	with pytest.raises(TypeError):
+		EpochInterval(interval.beg, datetime(2017, 11, 5, 2))
+
+def test_months_fast_comparisons():
+	assert Month(2017, 2) == Month(2017, 2)
+	assert Month(2017, 2) != Month(2017, 3)
+	assert Month(2017, 2) == Interval(datetime(2017, 2, 1), datetime(2017, 3, 1))
+	assert hash(Month(2017, 2)) == hash(Interval(datetime(2017, 2, 1), datetime(2017, 3, 1)))
+	assert Quarter(2017, 1) < Quarter(2017, 2) <= Quarter(2017, 2)
+	assert Year(2018) > Year(2017) >= Year(2017)
+	assert datetime(2017, 5, 31, 23) in Quarter(2017, 2)
+	assert datetime(2017, 7, 1) not in Quarter(2017, 2)
+	assert Month(2017, 2, UTC) != Month(2017, 2)
+	assert datetime(2017, 2, 8, tzinfo=UTC) in Month(2017, 2, UTC)
+
+
+def test_aware_day_and_week_keep_tzinfo():
+	from zoneinfo import ZoneInfo
+	new_york = ZoneInfo('America/New_York')
+	dt = datetime(2017, 11, 5, 12, tzinfo=new_york)
+	day = Day.containing(dt)
+	assert day.beg == datetime(2017, 11, 5, tzinfo=new_york)
+	assert day.end == datetime(2017, 11, 6, tzinfo=new_york)
+	assert day.beg.tzinfo is new_york
+	assert Week.containing(dt, starts_on=0).beg == datetime(2017, 10, 30, tzinfo=new_york)
+	assert day.next() == Day(datetime(2017, 11, 6, tzinfo=new_york))
+	assert len(Hour.divide(day)) == 25
+	assert len(Hour.divide(Day.containing(datetime(2017, 3, 12, tzinfo=new_york)))) == 23
+
+
+def test_aware_hours_across_dst():
+	from zoneinfo import ZoneInfo
+	new_york = ZoneInfo('America/New_York')
+	utc = timezone.utc
+	# Clocks go back from 2:00 EDT to 1:00 EST at 6:00 UTC
+	first = Hour.containing(datetime(2017, 11, 5, 5, 30, tzinfo=utc).astimezone(new_york))
+	second = first.next()
+	assert first.beg.astimezone(utc) == datetime(2017, 11, 5, 5, tzinfo=utc)
+	assert first.end.astimezone(utc) == datetime(2017, 11, 5, 6, tzinfo=utc)
+	assert second.beg.astimezone(utc) == datetime(2017, 11, 5, 6, tzinfo=utc)
+	assert second.end.astimezone(utc) == datetime(2017, 11, 5, 7, tzinfo=utc)
+	assert second.prev().beg.astimezone(utc) == first.beg.astimezone(utc)
+	assert first + 1 == second
+	assert second - first == 1
+	assert datetime(2017, 11, 5, 6, 30, tzinfo=utc).astimezone(new_york) in second
+	assert datetime(2017, 11, 5, 6, 30, tzinfo=utc).astimezone(new_york) not in first
+	hours_utc = [h.beg.astimezone(utc) for h in Hour.divide(Day.containing(first.beg))]
+	assert hours_utc == [datetime(2017, 11, 5, 4, tzinfo=utc) + timedelta(hours=h) for h in range(25)]
+	quarter_hours = (Minute * 15).containing(first.end)
+	assert quarter_hours.end.astimezone(utc) == datetime(2017, 11, 5, 6, 15, tzinfo=utc)
+
+
+def test_aware_hour_ordinals_across_dst():
+	from zoneinfo import ZoneInfo
+	new_york = ZoneInfo('America/New_York')
+	first = Hour(datetime(2017, 11, 5, 1, tzinfo=new_york))
+	second = Hour(datetime(2017, 11, 5, 1, fold=1, tzinfo=new_york))
+	assert second == first.next()
+	assert second.ordinal - first.ordinal == second - first == 1
+	assert Hour.from_ordinal(first.ordinal, new_york) == first
+	assert Hour.from_ordinal(second.ordinal, new_york) == second
+	assert Hour.from_ordinal(second.ordinal, new_york).beg.fold == 1
+	spring = Hour.containing(datetime(2017, 3, 12, 3, 30, tzinfo=new_york))
+	assert spring.ordinal - spring.prev().ordinal == 1
+	kolkata = ZoneInfo('Asia/Kolkata')
+	hour = Hour.containing(datetime(2017, 3, 1, 12, 45, tzinfo=kolkata))
+	assert Hour.from_ordinal(hour.ordinal, kolkata) == hour
+	assert Hour.from_ordinal(hour.ordinal + 1, kolkata) == hour.next()
+
+
+def test_aware_hours_spring_forward():
+	from zoneinfo import ZoneInfo
+	new_york = ZoneInfo('America/New_York')
+	utc = timezone.utc
+	# Clocks go forward from 2:00 EST to 3:00 EDT at 7:00 UTC, so 2:30 doesn't exist
+	missing = datetime(2017, 3, 12, 2, 30, tzinfo=new_york)
+	hour = Hour.containing(missing)
+	assert hour == Hour.containing(datetime(2017, 3, 12, 3, 30, tzinfo=new_york))
+	assert hour.beg == datetime(2017, 3, 12, 3, tzinfo=new_york)
+	assert hour.beg.astimezone(utc) == datetime(2017, 3, 12, 7, tzinfo=utc)
+	assert hour.ordinal == Hour.containing(datetime(2017, 3, 12, 3, 30, tzinfo=new_york)).ordinal
+	assert missing in hour
+	assert hour.prev().beg == datetime(2017, 3, 12, 1, tzinfo=new_york)
+	assert Hour.containing(missing.replace(fold=1)) == hour.prev()
+	assert Minute.containing(missing).beg == datetime(2017, 3, 12, 3, 30, tzinfo=new_york)
+	assert (Minute * 15).containing(missing).beg == datetime(2017, 3, 12, 3, 30, tzinfo=new_york)
+	assert len({Hour.containing(datetime(2017, 3, 12, h, 30, tzinfo=new_york)) for h in range(1, 4)}) == 2
+
+@requires_numpy
+def test_containing_many_tzinfo_across_dst():
+	from zoneinfo import ZoneInfo
+	new_york = ZoneInfo('America/New_York')
+	utc = timezone.utc
+	for day in ('2017-03-12', '2017-11-05'):
+		timestamps = np.arange(
+			np.datetime64(day),
+			np.datetime64(day) + np.timedelta64(2, 'D'),
+			np.timedelta64(7, 'm'),
+			).astype('datetime64[us]')
+		aware = [dt.replace(tzinfo=utc).astimezone(new_york) for dt in timestamps.astype(object)]
+		for interval_type in (Hour, Minute * 15, Minute * 90):
+			intervals = [interval_type.containing(dt) for dt in aware]
+			ordinals = interval_type.containing_many(timestamps, tzinfo=new_york)
+			assert ordinals.tolist() == [i.ordinal for i in intervals]
+			begs = interval_type.containing_many(timestamps, result='beg', tzinfo=new_york)
+			assert begs.astype(object).tolist() == [
+				i.beg.astimezone(utc).replace(tzinfo=None) for i in intervals
+				]
+	# The two hours from 1:00 to 2:00 when clocks go back are separate buckets
+	fall_back = np.array(['2017-11-05T05:30', '2017-11-05T06:30'], dtype='datetime64[us]')
+	first, second = Hour.containing_many(fall_back, tzinfo=new_york).tolist()
+	assert second - first == 1
+	assert Hour.from_ordinal(second, new_york) == Hour.containing(
+		datetime(2017, 11, 5, 6, 30, tzinfo=utc).astimezone(new_york)
+		)
+
+@requires_numpy
+def test_containing_many_tzinfo():
+	from zoneinfo import ZoneInfo
+	new_york = ZoneInfo('America/New_York')
+	utc = timezone.utc
+	timestamps = np.arange(
+		np.datetime64('2016-12-25'),
+		np.datetime64('2018-01-05'),
+		np.timedelta64(37, 'm'),
+		).astype('datetime64[us]')
+	aware = [dt.replace(tzinfo=utc).astimezone(new_york) for dt in timestamps.astype(object)]
+	for interval_type in (Day, Week, Month, Hour):
+		expected = [interval_type.containing(dt).ordinal for dt in aware]
+		assert interval_type.containing_many(timestamps, tzinfo=new_york).tolist() == expected
+	begs = Day.containing_many(timestamps[:100], result='beg', tzinfo=new_york)
+	assert begs.astype(object).tolist() == [Day.containing(dt).beg.replace(tzinfo=None) for dt in aware[:100]]
+	fixed = timezone(timedelta(hours=5, minutes=30))
+	expected = [Hour.containing(dt.replace(tzinfo=utc).astimezone(fixed)).ordinal for dt in timestamps[:200].astype(object)]
+	assert Hour.containing_many(timestamps[:200], tzinfo=fixed).tolist() == expected
+
+
+class FakeClock():
+	"""A clock for the scheduler whose sleep moves time forward instantly."""
+
+	def __init__(self, now, oversleep=timedelta(0)):
+		self.now = now
+		self.oversleep = oversleep
+
+	def __call__(self):
+		return self.now
+
+	async def sleep(self, seconds):
+		import asyncio
+		self.now += timedelta(seconds=seconds) + self.oversleep
+		self.oversleep = timedelta(0)
+		await asyncio.sleep(0)
+
+
+def test_scheduler_batches_boundaries():
+	import asyncio
+	from interval.schedule import Scheduler
+	clock = FakeClock(datetime(2017, 3, 1, 12, 0, 30))
+	scheduler = Scheduler(clock=clock, sleep=clock.sleep)
+	calls = []
+	minute_job = scheduler.add(Minute, lambda i: calls.append(('minute', i.beg.minute, clock.now)))
+	five_minutes = Minute * 5
+
+	async def every_five(interval):
+		await asyncio.sleep(0)
+		calls.append(('five', interval.beg.minute, clock.now))
+
+	scheduler.add(five_minutes, every_five)
+	asyncio.run(scheduler.run(until=datetime(2017, 3, 1, 12, 10, 1)))
+	assert [c[1] for c in calls if c[0] == 'minute'] == list(range(10))
+	assert [c[1] for c in calls if c[0] == 'five'] == [0, 5]
+	# Jobs are called when their Interval ends
+	assert all(c[2] == datetime(2017, 3, 1, 12, c[1]) + (timedelta(minutes=5) if c[0] == 'five' else timedelta(minutes=1)) for c in calls)
+	assert minute_job.runs == 10
+	assert minute_job.max_lateness == 0.0
+	assert minute_job.jitter == 0.0
+
+
+def test_scheduler_skipped_boundaries():
+	import asyncio
+	from interval.schedule import Scheduler
+	clock = FakeClock(datetime(2017, 3, 1, 12, 0, 30), oversleep=timedelta(minutes=3))
+	scheduler = Scheduler(clock=clock, sleep=clock.sleep)
+	coalesced = []
+	caught_up = []
+	coalesce = scheduler.add(Minute, lambda i: coalesced.append(i.beg.minute))
+	catch_up = scheduler.add(Minute, lambda i: caught_up.append(i.beg.minute), policy='catch_up')
+	failing = scheduler.add(Hour, lambda i: 1 / 0)
+	asyncio.run(scheduler.run(until=datetime(2017, 3, 1, 13, 0, 1)))
+	assert coalesced[0] == 3
+	assert coalesce.skipped == 3
+	assert caught_up == list(range(60))
+	assert catch_up.max_lateness == 180.0
+	assert catch_up.stats()['runs'] == 60
+	assert failing.errors == 1
+	assert isinstance(failing.last_error, ZeroDivisionError)
+	with pytest.raises(ValueError):
+		scheduler.add(Minute, print, policy='sometimes')
+
+
+def test_scheduler_concurrency_cap():
+	import asyncio
+	from interval.schedule import Scheduler
+	clock = FakeClock(datetime(2017, 3, 1, 12, 0, 30))
+	scheduler = Scheduler(max_concurrency=2, clock=clock, sleep=clock.sleep)
+	running = []
+	most = []
+
+	async def job(interval):
+		running.append(interval)
+		most.append(len(running))
+		for _ in range(3):
+			await asyncio.sleep(0)
+		running.pop()
+
+	jobs = [scheduler.add(Minute, job) for _ in range(5)]
+	scheduler.remove(jobs[-1])
+	asyncio.run(scheduler.run(until=datetime(2017, 3, 1, 12, 1, 1)))
+	assert len(most) == 4
+	assert max(most) == 2
+	assert len(scheduler) == 4
+
+
+def test_ingest(tmp_path):
+	import json
+	from interval.ingest import chunks, ingest
+	random.seed(20)
+	events = sorted(
+		(datetime(2017, 3, 1) + timedelta(seconds=random.randrange(3 * 86400)), random.randrange(10))
+		for _ in range(2000)
+		)
+	csv_path = tmp_path / 'events.csv'
+	csv_path.write_text('id,time,value\n' + ''.join(
+		'{},{},{}\n'.format(n, dt.isoformat(), value) for n, (dt, value) in enumerate(events)
+		))
+	ndjson_path = tmp_path / 'events.ndjson'
+	ndjson_path.write_text(''.join(
+		json.dumps({'ts': dt.timestamp(), 'v': value}) + '\n' for dt, value in events
+		))
+	expected = {}
+	for dt, value in events:
+		hour = Hour.containing(dt)
+		expected[hour] = expected.get(hour, 0) + value
+	assert len(chunks(csv_path, 1000)) > 50
+	by_hour = ingest(csv_path, Hour, timestamp='time', value='value', workers=1, chunk_size=1000)
+	assert by_hour == expected
+	assert list(by_hour) == sorted(expected)
+	counts = ingest(csv_path, Day, timestamp=1, workers=2, chunk_size=10000)
+	assert list(counts.values()) == [
+		sum(1 for dt, v in events if dt.day == day) for day in (1, 2, 3)
+		]
+	local_epoch = datetime.fromtimestamp(0)
+	from_json = ingest(
+		ndjson_path,
+		Hour,
+		timestamp='ts',
+		value='v',
+		timestamp_format=lambda field: local_epoch + timedelta(seconds=field),
+		workers=1,
+		chunk_size=777,
+		)
+	assert from_json == expected
+	assert ingest(ndjson_path, Day, timestamp='ts', timestamp_format='s', reducer='count', workers=1)
+
+
+def test_ingest_epoch_timestamps_exact(tmp_path):
+	from interval.ingest import ingest
+	# Multiplying these as floats is a microsecond short
+	seconds_path = tmp_path / 'seconds.csv'
+	seconds_path.write_text('1079322347.023105\n1121519693.380885\n')
+	millis_path = tmp_path / 'millis.csv'
+	millis_path.write_text('1079322347023.105\n1121519693380.885\n')
+	expected = {
+		MicroSecond(datetime(2004, 3, 15, 3, 45, 47, 23105)): 1,
+		MicroSecond(datetime(2005, 7, 16, 13, 14, 53, 380885)): 1,
+		}
+	for path, unit in ((seconds_path, 's'), (millis_path, 'ms')):
+		assert ingest(
+			path,
+			MicroSecond,
+			timestamp=0,
+			timestamp_format=unit,
+			header=False,
+			workers=1,
+			) == expected
+	ndjson_path = tmp_path / 'epoch.ndjson'
+	ndjson_path.write_text('{"ts": 1079322347.023105}\n{"ts": 1121519693.380885}\n')
+	assert ingest(ndjson_path, MicroSecond, timestamp='ts', timestamp_format='s', workers=1) == expected
+	ndjson_path.write_text('{"ts": -1.5}\n')
+	assert ingest(ndjson_path, MilliSecond, timestamp='ts', timestamp_format='ms', workers=1) == {
+		MilliSecond(datetime(1969, 12, 31, 23, 59, 59, 998000)): 1,
+		}
+
+def test_instrument():
+	import doctest
+	from interval import instrument
+	assert doctest.testmod(instrument).failed == 0
+	containing = Month.__dict__['containing']
+	with instrument.collect() as stats:
+		assert instrument.is_enabled()
+		Day.divide(Month(2017, 2))
+		list(Hour.containing(datetime(2017, 1, 1)).iter(count=3))
+		EpochInterval(datetime(2017, 1, 1), delta=timedelta(days=1))
+		Fortnight = FixedInterval.create(timedelta(weeks=2), name='Fortnight')
+		Fortnight.containing(datetime(2017, 1, 1))
+	assert not instrument.is_enabled()
+	assert Month.__dict__['containing'] is containing
+	assert '_instrumented' not in vars(Fortnight.__dict__['containing'].__func__)
+	assert stats['Day']['divide']['count'] == 1
+	assert stats['Day']['init']['count'] == 30
+	assert stats['Month']['init']['count'] == 1
+	assert stats['Hour']['iter']['count'] == 3
+	assert stats['Hour']['next']['count'] == 3
+	assert stats['EpochInterval']['init']['count'] == 1
+	assert stats['Fortnight']['containing']['count'] == 1
+	assert stats['Day']['divide']['seconds'] > 0
+	Month(2017, 1)
+	assert instrument.snapshot() == {}
+	instrument.enable()
+	try:
+		with instrument.collect() as stats:
+			Month(2017, 1).end
+		assert stats == {
+			'Month': {
+				'bounds': stats['Month']['bounds'],
+				'end': stats['Month']['end'],
+				'init': stats['Month']['init'],
+				},
+			}
+		Month(2017, 1)
+		assert instrument.snapshot()['Month']['init']['count'] == 2
+	finally:
+		instrument.disable()
+		instrument.reset()
+	assert instrument.snapshot() == {}
+
+
+@requires_numpy
+def test_instrument_containing_many():
+	from zoneinfo import ZoneInfo
+	from interval import instrument
+	new_york = ZoneInfo('America/New_York')
+	timestamps = np.array(['2017-07-01T12:30', '2017-11-05T06:30'], dtype='datetime64[us]')
+	calls = [
+		(Hour, {'tzinfo': new_york}),
+		(Hour, {'tzinfo': new_york, 'result': 'beg'}),
+		(Month, {'tzinfo': new_york}),
+		(Week, {'starts_on': 6}),
+		(Day, {'result': 'beg'}),
+		]
+	expected = [cls.containing_many(timestamps, **kwargs).tolist() for cls, kwargs in calls]
+	with instrument.collect() as stats:
+		assert [
+			cls.containing_many(timestamps, **kwargs).tolist() for cls, kwargs in calls
+			] == expected
+	assert stats
+
+
+def test_from_string_to_string():
+	from zoneinfo import ZoneInfo
+	new_york = ZoneInfo('America/New_York')
+	examples = [
+		(Year(2017), '2017'),
+		(Quarter(2017, 1), '2017-Q1'),
+		(Month(2017, 2), '2017-02'),
+		(Week.containing(datetime(2017, 2, 8), starts_on=calendar.MONDAY), '2017-W06'),
+		(Week.containing(datetime(2017, 2, 8), starts_on=calendar.SUNDAY), '2017-W05-7'),
+		(Day(datetime(2017, 2, 8)), '2017-02-08'),
+		(Hour(datetime(2017, 2, 8, 13)), '2017-02-08T13:00:00/PT1H'),
+		(MilliSecond(datetime(2017, 2, 8, 13, 0, 0, 5000)), '2017-02-08T13:00:00.005000/PT0.001S'),
+		(Interval(datetime(2017, 2, 8), delta=timedelta(days=1, minutes=90)), '2017-02-08T00:00:00/P1DT1H30M'),
+		]
+	for interval, string in examples:
+		assert interval.to_string() == string
+		assert type(interval).from_string(string) == interval
+	assert Year.from_string('2017', tzinfo=new_york).tzinfo is new_york
+	repeated = Hour.containing(datetime(2017, 11, 5, 1, 30, tzinfo=new_york, fold=1))
+	assert repeated.to_string() == '2017-11-05T01:00:00-05:00/PT1H'
+	assert Hour.from_string(repeated.to_string(), tzinfo=new_york) == repeated
+	assert Interval.from_string('2017-02-08T13:00/2017-02-08T14:30').delta == timedelta(minutes=90)
+	assert Day.from_string('2017-02-08T00:00/PT24H') == Day(datetime(2017, 2, 8))
+	for cls, string in [
+			(Year, '17'),
+			(Year, '+017'),
+			(Quarter, '2017-Q5'),
+			(Month, '2017-13'),
+			(Week, '2017-W54'),
+			(Day, '2017-02-30'),
+			(Interval, '2017-02-08T13:00'),
+			(Interval, '2017-02-08T13:00/P1M'),
+			(Hour, '2017-02-08T13:30/PT1H'),
+			(Hour, '2017-02-08T13:00/PT2H'),
+			]:
+		with pytest.raises(ValueError):
+			cls.from_string(string)
+
+
+def test_parse_many():
+	from interval.parsing import format_many, parse, parse_many
+	strings = ['2017', '2017-Q1', '2017-02', '2017-W06', '2017-02-08', '2017-02-08T13:00:00/PT1H']
+	intervals = parse_many(strings * 2)
+	assert [type(interval) for interval in intervals[:6]] == [Year, Quarter, Month, Week, Day, Interval]
+	assert intervals[:6] == intervals[6:]
+	assert all(a is b for a, b in zip(intervals[:6], intervals[6:]))
+	assert format_many(intervals[:6]) == strings
+	assert parse(strings[-1], Hour) == Hour(datetime(2017, 2, 8, 13))
+	assert parse('2017') is parse('2017')
+	with pytest.raises(ValueError):
+		parse('February 2017')
+	if np is not None:
+		assert parse_many(np.array(strings)) == intervals[:6]
+
+
+def test_rolling_window():
+	from interval.rolling import RollingWindow, rolling
+	random.seed(24)
+	for interval_type, periods, spread in [(Day, 7, 3 * 86400), (Month, 3, 40 * 86400), (Hour, 1, 3600)]:
+		dt = datetime(2017, 1, 1)
+		pairs = []
+		for _ in range(300):
+			# Occasionally jump far enough that the whole window expires
+			dt += timedelta(seconds=random.randrange(spread) * random.choice((1, 1, 1, 20)))
+			pairs.append((dt, random.randrange(-50, 50)))
+		results = list(rolling(pairs, interval_type, periods))
+		intervals = [interval for interval, stats in results]
+		assert intervals == list(intervals[0].iter(end=intervals[-1].next()))
+		for interval, stats in results:
+			window = Interval((interval - (periods - 1)).beg, interval.end)
+			values = [value for dt, value in pairs if dt in window]
+			assert stats == {
+				'count': len(values),
+				'sum': sum(values),
+				'mean': sum(values) / len(values) if values else None,
+				'min': min(values, default=None),
+				'max': max(values, default=None),
+				}
+	window = RollingWindow(Minute, 60)
+	assert window.window is None and window.max is None
+	window.push(datetime(2017, 1, 1, 12, 0), 5.0)
+	window.push(datetime(2017, 1, 1, 12, 30), 1.5)
+	window.push(datetime(2017, 1, 1, 12, 10), 100.0)
+	assert window.dropped == 1
+	assert window.window == Interval(datetime(2017, 1, 1, 11, 31), datetime(2017, 1, 1, 12, 31))
+	assert (window.count, window.sum, window.min, window.max) == (2, 6.5, 1.5, 5.0)
+	window.advance_to(datetime(2017, 1, 1, 13, 15))
+	assert (window.count, window.sum, window.min, window.max) == (1, 1.5, 1.5, 1.5)
+	window.advance_to(datetime(2017, 3, 1))
+	assert window.current == Minute(datetime(2017, 3, 1))
+	assert (window.count, window.sum, window.mean) == (0, 0, None)
+	assert len(window._mins) == len(window._maxes) == 0
+	with pytest.raises(ValueError):
+		RollingWindow(Day, 0)
+
+
+def test_fixed_interval_type_registry():
+	import pickle
+	from interval import FixedIntervalType
+	assert Hour * 2 is Hour * 2
+	assert FixedInterval.create(timedelta(days=3)) is FixedInterval.create(timedelta(days=3))
+	assert Minute.create(timedelta(minutes=15)) is Minute * 15
+	assert Minute * 15 is not FixedInterval.create(timedelta(minutes=15))
+	assert Minute * 15 is not Minute.create(timedelta(minutes=15), name='QuarterHour')
+	assert isinstance((Hour * 2)(datetime(2017, 1, 1)), Hour * 2)
+	assert Hour * 2 in FixedIntervalType.registered_types()
+	TwoHours = Hour * 2
+	interval = TwoHours.containing(datetime(2017, 1, 1, 3))
+	assert pickle.loads(pickle.dumps(TwoHours)) is TwoHours
+	assert pickle.loads(pickle.dumps(Hour)) is Hour
+	assert type(pickle.loads(pickle.dumps(interval))) is TwoHours
+	FixedIntervalType.clear_registry()
+	assert FixedIntervalType.registered_types() == []
+	assert Hour * 2 is not TwoHours
+	unpickled = pickle.loads(pickle.dumps(interval))
+	assert type(unpickled) is Hour * 2
+	assert unpickled.beg == interval.beg and unpickled.delta == interval.delta